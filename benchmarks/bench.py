@@ -0,0 +1,371 @@
+"""Benchmarks for wideq's import, decoding, lookup, status and polling
+paths.
+
+Run from the repository root::
+
+    python benchmarks/bench.py [--quick] [--http] [--output FILE]
+
+The models come from `tests/fixtures/client.json`, plus small synthetic
+models for the device types it does not cover (the AC and
+refrigerator, which also exercise JSON monitoring data). End-to-end
+polls run against `wideq.fakeserver`, in memory by default and also
+over local HTTP with `--http`.
+
+Results are written as JSON (to stdout, or to FILE), so runs on
+different versions can be diffed. Timings are the best of several
+repeats, in nanoseconds per operation, except for imports, which are
+timed in milliseconds per fresh interpreter.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import wideq  # noqa: E402
+from wideq import core  # noqa: E402
+from wideq.client import (  # noqa: E402
+    Client,
+    DeviceInfo,
+    DeviceType,
+    ModelInfo,
+    MonitorGroup,
+)
+from wideq.fakeserver import FakeDevice, FakeServer  # noqa: E402
+from wideq.util import device_classes  # noqa: E402
+
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "fixtures", "client.json"
+)
+
+
+def enum(*options: str) -> Dict[str, Any]:
+    return {
+        "type": "Enum",
+        "option": {str(i): option for i, option in enumerate(options)},
+    }
+
+
+def temps(lo: int, hi: int) -> Dict[str, Any]:
+    return {"type": "Enum", "option": {str(t): str(t) for t in range(lo, hi)}}
+
+
+AC_MODEL = {
+    "Info": {"modelName": "BENCH_AC"},
+    "Monitoring": {"type": "JSON"},
+    "Value": {
+        "OpMode": enum("@AC_MAIN_OPERATION_MODE_COOL_W"),
+        "WindStrength": enum("@AC_MAIN_WIND_STRENGTH_LOW_W"),
+        "WDirHStep": enum("@OFF"),
+        "WDirVStep": enum("@OFF"),
+        "Operation": enum(
+            "@AC_MAIN_OPERATION_OFF_W", "@AC_MAIN_OPERATION_RIGHT_ON_W"
+        ),
+        "TempCelToFah": temps(16, 31),
+        "TempFahToCel": temps(60, 87),
+    },
+}
+AC_STATUS = {
+    "TempCur": "22",
+    "TempCfg": "21",
+    "OpMode": "0",
+    "WindStrength": "0",
+    "WDirHStep": "0",
+    "WDirVStep": "0",
+    "Operation": "1",
+}
+
+REFRIGERATOR_MODEL = {
+    "Info": {"modelName": "BENCH_REF"},
+    "Monitoring": {"type": "JSON"},
+    "Value": {
+        "TempRefrigerator": temps(1, 8),
+        "TempFreezer": temps(-24, -14),
+        "IcePlus": enum("@CP_OFF_EN_W", "@CP_ON_EN_W"),
+        "FreshAirFilter": enum("@CP_TERM_OFF_KO_W"),
+        "SmartSavingMode": enum("@CP_TERM_USE_NOT_W"),
+        "DoorOpenState": enum("CLOSE", "OPEN"),
+        "TempUnit": enum("CELSIUS", "FAHRENHEIT"),
+        "SmartSavingModeStatus": enum("OFF", "ON"),
+        "LockingStatus": enum("UNLOCK", "LOCK"),
+        "EcoFriendly": enum("@CP_OFF_EN_W", "@CP_ON_EN_W"),
+    },
+}
+REFRIGERATOR_STATUS = {
+    "TempRefrigerator": "3",
+    "TempFreezer": "-18",
+    "IcePlus": "0",
+    "FreshAirFilter": "0",
+    "SmartSavingMode": "0",
+    "DoorOpenState": "0",
+    "TempUnit": "0",
+    "SmartSavingModeStatus": "0",
+    "LockingStatus": "0",
+    "ActiveSavingStatus": "0",
+    "EcoFriendly": "1",
+    "WaterFilterUsedMonth": "2",
+}
+
+
+def load_models() -> List[Dict[str, Any]]:
+    """Describe each benchmark model: its type, data and a status."""
+    with open(FIXTURE) as f:
+        fixture = json.load(f)["model_info"]
+    types = {
+        "Dryer": DeviceType.DRYER,
+        "FL": DeviceType.WASHER,
+        "DW": DeviceType.DISHWASHER,
+    }
+    models = []
+    for data in fixture.values():
+        info = data["Info"]
+        # A plausible running status: the first option of each enum.
+        status = {}
+        for item in data["Monitoring"]["protocol"]:
+            value = data["Value"].get(item["value"], {})
+            if value.get("type") in ("Enum", "enum"):
+                status[item["value"]] = int(next(iter(value["option"])))
+        status["Remain_Time_M"] = 13
+        models.append(
+            {
+                "name": info["modelName"],
+                "type": types[info["modelType"]],
+                "data": data,
+                "status": status,
+            }
+        )
+    models.append(
+        {
+            "name": "BENCH_AC",
+            "type": DeviceType.AC,
+            "data": AC_MODEL,
+            "status": AC_STATUS,
+        }
+    )
+    models.append(
+        {
+            "name": "BENCH_REF",
+            "type": DeviceType.REFRIGERATOR,
+            "data": REFRIGERATOR_MODEL,
+            "status": REFRIGERATOR_STATUS,
+        }
+    )
+    return models
+
+
+def frame_for(model: Dict[str, Any]) -> bytes:
+    device = FakeDevice("bench", model["type"].value, model["data"])
+    device.status = dict(model["status"])
+    return device.frame()
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time a function, returning the best time per call."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat, number)) / number
+    return {"ns_per_op": best * 1e9, "ops_per_sec": 1 / best}
+
+
+def bench_micro(models, repeat: int) -> Dict[str, Any]:
+    out = {}
+    client = Client()
+    for model in models:
+        name = model["name"]
+        info = ModelInfo(model["data"])
+        frame = frame_for(model)
+        kind = "binary" if info.binary_monitor_data else "json"
+        out["decode.{}.{}".format(kind, name)] = measure(
+            lambda: info.decode_monitor(frame), repeat
+        )
+
+        values = model["data"]["Value"]
+        enums = [k for k, v in values.items() if v["type"] in ("Enum", "enum")]
+        refs = [k for k, v in values.items() if v["type"] == "Reference"]
+        key = enums[0]
+        option = next(iter(values[key]["option"]))
+        out["lookup.value." + name] = measure(lambda: info.value(key), repeat)
+        out["lookup.enum_name." + name] = measure(
+            lambda: info.enum_name(key, option), repeat
+        )
+        for ref in refs:
+            ref_value = next(iter(info.value(ref).reference), None)
+            if ref_value is not None:
+                out["lookup.reference_name." + name] = measure(
+                    lambda: info.reference_name(ref, ref_value), repeat
+                )
+                break
+
+        cls = device_classes()[model["type"]]
+        device_info = DeviceInfo(
+            {
+                "deviceId": "bench",
+                "alias": name,
+                "deviceType": model["type"].value,
+                "modelJsonUrl": "bench://" + name,
+            }
+        )
+        device = cls(client, device_info, info)
+        out["status.{}.{}".format(cls.__name__, name)] = measure(
+            lambda: device._parse_status(frame).to_dict(), repeat
+        )
+    return out
+
+
+def bench_import(repeat: int) -> Dict[str, Any]:
+    """Time fresh interpreters importing wideq, and then using it."""
+    root = os.path.join(os.path.dirname(__file__), "..")
+    out = {}
+    for name, code in (
+        ("import.baseline", "pass"),
+        ("import.wideq", "import wideq"),
+        ("import.wideq.Client", "import wideq; wideq.Client"),
+        ("import.wideq.all", "from wideq import *"),
+    ):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+            times.append(time.perf_counter() - start)
+        out[name] = {"ms": min(times) * 1e3}
+    return out
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+
+    def at(p):
+        return samples[min(len(samples) - 1, int(p * len(samples)))] * 1e3
+
+    return {
+        "p50_ms": at(0.50),
+        "p90_ms": at(0.90),
+        "p99_ms": at(0.99),
+        "mean_ms": statistics.mean(samples) * 1e3,
+    }
+
+
+def bench_e2e(model, count: int, polls: int, http: str) -> Dict[str, Any]:
+    """Poll `count` simulated devices of one model, `polls` times in all,
+    one request per poll and then batched.
+    """
+    fakes = [
+        FakeDevice(
+            "dev-{}".format(i),
+            model["type"].value,
+            model["data"],
+            status=dict(model["status"]),
+            warmup=0,
+        )
+        for i in range(count)
+    ]
+    server = FakeServer(fakes)
+    transport: core.Transport
+    if http == "memory":
+        transport = core.MemoryTransport(server.handle)
+    else:
+        server.serve()
+        transport = (
+            core.Urllib3Transport(count)
+            if http == "urllib3"
+            else core.RequestsTransport(core.retry_session(count))
+        )
+
+    try:
+        client = server.client(transport)
+        devices = [client.get_device_obj(d.id) for d in client.devices]
+        for device in devices:
+            device.monitor_start()
+
+        # Polls one device at a time. The status changes between rounds
+        # so that every poll decodes a new frame.
+        latencies = []
+        start = time.perf_counter()
+        for i in range(polls):
+            fake = fakes[i % count]
+            fake.status["Remain_Time_M"] = i % 60
+            t = time.perf_counter()
+            devices[i % count].poll()
+            latencies.append(time.perf_counter() - t)
+        elapsed = time.perf_counter() - start
+        out: Dict[str, Any] = {"polls_per_sec": polls / elapsed}
+        out.update(percentiles(latencies))
+
+        # Polls every device in one request per round.
+        group = MonitorGroup(client.session, [d.device.id for d in devices])
+        group.start()
+        rounds = max(1, polls // count)
+        batch_latencies = []
+        start = time.perf_counter()
+        for _ in range(rounds):
+            t = time.perf_counter()
+            group.poll()
+            batch_latencies.append(time.perf_counter() - t)
+        elapsed = time.perf_counter() - start
+        out["batched"] = {"polls_per_sec": rounds * count / elapsed}
+        out["batched"].update(percentiles(batch_latencies))
+        return out
+    finally:
+        server.shutdown()
+        transport.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--quick", action="store_true", help="fewer repeats and polls"
+    )
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="also poll over local HTTP, with each transport",
+    )
+    parser.add_argument("--output", help="write the JSON results here")
+    args = parser.parse_args()
+
+    repeat = 3 if args.quick else 7
+    polls = 500 if args.quick else 5000
+    models = load_models()
+
+    results = bench_micro(models, repeat)
+    results.update(bench_import(repeat))
+    washer = next(m for m in models if m["type"] == DeviceType.WASHER)
+    transports = ["memory"]
+    if args.http:
+        transports += ["requests", "urllib3"]
+    for transport in transports:
+        for count in (1, 100, 1000):
+            name = "e2e.{}.{}".format(transport, count)
+            print("running", name, file=sys.stderr)
+            results[name] = bench_e2e(
+                washer, count, max(polls, count), transport
+            )
+
+    report = {
+        "meta": {
+            "wideq": wideq.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+        },
+        "benchmarks": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ STATE_FILE = "wideq_state.json"
 LOGGER = logging.getLogger("wideq.example")
 
 
-def authenticate(gateway):
+def authenticate(gateway, http=None):
     """Interactively authenticate the user via a browser to get an OAuth
     session.
     """
@@ -24,7 +24,7 @@ def authenticate(gateway):
     print(login_url)
     print("Then paste the URL where the browser is redirected:")
     callback_url = input()
-    return wideq.Auth.from_url(gateway, callback_url)
+    return wideq.Auth.from_url(gateway, callback_url, http)
 
 
 def ls(client):
@@ -187,14 +187,15 @@ def ac_config(client, device_id):
     ac = wideq.ACDevice(client, _force_device(client, device_id))
     print(ac.supported_operations)
     print(ac.supported_on_operation)
-    print(ac.get_filter_state())
-    print(ac.get_mfilter_state())
-    print(ac.get_energy_target())
-    print(ac.get_power(), " watts")
-    print(ac.get_outdoor_power(), " watts")
-    print(ac.get_volume())
-    print(ac.get_light())
-    print(ac.get_zones())
+    config = ac.get_all_configs()
+    print(config["filter_state"])
+    print(config["mfilter_state"])
+    print(config["energy_target"])
+    print(config["power"], " watts")
+    print(config["outdoor_power"], " watts")
+    print(config["volume"])
+    print(config["light"])
+    print(config["zones"])
 
 
 EXAMPLE_COMMANDS = {
@@ -222,6 +223,7 @@ def example_command(client, cmd, args):
 def example(
     country: str, language: str, verbose: bool, cmd: str, args: List[str]
 ) -> None:
+    wideq.get_wideq_logger()
     if verbose:
         wideq.set_log_level(logging.DEBUG)
 
@@ -244,7 +246,7 @@ def example(
 
     # Log in, if we don't already have an authentication.
     if not client._auth:
-        client._auth = authenticate(client.gateway)
+        client._auth = authenticate(client.gateway, client._http)
 
     # Loop to retry if session has expired.
     while True:
@@ -0,0 +1,75 @@
+import base64
+import json
+import time
+import unittest
+
+from wideq import core
+from wideq.ac import ACDevice
+from wideq.client import ModelInfo
+from wideq.fakeserver import FakeDevice, FakeServer
+
+
+def config(value):
+    return base64.b64encode(json.dumps(value).encode("utf8")).decode()
+
+
+MODEL = {"Info": {"modelName": "AC"}, "Monitoring": {"type": "JSON"}}
+
+CONFIGS = {
+    "Filter": config({"ChangePeriod": "0", "UseTime": "0"}),
+    "MFilter": config({"ChangePeriod": "0", "UseTime": "0"}),
+    "EnergyDesiredValue": config({"Value": "0"}),
+    "OutTotalInstantPower": config({"OutTotalInstantPower": 300}),
+    "InOutInstantPower": config({"InOutInstantPower": 500}),
+    "DuctZone": config([{"No": "1", "Cfg": "1", "State": "1"}]),
+    "DisplayControl": "(DisplayControl:1)",
+    # SpkVolume is unsupported.
+}
+
+
+class ACConfigTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        # Slow enough to tell whether requests overlap.
+        self.server = FakeServer(
+            [FakeDevice("ac-1", 401, MODEL, configs=CONFIGS)], latency=0.2
+        )
+        client = self.server.client()
+        self.ac = ACDevice(client, client.get_device("ac-1"), ModelInfo(MODEL))
+
+    def test_get_configs(self):
+        values = self.ac.get_configs(["Filter", "Missing"], ["DisplayControl"])
+        self.assertEqual(
+            {"ChangePeriod": "0", "UseTime": "0"}, values["Filter"]
+        )
+        self.assertEqual("1", values["DisplayControl"])
+        self.assertIsInstance(values["Missing"], core.FailedRequestError)
+
+    def test_get_all_configs_concurrently(self):
+        self.ac.client.session
+        start = time.perf_counter()
+        values = self.ac.get_all_configs()
+        self.assertLess(time.perf_counter() - start, 4 * 0.2)
+
+        self.assertEqual(300, values["outdoor_power"])
+        self.assertEqual(500, values["power"])
+        self.assertEqual(0, values["volume"])
+        self.assertFalse(values["light"])
+        self.assertEqual("1", values["zones"][0]["State"])
+        self.assertEqual(8, self.server.requests["/api/rti/rtiControl"])
+
+    def test_setters_return_none(self):
+        self.assertIsNone(self.ac.set_celsius(21))
+        with self.ac.batch():
+            self.assertIsNone(self.ac.set_celsius(22))
+        self.assertEqual(2, self.server.requests["/api/rti/rtiControl"])
+
+    def test_get_configs_rejects_duplicate_keys(self):
+        with self.assertRaises(ValueError):
+            self.ac.get_configs(["Filter"], ["Filter"])
+
+    def test_get_methods_match_get_all_configs(self):
+        values = self.ac.get_all_configs()
+        self.assertEqual(values["outdoor_power"], self.ac.get_outdoor_power())
+        self.assertEqual(values["light"], self.ac.get_light())
+        self.assertEqual(values["volume"], self.ac.get_volume())
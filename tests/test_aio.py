@@ -0,0 +1,351 @@
+import asyncio
+import base64
+import json
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from wideq import aio, core
+from wideq.aio import (
+    AsyncACDevice,
+    AsyncClient,
+    AsyncMonitor,
+    AsyncWasherDevice,
+)
+from wideq.ac import ACMode
+from wideq.cache import ModelCache
+from wideq.client import Client, DeviceInfo, ModelInfo
+from wideq.washer import WasherState, WasherStatus
+
+
+WASHER_URL = (
+    "https://aic.lgthinq.com:46030/api/webContents/modelJSON?"
+    "modelName=F3L2CYV5W_WIFI&countryCode=WW&contentsId="
+    "JS1217232703654216&authKey=thinq"
+)
+
+# A binary monitoring frame for the washer model: rinsing with 13
+# minutes remaining.
+WASHER_FRAME = bytes(
+    [30, 0, 13, 0, 58, 10, 0, 0, 5, 4, 1, 0, 0, 0, 0, 0, 2, 0, 0, 23, 51]
+    + [15, 0, 4]
+)
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class FakePost(object):
+    """Stand in for `AsyncSession.post`, returning canned responses."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    async def __call__(self, path, data=None):
+        self.calls.append((path, data))
+        return self.responses.pop(0)
+
+
+class FakeResponse(object):
+    """Stand in for an aiohttp response."""
+
+    def __init__(self, status=200, content=b"{}"):
+        self.status = status
+        self.content = content
+        self.request_info = mock.Mock(headers={})
+
+    async def read(self):
+        return self.content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type, value, tb):
+        pass
+
+
+class RequestJsonTest(unittest.TestCase):
+    URL = "https://aic.lgthinq.com:46030/api/rti/rtiResult"
+
+    def test_timeout_fits_deadline(self):
+        http = mock.Mock()
+        http.request.return_value = FakeResponse()
+        deadline = time.monotonic() + 10
+        run(aio.request_json(http, "GET", self.URL, (5, 20), deadline))
+        timeout = http.request.call_args[1]["timeout"]
+        self.assertEqual(5, timeout.sock_connect)
+        self.assertTrue(9 < timeout.sock_read <= 10)
+        self.assertTrue(9 < timeout.total <= 10)
+
+    def test_passed_deadline(self):
+        http = mock.Mock()
+        with self.assertRaises(core.DeadlineExceededError):
+            run(
+                aio.request_json(
+                    http, "GET", self.URL, deadline=time.monotonic() - 1
+                )
+            )
+        http.request.assert_not_called()
+
+    def test_post_status_not_retried(self):
+        http = mock.Mock()
+        http.request.return_value = FakeResponse(503)
+        run(aio.request_json(http, "POST", self.URL))
+        self.assertEqual(1, http.request.call_count)
+
+
+class AsyncClientTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            self.state = json.load(fp)
+        self.client = AsyncClient.load(self.state)
+
+    def test_dump_round_trip(self):
+        self.assertEqual(self.state, self.client.dump())
+
+    def test_client_state_round_trip(self):
+        with tempfile.TemporaryDirectory() as path:
+            client = Client.load(self.state, ModelCache(path))
+            client._refreshed_at = 1000.0
+            state = client.dump()
+            self.assertEqual(state, AsyncClient.load(state).dump())
+
+    def test_gateway_discovered_lazily(self):
+        state = dict(self.state)
+        gateway = core.Gateway.deserialize(state.pop("gateway"))
+        client = AsyncClient.load(state)
+        self.assertEqual(state, client.dump())
+
+        async def discover_gateway(*args):
+            return gateway
+
+        async def get_session():
+            session = await client.get_session()
+            await client.close()
+            return session
+
+        with mock.patch.object(aio, "discover_gateway", discover_gateway):
+            session = run(get_session())
+        self.assertIs(gateway, session.auth.gateway)
+        self.assertEqual(self.state, client.dump())
+
+    def test_washer_poll(self):
+        self.client.recorder = mock.Mock()
+
+        async def poll():
+            session = await self.client.get_session()
+            session.post = FakePost(
+                {"workId": "w1"},
+                {"workList": {"deviceId": "d1", "workId": "w1"}},
+                {
+                    "workList": {
+                        "deviceId": "d1",
+                        "workId": "w1",
+                        "returnCode": "0000",
+                        "returnData": base64.b64encode(WASHER_FRAME),
+                    }
+                },
+            )
+            device_info = DeviceInfo(
+                {
+                    "alias": "WASHER",
+                    "deviceId": "d1",
+                    "deviceType": 201,
+                    "modelJsonUrl": WASHER_URL,
+                    "modelNm": "F3L2CYV5W_WIFI",
+                }
+            )
+            model = await self.client.model_info(device_info)
+            washer = AsyncWasherDevice(self.client, device_info, model)
+            await washer.monitor_start()
+            results = [await washer.poll(), await washer.poll()]
+            await self.client.close()
+            return results
+
+        warmup, status = run(poll())
+        self.assertIsNone(warmup)
+        self.assertIsInstance(status, WasherStatus)
+        self.assertEqual(WasherState.RINSING, status.state)
+        self.assertEqual(13, status.remaining_time)
+        self.assertEqual("Towels", status.course)
+
+        # The frame is recorded by the session, as it is polled.
+        (device, data), _ = self.client.recorder.record.call_args
+        self.assertEqual("d1", device.id)
+        self.assertEqual(WASHER_FRAME, data)
+
+    def test_monitor_restarts_on_error(self):
+        async def poll():
+            session = await self.client.get_session()
+            session.post = FakePost(
+                {"workId": "w1"},
+                {"workList": {"returnCode": "0106", "workId": "w1"}},
+                {},
+                {"workId": "w2"},
+            )
+            mon = AsyncMonitor(session, "d1")
+            await mon.start()
+            result = await mon.poll()
+            await self.client.close()
+            return mon, session.post, result
+
+        mon, post, result = run(poll())
+        self.assertIsNone(result)
+        self.assertEqual("w2", mon.work_id)
+        self.assertEqual("Stop", post.calls[2][1]["cmdOpt"])
+
+    def test_concurrent_login_and_model_loads_are_shared(self):
+        logins = []
+        downloads = []
+
+        async def start_session(http, auth, *args):
+            logins.append(auth)
+            await asyncio.sleep(0.01)
+            return aio.AsyncSession(auth, "s1", http), []
+
+        async def request_json(http, method, url, *args, **kwargs):
+            downloads.append(url)
+            await asyncio.sleep(0.01)
+            return {"Info": {"modelName": "M"}}
+
+        async def load():
+            self.client._session_id = None
+            info = DeviceInfo({"deviceId": "d1", "modelJsonUrl": "m.json"})
+            sessions = await asyncio.gather(
+                *(self.client.get_session() for _ in range(10))
+            )
+            models = await asyncio.gather(
+                *(self.client.model_info(info) for _ in range(10))
+            )
+            await self.client.close()
+            return sessions, models
+
+        with mock.patch.object(aio, "start_session", start_session):
+            with mock.patch.object(aio, "request_json", request_json):
+                sessions, models = run(load())
+        self.assertEqual(1, len(logins))
+        self.assertEqual(["m.json"], downloads)
+        self.assertEqual(1, len({id(s) for s in sessions}))
+        self.assertEqual(1, len({id(m) for m in models}))
+
+    def test_refresh_updates_session_in_place(self):
+        refreshes = []
+        new_auth = mock.Mock()
+
+        async def refresh_auth(http, auth, *args):
+            refreshes.append(auth)
+            await asyncio.sleep(0.01)
+            return new_auth
+
+        async def start_session(http, auth, *args):
+            return aio.AsyncSession(auth, "s2", http), []
+
+        async def refresh():
+            session = await self.client.get_session()
+            monitor = AsyncMonitor(session, "d1")
+            await asyncio.gather(*(self.client.refresh() for _ in range(5)))
+            await self.client.close()
+            return session, monitor
+
+        with mock.patch.object(aio, "refresh_auth", refresh_auth):
+            with mock.patch.object(aio, "start_session", start_session):
+                session, monitor = run(refresh())
+        self.assertEqual(1, len(refreshes))
+        self.assertIs(monitor.session, session)
+        self.assertEqual("s2", session.session_id)
+        self.assertIs(new_auth, session.auth)
+
+
+class AsyncACDeviceTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            self.client = AsyncClient.load(json.load(fp))
+        model = ModelInfo(
+            {
+                "Info": {"modelName": "AC"},
+                "Monitoring": {"type": "JSON"},
+                "Value": {
+                    "OpMode": {
+                        "type": "Enum",
+                        "option": {"0": "@AC_MAIN_OPERATION_MODE_COOL_W"},
+                    }
+                },
+            }
+        )
+        info = DeviceInfo({"deviceId": "d1", "deviceType": 401})
+        self.ac = AsyncACDevice(self.client, info, model)
+
+    def control(self, coro_fn, *responses):
+        async def go():
+            session = await self.client.get_session()
+            session.post = FakePost(*responses)
+            result = await coro_fn()
+            await self.client.close()
+            return session.post.calls, result
+
+        return run(go())
+
+    def test_set_control(self):
+        calls, _ = self.control(lambda: self.ac.set_celsius(21), {})
+        self.assertEqual(1, len(calls))
+        self.assertEqual("rti/rtiControl", calls[0][0])
+        self.assertEqual({"TempCfg": 21}, calls[0][1]["value"])
+
+    def test_set_enum_control(self):
+        calls, _ = self.control(lambda: self.ac.set_mode(ACMode.COOL), {})
+        self.assertEqual({"OpMode": "0"}, calls[0][1]["value"])
+
+    def test_batch(self):
+        async def batch():
+            async with self.ac.batch():
+                await self.ac.set_celsius(21)
+                await self.ac.set_celsius(22)
+
+        calls, _ = self.control(batch, {})
+        self.assertEqual(1, len(calls))
+        self.assertEqual({"TempCfg": 22}, calls[0][1]["value"])
+
+    def test_batch_is_per_task(self):
+        async def batch():
+            async with self.ac.batch():
+                await self.ac.set_celsius(21)
+                # Another task's change is not pulled into the batch.
+                await asyncio.ensure_future(self.ac.set_celsius(18))
+
+        calls, _ = self.control(batch, {}, {})
+        self.assertEqual(
+            [{"TempCfg": 18}, {"TempCfg": 21}],
+            [data["value"] for _, data in calls],
+        )
+
+    def test_get_all_configs(self):
+        def config(value):
+            data = base64.b64encode(json.dumps(value).encode("utf8"))
+            return {"returnData": data.decode()}
+
+        # One response per value, in the order of CONFIG_VALUES.
+        responses = [
+            config({"ChangePeriod": "0"}),
+            config({"ChangePeriod": "0"}),
+            config({"Value": "0"}),
+            config({"OutTotalInstantPower": 300}),
+            config({"InOutInstantPower": 500}),
+            config([]),
+            {"returnData": "(DisplayControl:0)"},
+            {"returnData": "(SpkVolume:3)"},
+        ]
+        calls, values = self.control(self.ac.get_all_configs, *responses)
+        self.assertEqual(8, len(calls))
+        self.assertEqual(300, values["outdoor_power"])
+        self.assertEqual(500, values["power"])
+        self.assertTrue(values["light"])
+        self.assertEqual(3, values["volume"])
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from wideq.cache import ModelCache
+from wideq.client import Client, DeviceInfo
+
+
+WASHER_URL = (
+    "https://aic.lgthinq.com:46030/api/webContents/modelJSON?"
+    "modelName=F3L2CYV5W_WIFI&countryCode=WW&contentsId="
+    "JS1217232703654216&authKey=thinq"
+)
+
+# A binary monitoring frame for the washer model.
+WASHER_FRAME = bytes(
+    [30, 0, 13, 0, 58, 10, 0, 0, 5, 4, 1, 0, 0, 0, 0, 0, 2, 0, 0, 23, 51]
+    + [15, 0, 4]
+)
+
+
+class ModelCacheTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            self.state = json.load(fp)
+        self.data = self.state["model_info"][WASHER_URL]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "models")
+        self.cache = ModelCache(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_directory_is_private(self):
+        self.assertEqual(0o700, os.stat(self.path).st_mode & 0o777)
+
+    def test_miss(self):
+        self.assertNotIn(WASHER_URL, self.cache)
+        self.assertIsNone(self.cache.get(WASHER_URL))
+
+    def test_round_trip(self):
+        model = self.cache.put(WASHER_URL, self.data)
+        self.assertIn(WASHER_URL, self.cache)
+        self.assertEqual(self.data, self.cache.get_data(WASHER_URL))
+
+        # Another cache on the same directory, as in another process.
+        cached = ModelCache(self.path).get(WASHER_URL)
+        self.assertEqual(self.data, cached.data)
+        self.assertEqual(
+            model.decode_monitor(WASHER_FRAME),
+            cached.decode_monitor(WASHER_FRAME),
+        )
+        self.assertIn("State", cached._values)
+        self.assertEqual(
+            ["{}.json.gz", "{}.pickle.gz"],
+            sorted(
+                name.replace(name[:64], "{}") for name in os.listdir(self.path)
+            ),
+        )
+
+    def test_rebuilds_bad_compiled_entry(self):
+        self.cache.put(WASHER_URL, self.data)
+        compiled = self.cache._entry_path(WASHER_URL, ".pickle.gz")
+        with open(compiled, "wb") as f:
+            f.write(b"garbage")
+
+        with self.assertLogs("wideq.cache", "WARNING"):
+            model = self.cache.get(WASHER_URL)
+        self.assertEqual(self.data, model.data)
+        self.assertIsNotNone(ModelCache(self.path).get(WASHER_URL))
+
+    def test_client_uses_cache(self):
+        device = DeviceInfo(
+            {"deviceId": "d1", "modelJsonUrl": WASHER_URL, "deviceType": 201}
+        )
+        client = Client(model_cache=self.cache)
+        with mock.patch.object(
+            DeviceInfo, "load_model_info", return_value=self.data
+        ) as load:
+            client.model_info(device)
+            Client(model_cache=ModelCache(self.path)).model_info(device)
+        load.assert_called_once()
+
+        state = client.dump()
+        self.assertNotIn("model_info", state)
+        self.assertEqual(self.path, state["model_cache"])
+        self.assertEqual(self.path, Client.load(state)._model_cache.path)
+
+    def test_load_moves_models_into_cache(self):
+        client = Client.load(self.state, model_cache=self.cache)
+        self.assertIn(WASHER_URL, self.cache)
+        self.assertEqual({}, client._model_info)
+        self.assertNotIn("model_info", client.dump())
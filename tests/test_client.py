@@ -1,13 +1,28 @@
+import json
+import threading
+import time
 import unittest
+from unittest import mock
 
+from wideq import core
 from wideq.client import (
+    BinaryProtocol,
     BitValue,
+    Client,
+    Device,
+    DeviceInfo,
+    DeviceType,
     EnumValue,
     ModelInfo,
+    Monitor,
+    MonitorGroup,
     RangeValue,
     ReferenceValue,
+    SESSION_LIFETIME,
     StringValue,
 )
+from wideq.core import MonitorError
+from wideq.fakeserver import FakeDevice, FakeServer
 
 
 DATA = {
@@ -149,3 +164,432 @@ class ModelInfoTest(unittest.TestCase):
             f" type: 'Unexpected' data: '{data}",
         ):
             self.model_info.value("Unexpected2")
+
+    def test_value_cached(self):
+        self.assertIs(
+            self.model_info.value("AntiBacterial"),
+            self.model_info.value("AntiBacterial"),
+        )
+
+    def test_enum_value(self):
+        self.assertEqual(
+            "1", self.model_info.enum_value("AntiBacterial", "@CP_ON_EN_W")
+        )
+        self.assertEqual(
+            "0", self.model_info.enum_value("AntiBacterial", "@CP_OFF_EN_W")
+        )
+
+    def test_reference_name(self):
+        self.assertEqual("Normal", self.model_info.reference_name("Course", 3))
+        self.assertIsNone(self.model_info.reference_name("Course", 4))
+
+
+class MonitorGroupTest(unittest.TestCase):
+    def test_poll_restarts_failed_monitors(self):
+        session = mock.Mock()
+        session.monitor_start.side_effect = ["w1", "w2", "w3"]
+        session.monitor_poll_many.return_value = {
+            "d1": b"\x01",
+            "d2": MonitorError("d2", "0106"),
+        }
+        with MonitorGroup(session, ["d1", "d2"]) as group:
+            results = group.poll()
+            self.assertEqual({"d1": b"\x01", "d2": None}, results)
+            session.monitor_poll_many.assert_called_once_with(
+                [("d1", "w1"), ("d2", "w2")]
+            )
+            session.monitor_stop.assert_called_once_with("d2", "w2")
+            self.assertEqual("w3", group.monitors["d2"].work_id)
+            self.assertEqual("w1", group.monitors["d1"].work_id)
+
+
+class DeviceBatchTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = mock.Mock()
+        self.device = Device(self.client, DeviceInfo({"deviceId": "d1"}))
+        self.set_controls = self.client.session.set_device_controls
+
+    def test_unbatched(self):
+        self.device._set_control("OpMode", "1")
+        self.set_controls.assert_called_once_with("d1", {"OpMode": "1"})
+
+    def test_batch_coalesces(self):
+        with self.device.batch():
+            self.device._set_control("OpMode", "1")
+            self.device._set_control("TempCfg", 20)
+            with self.device.batch():
+                self.device._set_control("OpMode", "2")
+            self.set_controls.assert_not_called()
+        self.set_controls.assert_called_once_with(
+            "d1", {"OpMode": "2", "TempCfg": 20}
+        )
+
+    def test_batch_discarded_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.device.batch():
+                self.device._set_control("OpMode", "1")
+                raise RuntimeError()
+        self.set_controls.assert_not_called()
+        self.device._set_control("OpMode", "3")
+        self.set_controls.assert_called_once_with("d1", {"OpMode": "3"})
+
+    def test_batch_is_per_thread(self):
+        other = threading.Thread(
+            target=self.device._set_control, args=("TempCfg", 20)
+        )
+        with self.assertRaises(RuntimeError):
+            with self.device.batch():
+                self.device._set_control("OpMode", "1")
+                other.start()
+                other.join()
+                raise RuntimeError()
+        # The other thread's change was sent, and not dropped with the
+        # batch.
+        self.set_controls.assert_called_once_with("d1", {"TempCfg": 20})
+
+
+class BinaryProtocolTest(unittest.TestCase):
+    PROTOCOL = [
+        {"startByte": 0, "length": 1, "value": "State"},
+        {"startByte": 1, "length": 2, "value": "Time"},
+        {"startByte": 5, "length": 1, "value": "Error"},
+    ]
+
+    def test_decode_struct(self):
+        protocol = BinaryProtocol(self.PROTOCOL)
+        self.assertIsNotNone(protocol.struct)
+        data = bytes([7, 1, 2, 9, 9, 3])
+        self.assertEqual(
+            {"State": "7", "Time": "258", "Error": "3"}, protocol.decode(data)
+        )
+        self.assertEqual(
+            {"State": 7, "Time": 258, "Error": 3},
+            protocol.decode(data, raw=True),
+        )
+
+    def test_decode_short_frame(self):
+        protocol = BinaryProtocol(self.PROTOCOL)
+        self.assertEqual(
+            {"State": "7", "Time": "1", "Error": "0"},
+            protocol.decode(bytes([7, 1])),
+        )
+
+    def test_decode_irregular_fields(self):
+        protocol = BinaryProtocol(
+            [
+                {"startByte": 0, "length": 3, "value": "Wide"},
+                {"startByte": 2, "length": 1, "value": "Overlap"},
+            ]
+        )
+        self.assertIsNone(protocol.struct)
+        self.assertEqual(
+            {"Wide": str(0x010203), "Overlap": "3"},
+            protocol.decode(bytes([1, 2, 3])),
+        )
+
+    def test_model_info_decode_monitor(self):
+        model = ModelInfo(
+            {
+                "Monitoring": {
+                    "type": "BINARY(BYTE)",
+                    "protocol": self.PROTOCOL,
+                }
+            }
+        )
+        data = bytes([7, 0, 2, 0, 0, 3])
+        self.assertEqual(
+            {"State": "7", "Time": "2", "Error": "3"},
+            model.decode_monitor(data),
+        )
+        self.assertEqual(
+            {"State": 7, "Time": 2, "Error": 3},
+            model.decode_monitor(data, raw=True),
+        )
+        self.assertIs(model.binary_protocol, model.binary_protocol)
+
+
+class MonitorChangesTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.session = mock.Mock()
+        self.session.monitor_start.return_value = "w1"
+        self.model = ModelInfo(
+            {
+                "Monitoring": {
+                    "type": "BINARY(BYTE)",
+                    "protocol": BinaryProtocolTest.PROTOCOL,
+                }
+            }
+        )
+        self.mon = Monitor(self.session, "d1", self.model)
+        self.mon.start()
+
+    def test_decode_unchanged_frame(self):
+        decoded = self.mon.decode(bytes([1, 0, 2, 0, 0, 3]))
+        self.assertIs(decoded, self.mon.decode(bytes([1, 0, 2, 0, 0, 3])))
+        self.assertIsNot(decoded, self.mon.decode(bytes([2, 0, 2, 0, 0, 3])))
+
+    def test_poll_changes(self):
+        self.session.monitor_poll.side_effect = [
+            None,
+            bytes([1, 0, 2, 0, 0, 3]),
+            bytes([1, 0, 2, 0, 0, 3]),
+            bytes([1, 0, 1, 0, 0, 3]),
+        ]
+        self.assertIsNone(self.mon.poll_changes())
+        self.assertEqual(
+            {"State": "1", "Time": "2", "Error": "3"}, self.mon.poll_changes()
+        )
+        self.assertEqual({}, self.mon.poll_changes())
+        self.assertEqual({"Time": "1"}, self.mon.poll_changes())
+
+
+class ClientRefreshTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth = mock.Mock()
+        self.new_auth = self.auth.refresh.return_value
+        self.new_session = mock.Mock(session_id="new")
+        self.new_auth.start_session.return_value = (self.new_session, [])
+        self.session = core.Session(self.auth, "old")
+        self.client = Client(auth=self.auth, session=self.session)
+
+    def test_refresh_updates_session_in_place(self):
+        self.client.refresh()
+        self.assertIs(self.session, self.client.session)
+        self.assertEqual("new", self.session.session_id)
+        self.assertIs(self.new_session.auth, self.session.auth)
+        self.assertIsNotNone(self.client.dump()["refreshed_at"])
+
+    def test_refresh_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_refresh(deadline=None, timeout=None):
+            started.set()
+            release.wait()
+            return self.new_auth
+
+        self.auth.refresh.side_effect = slow_refresh
+        threads = [
+            threading.Thread(target=self.client.refresh) for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, self.auth.refresh.call_count)
+
+    def test_session_refreshed_ahead_of_expiry(self):
+        self.client._refreshed_at = time.time()
+        self.assertFalse(self.client.needs_refresh())
+        self.client.session
+        self.auth.refresh.assert_not_called()
+
+        self.client._refreshed_at = time.time() - SESSION_LIFETIME
+        self.assertTrue(self.client.needs_refresh())
+        self.client.session
+        self.assertEqual(1, self.auth.refresh.call_count)
+        self.assertFalse(self.client.needs_refresh())
+
+    def test_early_refresh_failure_keeps_session(self):
+        self.auth.refresh.side_effect = RuntimeError("token endpoint down")
+        # Still valid for 200 seconds: the current session is used.
+        self.client._refreshed_at = time.time() - SESSION_LIFETIME + 200
+        with self.assertLogs("wideq.client", "WARNING"):
+            self.assertIs(self.session, self.client.session)
+        self.assertEqual("old", self.session.session_id)
+        # The refresh is not retried on every use.
+        self.client.session
+        self.assertEqual(1, self.auth.refresh.call_count)
+
+        # Once the session has expired, the error gets through.
+        self.client._refreshed_at = time.time() - SESSION_LIFETIME - 1
+        with self.assertRaises(RuntimeError):
+            self.client.session
+
+
+class ClientTimeoutTest(unittest.TestCase):
+    def test_timeout_reaches_every_request(self):
+        server = FakeServer([])
+        timeouts = []
+
+        class Transport(core.MemoryTransport):
+            def send(self, method, url, timeout, **kwargs):
+                timeouts.append((url, timeout))
+                return super().send(method, url, timeout, **kwargs)
+
+        client = server.client(
+            Transport(server.handle), gateway=None, timeout=(1.0, 2.0)
+        )
+        client.gateway
+        client.session
+        client.refresh()
+
+        urls = [url for url, _ in timeouts]
+        self.assertEqual(core.GATEWAY_URL, urls[0])
+        self.assertTrue(any(url.endswith("/oauth2/token") for url in urls))
+        for url, timeout in timeouts:
+            self.assertEqual((1.0, 2.0), timeout, url)
+
+
+class ClientWarmUpTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = Client(session=mock.Mock())
+        self.client._devices = [
+            {"deviceId": "d1", "modelJsonUrl": "http://a", "deviceType": 201},
+            {"deviceId": "d2", "modelJsonUrl": "http://b", "deviceType": 202},
+            {"deviceId": "d3", "modelJsonUrl": "http://a", "deviceType": 201},
+        ]
+
+    def test_loads_each_model_once(self):
+        threads = set()
+
+        def load(http, timeout):
+            threads.add(threading.current_thread().name)
+            return DATA
+
+        with mock.patch.object(
+            DeviceInfo, "load_model_info", side_effect=load
+        ) as load_model_info:
+            devices = self.client.warm_up(timeout=5)
+
+        self.assertEqual(["d1", "d2", "d3"], [d.id for d in devices])
+        self.assertEqual(2, load_model_info.call_count)
+        self.assertTrue(all(t.startswith("wideq-warm-up") for t in threads))
+        model = self.client.model_info(devices[0])
+        self.assertIs(model, self.client.model_info(devices[2]))
+        self.assertIn("AntiBacterial", model._enum_values)
+
+    def test_skips_failed_models(self):
+        def load(http, timeout):
+            if self.client._model_info:
+                raise ValueError("bad JSON")
+            return DATA
+
+        with mock.patch.object(
+            DeviceInfo, "load_model_info", side_effect=load
+        ), self.assertLogs("wideq.client", "ERROR"):
+            self.client.warm_up(max_workers=1)
+        self.assertEqual(1, len(self.client._models))
+
+
+def ids(changes):
+    return tuple([info.id for info in infos] for infos in changes)
+
+
+class DeviceRegistryTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = Client(session=mock.Mock())
+        self.client._models["http://a"] = ModelInfo(DATA)
+        self.client._models["http://b"] = ModelInfo(DATA)
+        self.washer = {
+            "deviceId": "d1",
+            "modelNm": "WASHER",
+            "modelJsonUrl": "http://a",
+            "deviceType": 201,
+        }
+        self.dryer = {
+            "deviceId": "d2",
+            "modelNm": "DRYER",
+            "modelJsonUrl": "http://b",
+            "deviceType": 202,
+        }
+        self.client._devices = [self.washer, self.dryer]
+
+    def test_lookup(self):
+        registry = self.client.registry
+        self.assertEqual(2, len(registry))
+        self.assertIn("d1", registry)
+        self.assertIs(registry.get("d2"), self.client.get_device("d2"))
+        self.assertIsNone(self.client.get_device("d3"))
+        self.assertEqual(
+            ["d2"], [d.id for d in registry.by_type(DeviceType.DRYER)]
+        )
+        self.assertEqual(["d1"], [d.id for d in registry.by_model("WASHER")])
+        self.assertEqual([], registry.by_model("AC"))
+
+    def test_refresh_devices(self):
+        washer = self.client.get_device_obj("d1")
+        dryer = self.client.get_device_obj("d2")
+        self.assertIs(washer, self.client.get_device_obj("d1"))
+
+        # A new alias is reported, but the device keeps its objects.
+        renamed = dict(self.dryer, alias="Dryer")
+        self.client.session.get_devices.return_value = [
+            dict(self.washer, online=True),
+            renamed,
+        ]
+        changes = self.client.refresh_devices()
+        self.assertEqual(([], [], ["d2"]), ids(changes))
+        self.assertIs(washer, self.client.get_device_obj("d1"))
+        self.assertIs(dryer, self.client.get_device_obj("d2"))
+        self.assertEqual("Dryer", dryer.device.name)
+
+        # A new model needs a new device object.
+        moved = dict(renamed, modelJsonUrl="http://a")
+        new = dict(self.washer, deviceId="d3")
+        self.client.session.get_devices.return_value = [moved, new]
+        changes = self.client.refresh_devices()
+        self.assertEqual((["d3"], ["d1"], ["d2"]), ids(changes))
+        self.assertIsNone(self.client.get_device_obj("d1"))
+        self.assertIsNot(dryer, self.client.get_device_obj("d2"))
+
+    def test_changes_across_session_refresh(self):
+        with open("./tests/fixtures/client.json") as fp:
+            model_info = next(iter(json.load(fp)["model_info"].values()))
+        server = FakeServer([FakeDevice("washer-1", 201, model_info)])
+        client = server.client()
+        self.assertEqual(["washer-1"], [d.id for d in client.devices])
+
+        # The refresh gets the new device list; using the registry then
+        # must not hide the change from the next sync.
+        server.devices["washer-2"] = FakeDevice("washer-2", 201, model_info)
+        client.refresh()
+        self.assertIn("washer-2", client.registry)
+        changes = client.refresh_devices()
+        self.assertEqual((["washer-2"], [], []), ids(changes))
+        self.assertEqual(([], [], []), ids(client.refresh_devices()))
+
+
+class ClientThreadTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            model_info = next(iter(json.load(fp)["model_info"].values()))
+        # Slow enough that the threads overlap.
+        self.server = FakeServer(
+            [FakeDevice("washer-1", 201, model_info)], latency=0.05
+        )
+        self.client = self.server.client(gateway=None)
+
+    def test_lazy_setup_happens_once(self):
+        devices = []
+
+        def use():
+            self.client.gateway
+            devices.append(self.client.get_device_obj("washer-1"))
+
+        threads = [threading.Thread(target=use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(8, len(devices))
+        self.assertEqual(1, len({id(device.model) for device in devices}))
+        self.assertEqual(
+            {
+                "/api/common/gatewayUriList": 1,
+                "/api/member/login": 1,
+                "/api/device/deviceList": 1,
+                "/model/washer-1.json": 1,
+            },
+            self.server.requests,
+        )
@@ -1,4 +1,7 @@
+import time
 import unittest
+from unittest import mock
+
 import responses
 
 import wideq.core
@@ -58,3 +61,216 @@ class SimpleTest(unittest.TestCase):
             gatewayInstance.api_root, "https://eic.lgthinq.com:46030/api"
         )
         self.assertEqual(gatewayInstance.oauth_root, "https://no.lgeapi.com")
+
+
+class PoolTest(unittest.TestCase):
+    def test_shared_session_is_reused(self):
+        self.assertIs(wideq.core.shared_session(), wideq.core.shared_session())
+
+    def test_pool_size(self):
+        session = wideq.core.retry_session(pool_size=3)
+        adapter = session.get_adapter("https://kic.lgthinq.com")
+        self.assertEqual(adapter._pool_maxsize, 3)
+        # Retries are left to `wideq.core.request`.
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    @responses.activate
+    def test_session_shares_auth_pool(self):
+        responses.add(
+            responses.POST,
+            "https://aic.lgthinq.com:46030/api/member/login",
+            json={"lgedmRoot": {"jsessionId": "abc", "item": []}},
+        )
+        http = wideq.core.retry_session()
+        gateway = wideq.core.Gateway(
+            "https://us.m.lgaccount.com",
+            "https://aic.lgthinq.com:46030/api",
+            "https://us.lgeapi.com",
+            "US",
+            "en-US",
+        )
+        auth = wideq.core.Auth(gateway, "access", "refresh", http)
+        session, devices = auth.start_session()
+        self.assertIs(session.http, http)
+        self.assertEqual(session.session_id, "abc")
+        self.assertEqual(devices, [])
+
+
+class RequestTest(unittest.TestCase):
+    URL = "https://aic.lgthinq.com:46030/api/rti/rtiResult"
+
+    @responses.activate
+    @mock.patch("time.sleep")
+    def test_retries_status(self, sleep):
+        responses.add(responses.GET, self.URL, status=503)
+        responses.add(responses.GET, self.URL, json={"ok": True})
+        res = wideq.core.request("GET", self.URL)
+        self.assertEqual({"ok": True}, res.json())
+        sleep.assert_called_once_with(wideq.core.RETRY_FACTOR)
+
+    @responses.activate
+    @mock.patch("time.sleep")
+    def test_post_status_retried_only_when_idempotent(self, sleep):
+        responses.add(responses.POST, self.URL, status=503)
+        responses.add(responses.POST, self.URL, json={"ok": True})
+        res = wideq.core.request("POST", self.URL)
+        self.assertEqual(503, res.status_code)
+        res = wideq.core.request("POST", self.URL, idempotent=True)
+        self.assertEqual({"ok": True}, res.json())
+
+    @mock.patch("time.sleep")
+    def test_post_retried_only_after_connect_failure(self, sleep):
+        http = mock.Mock(spec=wideq.core.Transport)
+        http.send.side_effect = [
+            wideq.core.requests.ConnectTimeout(),
+            wideq.core.HTTPResponse(200, b"{}", 0),
+        ]
+        wideq.core.request("POST", self.URL, http)
+        self.assertEqual(2, http.send.call_count)
+
+        http.send.side_effect = [wideq.core.requests.ReadTimeout()]
+        with self.assertRaises(wideq.core.requests.ReadTimeout):
+            wideq.core.request("POST", self.URL, http)
+        self.assertEqual(3, http.send.call_count)
+
+    @responses.activate
+    @mock.patch("time.sleep")
+    def test_backoff_respects_deadline(self, sleep):
+        responses.add(responses.GET, self.URL, status=503)
+        with self.assertRaises(wideq.core.DeadlineExceededError):
+            wideq.core.request(
+                "GET", self.URL, deadline=time.monotonic() + 0.1
+            )
+        self.assertEqual(1, len(responses.calls))
+        sleep.assert_not_called()
+
+    def test_timeout_fits_deadline(self):
+        http = mock.Mock(spec=wideq.core.Transport)
+        http.send.return_value = wideq.core.HTTPResponse(200, b"{}", 0)
+        wideq.core.request(
+            "GET",
+            self.URL,
+            http,
+            timeout=(5, 20),
+            deadline=time.monotonic() + 10,
+        )
+        connect, read = http.send.call_args[0][2]
+        self.assertEqual(5, connect)
+        self.assertTrue(9 < read <= 10)
+
+    def test_passed_deadline(self):
+        http = mock.Mock(spec=wideq.core.Transport)
+        with self.assertRaises(wideq.core.DeadlineExceededError):
+            wideq.core.request(
+                "GET", self.URL, http, deadline=time.monotonic() - 1
+            )
+        http.send.assert_not_called()
+
+
+class TransportTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.gateway = wideq.core.Gateway(
+            "https://us.m.lgaccount.com",
+            "https://aic.lgthinq.com:46030/api",
+            "https://us.lgeapi.com",
+            "US",
+            "en-US",
+        )
+
+    def test_memory_transport(self):
+        requests = []
+
+        def handler(method, url, headers, body):
+            requests.append((method, url, headers, body))
+            return 200, {"lgedmRoot": {"item": [{"deviceId": "d1"}]}}
+
+        http = wideq.core.MemoryTransport(handler)
+        auth = wideq.core.Auth(self.gateway, "access", "refresh", http)
+        session = wideq.core.Session(auth, "session")
+        self.assertEqual([{"deviceId": "d1"}], session.get_devices())
+
+        method, url, headers, body = requests[0]
+        self.assertEqual("POST", method)
+        self.assertEqual(
+            "https://aic.lgthinq.com:46030/api/device/deviceList", url
+        )
+        self.assertEqual("session", headers["x-thinq-jsessionId"])
+        self.assertEqual({"lgedmRoot": None}, body)
+
+    def test_memory_transport_api_error(self):
+        http = wideq.core.MemoryTransport(
+            lambda *args: (
+                200,
+                {"lgedmRoot": {"returnCd": "0102", "returnMsg": "expired"}},
+            )
+        )
+        with self.assertRaises(wideq.core.NotLoggedInError):
+            wideq.core.lgedm_post("https://example.com", http=http)
+
+    def test_urllib3_connection_error(self):
+        http = wideq.core.Urllib3Transport()
+        with self.assertRaises(wideq.core.requests.ConnectionError) as cm:
+            http.send("GET", "http://127.0.0.1:9/", (1, 1))
+        self.assertTrue(wideq.core._connect_failed(cm.exception))
+
+    def test_requests_connection_error(self):
+        http = wideq.core.RequestsTransport()
+        with self.assertRaises(wideq.core.requests.ConnectionError) as cm:
+            http.send("GET", "http://127.0.0.1:9/", (1, 1))
+        self.assertTrue(wideq.core._connect_failed(cm.exception))
+
+    def test_requests_session_is_wrapped(self):
+        http = wideq.core.retry_session()
+        transport = wideq.core.as_transport(http)
+        self.assertIsInstance(transport, wideq.core.RequestsTransport)
+        self.assertIs(http, transport.session)
+
+
+class MonitorPollManyTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        gateway = wideq.core.Gateway(
+            "https://us.m.lgaccount.com",
+            "https://aic.lgthinq.com:46030/api",
+            "https://us.lgeapi.com",
+            "US",
+            "en-US",
+        )
+        auth = wideq.core.Auth(gateway, "access", "refresh")
+        self.session = wideq.core.Session(auth, "session")
+
+    @responses.activate
+    def test_demultiplex(self):
+        responses.add(
+            responses.POST,
+            "https://aic.lgthinq.com:46030/api/rti/rtiResult",
+            json={
+                "lgedmRoot": {
+                    "returnCd": "0000",
+                    "workList": [
+                        {
+                            "deviceId": "d1",
+                            "workId": "w1",
+                            "returnCode": "0000",
+                            "returnData": "AQI=",
+                        },
+                        {"deviceId": "d2", "workId": "w2"},
+                        {
+                            "deviceId": "d3",
+                            "workId": "w3",
+                            "returnCode": "0106",
+                        },
+                    ],
+                }
+            },
+        )
+        results = self.session.monitor_poll_many(
+            [("d1", "w1"), ("d2", "w2"), ("d3", "w3"), ("d4", "w4")]
+        )
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(b"\x01\x02", results["d1"])
+        self.assertIsNone(results["d2"])
+        self.assertIsInstance(results["d3"], wideq.core.MonitorError)
+        self.assertEqual("0106", results["d3"].code)
+        self.assertIsNone(results["d4"])
@@ -0,0 +1,91 @@
+import json
+import unittest
+from unittest import mock
+
+from wideq import core
+from wideq.fakeserver import FakeDevice, FakeServer
+from wideq.washer import WasherDevice, WasherState
+
+
+WASHER_URL = (
+    "https://aic.lgthinq.com:46030/api/webContents/modelJSON?"
+    "modelName=F3L2CYV5W_WIFI&countryCode=WW&contentsId="
+    "JS1217232703654216&authKey=thinq"
+)
+
+
+class FakeServerTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            model_info = json.load(fp)["model_info"][WASHER_URL]
+        self.washer = FakeDevice(
+            "washer-1",
+            201,
+            model_info,
+            status={"State": 30, "Remain_Time_M": 13, "APCourse": 8},
+        )
+        self.server = FakeServer([self.washer])
+
+    def client(self, http):
+        client = self.server.client(http)
+        client.refresh()
+        return client
+
+    def check_client(self, client):
+        (info,) = client.devices
+        washer = client.get_device_obj(info.id)
+        self.assertIsInstance(washer, WasherDevice)
+        washer.monitor_start()
+        self.assertIsNone(washer.poll())  # Warming up.
+        status = washer.poll()
+        self.assertEqual(WasherState.RINSING, status.state)
+        self.assertEqual(13, status.remaining_time)
+        washer.monitor_stop()
+
+    def test_in_memory(self):
+        self.check_client(
+            self.client(core.MemoryTransport(self.server.handle))
+        )
+
+    def test_http(self):
+        self.server.serve()
+        self.addCleanup(self.server.shutdown)
+        self.check_client(self.client(core.RequestsTransport()))
+        self.check_client(self.client(core.Urllib3Transport()))
+
+    def test_discover(self):
+        http = core.MemoryTransport(self.server.handle)
+        gateway = core.Gateway.discover("US", "en-US", http)
+        self.assertEqual(self.server.base_url + "/api", gateway.api_root)
+
+    def test_injected_api_error(self):
+        client = self.client(core.MemoryTransport(self.server.handle))
+        self.server.fail("/api/device/deviceList", "0102")
+        with self.assertRaises(core.NotLoggedInError):
+            client.session.get_devices()
+        self.server.fail("/api/device/deviceList", 9000)
+        with self.assertRaises(core.InvalidRequestError):
+            client.session.get_devices()
+
+    @mock.patch("time.sleep")
+    def test_injected_status_retried(self, sleep):
+        client = self.client(core.MemoryTransport(self.server.handle))
+        session = client.session
+        self.server.fail("/api/device/deviceList", status=503, count=2)
+        res = core.lgedm_post(
+            session.auth.gateway.api_root + "/device/deviceList",
+            access_token=session.auth.access_token,
+            session_id=session.session_id,
+            http=client._http,
+            idempotent=True,
+        )
+        self.assertEqual(1, len(res["item"]))
+        self.assertEqual(3, self.server.requests["/api/device/deviceList"])
+
+    def test_injected_monitor_error(self):
+        client = self.client(core.MemoryTransport(self.server.handle))
+        work_id = client.session.monitor_start("washer-1")
+        self.server.fail_monitor("washer-1", "0106")
+        with self.assertRaises(core.MonitorError):
+            client.session.monitor_poll("washer-1", work_id)
@@ -0,0 +1,98 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+
+from wideq.client import DeviceInfo, ModelInfo
+from wideq.fakeserver import FakeDevice
+from wideq.history import HistoryStore
+
+
+WASHER_URL = (
+    "https://aic.lgthinq.com:46030/api/webContents/modelJSON?"
+    "modelName=F3L2CYV5W_WIFI&countryCode=WW&contentsId="
+    "JS1217232703654216&authKey=thinq"
+)
+
+JSON_MODEL = {"Monitoring": {"type": "JSON"}, "Value": {}}
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            data = json.load(fp)["model_info"][WASHER_URL]
+        self.model = ModelInfo(data)
+        self.washer = FakeDevice("washer/1", 201, data)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "history")
+        self.store = HistoryStore(self.path, segment_seconds=100)
+
+    def append(self, at, remain, store=None):
+        self.washer.status["Remain_Time_M"] = remain
+        (store or self.store).append(
+            "washer/1", self.model, self.washer.frame(), at
+        )
+
+    def test_query(self):
+        for i in range(10):
+            self.append(1000.0 + 30 * i, i)
+
+        history = list(self.store.query("washer/1"))
+        self.assertEqual(10, len(history))
+        self.assertEqual(1000.0, history[0][0])
+        self.assertEqual(
+            self.model.decode_monitor(self.washer.frame(), raw=True),
+            history[-1][1],
+        )
+
+        # Spans the segments started every 100 seconds.
+        self.assertEqual(
+            [(1060.0, {"Remain_Time_M": 2}), (1090.0, {"Remain_Time_M": 3})],
+            list(
+                self.store.query(
+                    "washer/1", 1045.0, 1090.0, fields=["Remain_Time_M"]
+                )
+            ),
+        )
+        self.assertEqual(["washer/1"], self.store.devices())
+
+    def test_resume(self):
+        self.append(1000.0, 1)
+        self.append(1010.0, 2, HistoryStore(self.path))
+        directory = os.path.join(self.path, "washer%2F1")
+        (name,) = os.listdir(directory)
+
+        # Starts a new segment after a partly written record.
+        with open(os.path.join(directory, name), "ab") as f:
+            f.write(b"\0")
+        self.append(1020.0, 3, HistoryStore(self.path))
+        self.assertEqual(
+            [1, 2, 3],
+            [
+                status["Remain_Time_M"]
+                for _, status in self.store.query("washer/1")
+            ],
+        )
+
+    def test_json(self):
+        model = ModelInfo(JSON_MODEL)
+        self.store.append("ac", model, b'{"TempCur": "22", "Mode": "@X"}', 1)
+        ((at, status),) = self.store.query("ac")
+        self.assertEqual(22.0, status["TempCur"])
+        self.assertTrue(math.isnan(status["Mode"]))
+
+    def test_prune(self):
+        for i in range(10):
+            self.append(1000.0 + 30 * i, i)
+        # Segments start at 1000, 1120 and 1240 seconds.
+        self.assertEqual(1, self.store.prune(1200.0))
+        self.assertEqual(1120.0, next(self.store.query("washer/1"))[0])
+
+    def test_record(self):
+        device = DeviceInfo({"deviceId": "washer/1", "modelJsonUrl": "x"})
+        store = HistoryStore(self.path, lambda info: self.model)
+        store.record(device, self.washer.frame(), 1000.0)
+        self.assertEqual(1, len(list(self.store.query("washer/1"))))
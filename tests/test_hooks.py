@@ -0,0 +1,89 @@
+import json
+import unittest
+
+from wideq import core, hooks
+from wideq.fakeserver import FakeDevice, FakeServer
+
+
+WASHER_URL = (
+    "https://aic.lgthinq.com:46030/api/webContents/modelJSON?"
+    "modelName=F3L2CYV5W_WIFI&countryCode=WW&contentsId="
+    "JS1217232703654216&authKey=thinq"
+)
+
+
+class HooksTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            model_info = json.load(fp)["model_info"][WASHER_URL]
+        self.server = FakeServer([FakeDevice("washer-1", 201, model_info)])
+        self.client = self.server.client()
+        self.calls = []
+
+    def record(self, kind):
+        def before(call):
+            self.assertIsNone(call.seconds)
+            call.context["seen"] = True
+
+        def after(call):
+            self.assertTrue(call.context["seen"])
+            self.calls.append((call.kind, call.name, call.outcome))
+
+        hook = hooks.register(kind, before, after)
+        self.addCleanup(hooks.unregister, kind, hook)
+        return hook
+
+    def test_requests(self):
+        sizes = []
+        self.record(hooks.REQUEST)
+        hook = hooks.register(
+            hooks.REQUEST, after=lambda call: sizes.append(call.size)
+        )
+        self.addCleanup(hooks.unregister, hooks.REQUEST, hook)
+
+        self.client.session.get_devices()
+        self.server.fail("/api/device/deviceList", "0102")
+        with self.assertRaises(core.NotLoggedInError):
+            self.client.session.get_devices()
+
+        self.assertEqual(
+            [
+                (hooks.REQUEST, "member/login", "ok"),
+                (hooks.REQUEST, "device/deviceList", "ok"),
+                (hooks.REQUEST, "device/deviceList", "error"),
+            ],
+            self.calls,
+        )
+        self.assertTrue(all(size > 0 for size in sizes))
+
+    def test_polls_and_decoding(self):
+        washer = self.client.get_device_obj("washer-1")
+        washer.monitor_start()
+        self.record(hooks.POLL)
+        self.record(hooks.DECODE)
+
+        washer.poll()
+        washer.poll()
+        self.server.fail_monitor("washer-1", "0106")
+        washer.poll()
+
+        self.assertEqual(
+            [
+                (hooks.POLL, "washer-1", "warmup"),
+                (hooks.POLL, "washer-1", "ok"),
+                (hooks.DECODE, "F3L2CYV5W_WIFI", "ok"),
+                (hooks.POLL, "washer-1", "restarted"),
+            ],
+            self.calls,
+        )
+
+    def test_failing_hook(self):
+        def fail(call):
+            raise ValueError(call.name)
+
+        hook = hooks.register(hooks.REQUEST, before=fail)
+        with self.assertLogs("wideq.hooks", "ERROR"):
+            self.client.session.get_devices()
+        hooks.unregister(hooks.REQUEST, hook)
+        self.assertEqual([], hooks.HOOKS[hooks.REQUEST])
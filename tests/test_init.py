@@ -0,0 +1,78 @@
+import ast
+import importlib
+import inspect
+import json
+import subprocess
+import sys
+import unittest
+
+import wideq
+
+
+# Reports what importing the package alone did.
+IMPORT_ONLY = """
+import json, logging, sys
+import wideq
+print(json.dumps({
+    "modules": sorted(sys.modules),
+    "handlers": len(logging.getLogger("wideq").handlers),
+}))
+"""
+
+#: Public names that are not exported from the package: every module
+#: has its own logger.
+NOT_EXPORTED = {"LOGGER"}
+
+
+def defined_names(module):
+    """Get the public names that a module's source defines at its top
+    level, leaving out the names it imports.
+    """
+    names = set()
+    for node in ast.parse(inspect.getsource(module)).body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(t.id for t in node.targets if isinstance(t, ast.Name))
+        elif isinstance(node, ast.AnnAssign):
+            if isinstance(node.target, ast.Name):
+                names.add(node.target.id)
+    return {name for name in names if not name.startswith("_")}
+
+
+class LazyImportTest(unittest.TestCase):
+    @unittest.skipIf(sys.version_info < (3, 7), "imports everything")
+    def test_import_is_light(self):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_ONLY],
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+        report = json.loads(out.decode("utf8"))
+        self.assertEqual(
+            ["wideq"], [m for m in report["modules"] if "wideq" in m]
+        )
+        self.assertNotIn("requests", report["modules"])
+        self.assertEqual(0, report["handlers"])
+
+    def test_attributes(self):
+        from wideq import WasherDevice, core
+
+        self.assertIs(wideq.washer.WasherDevice, WasherDevice)
+        self.assertIs(core.Session, wideq.Session)
+        self.assertIn("Client", dir(wideq))
+        with self.assertRaises(AttributeError):
+            wideq.NoSuchThing
+
+    def test_exports_match_modules(self):
+        for name, exports in wideq._EXPORTS.items():
+            if name == "util":
+                continue  # Only some of its helpers are exported.
+            module = importlib.import_module("wideq." + name)
+            with self.subTest(module=name):
+                self.assertEqual(
+                    sorted(defined_names(module) - NOT_EXPORTED),
+                    sorted(exports),
+                )
+        for name in wideq._EXPORTS["util"]:
+            self.assertTrue(hasattr(wideq.util, name), name)
@@ -0,0 +1,93 @@
+import json
+import unittest
+from unittest import mock
+
+from wideq import core
+from wideq.fakeserver import FakeDevice, FakeServer
+from wideq.metrics import METRICS, Histogram, endpoint
+
+
+WASHER_URL = (
+    "https://aic.lgthinq.com:46030/api/webContents/modelJSON?"
+    "modelName=F3L2CYV5W_WIFI&countryCode=WW&contentsId="
+    "JS1217232703654216&authKey=thinq"
+)
+
+
+class HistogramTest(unittest.TestCase):
+    def test_cumulative(self):
+        hist = Histogram([0.1, 1.0])
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value)
+        self.assertEqual(
+            [("0.1", 2), ("1.0", 3), ("+Inf", 4)], hist.cumulative()
+        )
+        self.assertEqual(4, hist.count)
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            model_info = json.load(fp)["model_info"][WASHER_URL]
+        self.server = FakeServer([FakeDevice("washer-1", 201, model_info)])
+        self.client = self.server.client()
+        METRICS.reset()
+        self.addCleanup(METRICS.reset)
+
+    def test_endpoint(self):
+        self.assertEqual(
+            "rti/rtiResult",
+            endpoint("https://aic.lgthinq.com:46030/api/rti/rtiResult"),
+        )
+        self.assertEqual("webContents/modelJSON", endpoint(WASHER_URL))
+
+    @mock.patch("time.sleep")
+    def test_requests(self, sleep):
+        self.server.fail("/model/washer-1.json", status=503)
+        self.client.model_info(self.client.get_device("washer-1"))
+        self.client.session.get_devices()
+        self.server.fail("/api/device/deviceList", "0102")
+        with self.assertRaises(core.NotLoggedInError):
+            self.client.session.get_devices()
+
+        snapshot = METRICS.snapshot()
+        self.assertEqual(
+            {"200": 1, "503": 1}, snapshot["requests"]["model/washer-1.json"]
+        )
+        self.assertEqual({"200": 3}, snapshot["requests"]["device/deviceList"])
+        self.assertEqual(1, snapshot["requests"]["member/login"]["200"])
+        self.assertEqual({"0102": 1}, snapshot["errors"]["device/deviceList"])
+        self.assertEqual({"model/washer-1.json": 1}, snapshot["retries"])
+        self.assertGreater(snapshot["bytes_sent"]["member/login"], 0)
+        self.assertGreater(snapshot["bytes_received"]["member/login"], 0)
+        self.assertEqual(3, snapshot["latency"]["device/deviceList"]["count"])
+
+    def test_monitor(self):
+        washer = self.client.get_device_obj("washer-1")
+        washer.monitor_start()
+        self.assertIsNone(washer.poll())  # Warming up.
+        self.assertIsNotNone(washer.poll())
+        self.server.fail_monitor("washer-1", "0106")
+        self.assertIsNone(washer.poll())  # Restarts the task.
+        self.assertIsNone(washer.poll())
+        self.assertIsNotNone(washer.poll())
+        self.assertEqual(2, METRICS.snapshot()["monitor_warmup"]["count"])
+        self.assertEqual(
+            {"0106": 1}, METRICS.snapshot()["errors"]["rti/rtiResult"]
+        )
+
+    def test_prometheus(self):
+        self.client.session.get_devices()
+        text = METRICS.prometheus()
+        self.assertIn("# TYPE wideq_requests_total counter\n", text)
+        self.assertIn(
+            'wideq_requests_total{endpoint="device/deviceList",status="200"} 1',
+            text,
+        )
+        self.assertIn(
+            'wideq_request_duration_seconds_bucket{endpoint="member/login",'
+            'le="+Inf"} 1',
+            text,
+        )
+        self.assertIn("wideq_monitor_warmup_seconds_count 0\n", text)
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from wideq.client import Client, DeviceInfo, MonitorGroup
+from wideq.fakeserver import FakeDevice, FakeServer
+from wideq.recording import RECORD, Recorder, Replay, read
+
+
+WASHER_URL = (
+    "https://aic.lgthinq.com:46030/api/webContents/modelJSON?"
+    "modelName=F3L2CYV5W_WIFI&countryCode=WW&contentsId="
+    "JS1217232703654216&authKey=thinq"
+)
+
+
+class RecordingTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        with open("./tests/fixtures/client.json") as fp:
+            self.state = json.load(fp)
+        self.washer = FakeDevice(
+            "washer-1", 201, self.state["model_info"][WASHER_URL]
+        )
+        self.server = FakeServer([self.washer])
+        self.info = DeviceInfo(self.washer.info(self.server.base_url))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "monitor.rec")
+
+    def record(self, polls):
+        with Recorder(self.path) as recorder:
+            client = self.server.client(recorder=recorder)
+            washer = client.get_device_obj("washer-1")
+            washer.monitor_start()
+            statuses = []
+            for remain in range(polls):
+                self.washer.status["Remain_Time_M"] = remain
+                status = washer.poll()
+                if status is not None:
+                    statuses.append(status.to_dict())
+        return statuses
+
+    def test_round_trip(self):
+        statuses = self.record(4)  # The first poll warms up.
+        self.record(2)  # Appends.
+
+        frames = list(read(self.path))
+        self.assertEqual(4, len(frames))
+        self.assertEqual("washer-1", frames[0].device_id)
+        self.assertEqual(201, frames[0].device_type)
+        self.assertEqual(self.info.model_info_url, frames[0].model_url)
+
+        # Replays with only the model info, without the server.
+        state = {"model_info": {frames[0].model_url: self.washer.model_info}}
+        replay = Replay(self.path, Client.load(state))
+        replayed = [status.to_dict() for _, status in replay]
+        self.assertEqual(statuses, replayed[:3])
+
+    def test_monitor_group(self):
+        with Recorder(self.path) as recorder:
+            client = self.server.client(recorder=recorder)
+            with MonitorGroup(client.session, ["washer-1"]) as group:
+                for _ in range(3):
+                    group.poll()
+        frames = list(read(self.path))
+        self.assertEqual(2, len(frames))  # The first poll warms up.
+        self.assertEqual(self.info.model_info_url, frames[0].model_url)
+
+    def test_replay_does_not_record(self):
+        self.record(3)
+        count = len(list(read(self.path)))
+        state = {
+            "model_info": {self.info.model_info_url: self.washer.model_info}
+        }
+        with Recorder(self.path) as recorder:
+            client = Client.load(state)
+            client.recorder = recorder
+            self.assertEqual(count, len(list(Replay(self.path, client))))
+        self.assertEqual(count, len(list(read(self.path))))
+
+    def test_unknown_type(self):
+        with Recorder(self.path) as recorder:
+            recorder.record(
+                DeviceInfo({"deviceId": "x", "modelJsonUrl": ""}), b"a"
+            )
+            recorder.record(
+                DeviceInfo(
+                    {"deviceId": "y", "deviceType": 301, "modelJsonUrl": ""}
+                ),
+                b"b",
+            )
+        replayed = [
+            (f.device_id, data) for f, data in Replay(self.path, Client())
+        ]
+        self.assertEqual([("x", b"a"), ("y", b"b")], replayed)
+
+    def test_truncated(self):
+        self.record(3)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data[: -RECORD.size])
+        self.assertLessEqual(len(list(read(self.path))), 1)
+
+    def test_pace(self):
+        recorder = Recorder(self.path)
+        for at in (100.0, 102.0, 106.0):
+            recorder.record(self.info, b"x", at)
+        recorder.close()
+
+        sleep = mock.Mock()
+        with mock.patch("time.monotonic", return_value=0.0):
+            list(Replay(self.path, Client(), speed=2, sleep=sleep).frames())
+        self.assertEqual(
+            [mock.call(1.0), mock.call(3.0)], sleep.call_args_list
+        )
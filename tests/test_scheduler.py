@@ -0,0 +1,178 @@
+import unittest
+from unittest import mock
+
+from wideq.client import DeviceChanges
+from wideq.scheduler import PollScheduler
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+
+class FakeStatus(object):
+    def __init__(self, is_on=True, remaining_time=30):
+        self.is_on = is_on
+        self.remaining_time = remaining_time
+
+
+def fake_device(device_id, statuses):
+    device = mock.Mock()
+    device.device.id = device_id
+    device.poll.side_effect = statuses
+    return device
+
+
+class PollSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+        self.scheduler = PollScheduler(jitter=0, clock=self.clock)
+
+    def test_interval_policy(self):
+        self.assertEqual(
+            self.scheduler.idle_interval,
+            self.scheduler.interval(FakeStatus(is_on=False)),
+        )
+        self.assertEqual(
+            self.scheduler.active_interval,
+            self.scheduler.interval(FakeStatus()),
+        )
+        self.assertEqual(
+            self.scheduler.finishing_interval,
+            self.scheduler.interval(FakeStatus(remaining_time=1)),
+        )
+        self.assertEqual(
+            self.scheduler.active_interval, self.scheduler.interval(object())
+        )
+
+    def test_idle_device_with_no_remaining_time(self):
+        self.assertEqual(
+            self.scheduler.active_interval,
+            self.scheduler.interval(FakeStatus(remaining_time=0)),
+        )
+
+    def test_warmup_backoff(self):
+        device = fake_device("d1", [None, None, None, FakeStatus()])
+        self.scheduler.add(device)
+        times = []
+        for _ in range(4):
+            self.clock.now = self.scheduler.next_due()
+            times.append(self.clock.now)
+            self.scheduler.poll_due()
+        self.assertEqual([0.0, 1.0, 3.0, 7.0], times)
+        self.assertEqual(
+            7.0 + self.scheduler.active_interval, self.scheduler.next_due()
+        )
+
+    def test_run_polls_idle_devices_less(self):
+        idle = fake_device("idle", [FakeStatus(is_on=False)] * 2)
+        busy = fake_device("busy", [FakeStatus()] * 7)
+        self.scheduler.add(idle)
+        self.scheduler.add(busy)
+        received = []
+
+        def callback(device, status):
+            received.append(device.device.id)
+            if self.clock.now >= 60:
+                self.scheduler.remove(idle)
+                self.scheduler.remove(busy)
+
+        self.scheduler.run(callback, sleep=self.clock.sleep)
+        self.assertEqual(2, received.count("idle"))
+        self.assertEqual(7, received.count("busy"))
+        self.assertEqual(0, len(self.scheduler))
+
+    def test_poll_error_reschedules(self):
+        failing = fake_device("d1", [RuntimeError(), FakeStatus()])
+        working = fake_device("d2", [FakeStatus()])
+        errors = []
+        self.scheduler.error_callback = lambda d, e: errors.append((d, e))
+        self.scheduler.add(failing)
+        self.scheduler.add(working)
+        with self.assertLogs("wideq.scheduler", "WARNING"):
+            polled = self.scheduler.poll_due()
+        self.assertEqual([working], [device for device, _ in polled])
+        self.assertEqual(failing, errors[0][0])
+        self.assertIsInstance(errors[0][1], RuntimeError)
+        self.assertEqual(1.0, self.scheduler.next_due())
+
+    def test_error_callback_removes_device(self):
+        failing = fake_device("d1", [RuntimeError()])
+        self.scheduler.error_callback = lambda d, e: self.scheduler.remove(d)
+        self.scheduler.add(failing)
+        with self.assertLogs("wideq.scheduler", "WARNING"):
+            self.assertEqual([], self.scheduler.poll_due())
+        self.assertEqual(0, len(self.scheduler))
+        self.assertIsNone(self.scheduler.next_due())
+        self.clock.now = 10.0
+        self.assertEqual([], self.scheduler.poll_due())
+
+    def test_watch_follows_device_list(self):
+        devices = {
+            "d1": fake_device("d1", [FakeStatus()] * 10),
+            "d2": fake_device("d2", [FakeStatus()] * 10),
+        }
+        client = mock.Mock()
+        client.devices = [devices["d1"].device]
+        client.get_device_obj.side_effect = devices.get
+        client.refresh_devices.side_effect = [
+            DeviceChanges([], [], []),
+            DeviceChanges([devices["d2"].device], [devices["d1"].device], []),
+        ]
+        events = []
+
+        self.scheduler.watch(client, interval=100, callback=events.append)
+        self.assertEqual(1, len(self.scheduler))
+        devices["d1"].monitor_start.assert_called_once_with()
+        self.assertEqual(0.0, self.scheduler.next_due())
+
+        self.clock.now = 100.0
+        self.scheduler.poll_due()
+        self.assertEqual([], events)  # Nothing changed.
+
+        self.clock.now = 200.0
+        self.scheduler.poll_due()
+        self.assertEqual(1, len(events))
+        devices["d1"].monitor_stop.assert_called_once_with()
+        devices["d2"].monitor_start.assert_called_once_with()
+        self.assertEqual(1, len(self.scheduler))
+        self.assertEqual(300.0, self.scheduler._sync_due)
+
+    def test_watch_survives_sync_errors(self):
+        devices = {
+            "d1": fake_device("d1", [FakeStatus()] * 10),
+            "d2": fake_device("d2", [FakeStatus()] * 10),
+        }
+        devices["d2"].monitor_start.side_effect = [RuntimeError(), None]
+        client = mock.Mock()
+        client.devices = [devices["d1"].device]
+        client.get_device_obj.side_effect = devices.get
+        client.refresh_devices.side_effect = [
+            RuntimeError(),
+            DeviceChanges([devices["d2"].device], [], []),
+            DeviceChanges([], [], []),
+        ]
+        self.scheduler.watch(client, interval=100)
+
+        # A failed check is made again later.
+        self.clock.now = 100.0
+        with self.assertLogs("wideq.scheduler", "WARNING"):
+            self.scheduler.poll_due()
+        self.assertEqual(200.0, self.scheduler._sync_due)
+
+        # A device that fails to start is tried again at the next check.
+        self.clock.now = 200.0
+        with self.assertLogs("wideq.scheduler", "WARNING"):
+            self.scheduler.poll_due()
+        self.assertEqual(1, len(self.scheduler))
+        self.clock.now = 300.0
+        self.scheduler.poll_due()
+        self.assertEqual(2, len(self.scheduler))
+        self.assertEqual(2, devices["d2"].monitor_start.call_count)
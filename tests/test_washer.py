@@ -1,5 +1,6 @@
 import json
 import unittest
+from unittest import mock
 
 from wideq.client import Client, DeviceInfo
 from wideq.washer import WasherDevice, WasherState, WasherStatus
@@ -62,3 +63,43 @@ class WasherStatusTest(unittest.TestCase):
         self.assertEqual("Towels", status.course)
         self.assertEqual("SmallLoad", status.smart_course)
         self.assertEqual("No Error", status.error)
+
+    def test_model_info_shared(self):
+        other = WasherDevice(self.client, self.device_info)
+        self.assertIs(self.washer.model, other.model)
+
+    def test_properties_memoized(self):
+        status = WasherStatus(self.washer, POLL_DATA)
+        model = self.washer.model
+        with mock.patch.object(
+            model, "enum_name", wraps=model.enum_name
+        ) as enum_name:
+            self.assertEqual(WasherState.RINSING, status.state)
+            self.assertEqual(WasherState.RINSING, status.state)
+            self.assertTrue(status.is_on)
+        self.assertEqual(1, enum_name.call_count)
+        self.assertFalse(hasattr(status, "__dict__"))
+
+    def test_to_dict(self):
+        status = WasherStatus(self.washer, POLL_DATA)
+        self.assertEqual(
+            {
+                "state": WasherState.RINSING,
+                "previous_state": WasherState.RUNNING,
+                "is_on": True,
+                "remaining_time": 13,
+                "initial_time": 58,
+                "course": "Towels",
+                "smart_course": "SmallLoad",
+                "error": "No Error",
+            },
+            status.to_dict(),
+        )
+
+    def test_poll_reuses_unchanged_status(self):
+        self.washer.mon = mock.Mock()
+        frame = bytes(24)
+        self.washer.mon.poll.side_effect = [frame, frame, b"\x01" + frame]
+        first = self.washer.poll()
+        self.assertIs(first, self.washer.poll())
+        self.assertIsNot(first, self.washer.poll())
@@ -1,11 +1,177 @@
 """Reverse-engineered client for the LG SmartThinQ API.
+
+The API is available from the package itself, as in `wideq.Client`.
+Its submodules, and their dependencies such as `requests`, are only
+imported when one of their names is first used.
 """
-from .core import *  # noqa
-from .client import *  # noqa
-from .ac import *  # noqa
-from .dishwasher import *  # noqa
-from .dryer import *  # noqa
-from .refrigerator import *  # noqa
-from .washer import *  # noqa
+import importlib
+import sys
+from typing import Any, List
 
 __version__ = "1.5.0"
+
+#: The names exported by each submodule.
+_EXPORTS = {
+    "core": (
+        "APIError",
+        "API_ERRORS",
+        "APP_KEY",
+        "AgreementError",
+        "Auth",
+        "CLIENT_ID",
+        "CONNECT_TIMEOUT",
+        "DATA_ROOT",
+        "DATE_FORMAT",
+        "DEFAULT_COUNTRY",
+        "DEFAULT_LANGUAGE",
+        "DeadlineExceededError",
+        "FailedRequestError",
+        "GATEWAY_URL",
+        "Gateway",
+        "HTTPResponse",
+        "IDEMPOTENT_METHODS",
+        "InvalidRequestError",
+        "MONITOR_ENDPOINT",
+        "MalformedResponseError",
+        "MemoryTransport",
+        "MonitorError",
+        "NotConnectedError",
+        "NotLoggedInError",
+        "OAUTH_CLIENT_KEY",
+        "OAUTH_SECRET_KEY",
+        "POOL_SIZE",
+        "READ_TIMEOUT",
+        "REQUEST_BUDGET",
+        "RETRY_COUNT",
+        "RETRY_FACTOR",
+        "RETRY_STATUSES",
+        "RequestsTransport",
+        "SECURITY_KEY",
+        "SVC_CODE",
+        "Session",
+        "Timeout",
+        "TokenError",
+        "Transport",
+        "Urllib3Transport",
+        "as_transport",
+        "control_request",
+        "gen_uuid",
+        "get_list",
+        "get_wideq_logger",
+        "lgedm_headers",
+        "lgedm_post",
+        "lgedm_unwrap",
+        "login",
+        "login_request",
+        "monitor_request",
+        "monitor_result",
+        "monitor_results",
+        "oauth2_signature",
+        "oauth_url",
+        "parse_oauth_callback",
+        "refresh_auth",
+        "refresh_auth_request",
+        "refresh_auth_result",
+        "request",
+        "retry_session",
+        "set_log_level",
+        "shared_session",
+    ),
+    "client": (
+        "BinaryProtocol",
+        "BitValue",
+        "CONFIG_WORKERS",
+        "Client",
+        "DEVICE_CHANGE_FIELDS",
+        "Device",
+        "DeviceChanges",
+        "DeviceInfo",
+        "DeviceRegistry",
+        "DeviceStatus",
+        "DeviceType",
+        "EnumValue",
+        "MODEL_INFO_TIMEOUT",
+        "ModelInfo",
+        "Monitor",
+        "MonitorGroup",
+        "REFRESH_MARGIN",
+        "REFRESH_RETRY_DELAY",
+        "RangeValue",
+        "ReferenceValue",
+        "SESSION_LIFETIME",
+        "StringValue",
+        "WARM_UP_WORKERS",
+        "status_property",
+    ),
+    "util": ("lookup_enum", "lookup_reference"),
+    "ac": (
+        "ACDevice",
+        "ACFanSpeed",
+        "ACHSwingMode",
+        "ACJetMode",
+        "ACMode",
+        "ACOp",
+        "ACStatus",
+        "ACVSwingMode",
+    ),
+    "dishwasher": (
+        "DISHWASHER_COURSE_MAP",
+        "DISHWASHER_PROCESS_READABLE",
+        "DISHWASHER_STATE_READABLE",
+        "DishWasherDevice",
+        "DishWasherProcess",
+        "DishWasherState",
+        "DishWasherStatus",
+    ),
+    "dryer": (
+        "DryLevel",
+        "DryerDevice",
+        "DryerError",
+        "DryerState",
+        "DryerStatus",
+        "TempControl",
+        "TimeDry",
+    ),
+    "refrigerator": (
+        "FreshAirFilter",
+        "IcePlus",
+        "RefrigeratorDevice",
+        "RefrigeratorStatus",
+        "SmartSavingMode",
+    ),
+    "washer": ("WasherDevice", "WasherState", "WasherStatus"),
+}
+
+#: The submodule that defines each exported name.
+_MODULES = {
+    name: module for module, names in _EXPORTS.items() for name in names
+}
+
+#: Submodules that are also available as attributes of the package.
+_SUBMODULES = set(_EXPORTS) | {"hooks", "metrics"}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        ) from None
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value  # Later lookups need not come here.
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | _SUBMODULES | set(_MODULES))
+
+
+if sys.version_info < (3, 7):
+    # Module `__getattr__` is new in Python 3.7, so import everything.
+    for _name in _MODULES:
+        globals()[_name] = __getattr__(_name)
@@ -2,7 +2,7 @@
 """
 import enum
 
-from .client import Device
+from .client import Device, DeviceStatus, Monitor, status_property
 from .util import lookup_enum
 from .core import FailedRequestError, InvalidRequestError
 
@@ -160,11 +160,65 @@ class ACOp(enum.Enum):
     ALL_ON = "@AC_MAIN_OPERATION_ALL_ON_W"  # Both fans (or only fan) on.
 
 
+def _result(result):
+    """Get a looked-up value, or raise the exception its lookup raised."""
+
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _outdoor_power(result):
+    if isinstance(result, InvalidRequestError):
+        # Device does not support outdoor unit instant power usage
+        return 0
+    return _result(result)["OutTotalInstantPower"]
+
+
+def _power(result):
+    if isinstance(result, InvalidRequestError):
+        # Device does not support whole unit instant power usage
+        return 0
+    return _result(result)["InOutInstantPower"]
+
+
+def _light(result):
+    if isinstance(result, FailedRequestError):
+        # Device does not support reporting display light status.
+        # Since it's probably not changeable the it must be on.
+        return True
+    return _result(result) == "0"  # Seems backwards, but isn't.
+
+
+def _volume(result):
+    if isinstance(result, FailedRequestError):
+        return 0  # Device does not support volume control.
+    return int(_result(result))
+
+
 class ACDevice(Device):
     """Higher-level operations on an AC/HVAC device, such as a heat
     pump.
     """
 
+    CONFIG_VALUES = {
+        "filter_state": ("Config", "Filter", _result),
+        "mfilter_state": ("Config", "MFilter", _result),
+        "energy_target": ("Config", "EnergyDesiredValue", _result),
+        "outdoor_power": ("Config", "OutTotalInstantPower", _outdoor_power),
+        "power": ("Config", "InOutInstantPower", _power),
+        "light": ("Control", "DisplayControl", _light),
+        "volume": ("Control", "SpkVolume", _volume),
+        "zones": ("Config", "DuctZone", _result),
+    }
+
+    def __init__(self, client, device, model=None):
+        super().__init__(client, device, model)
+
+        # Temperature conversion tables, built on first use.
+        self._f2c = None
+        self._c2f = None
+
     @property
     def f2c(self):
         """Get a dictionary mapping Fahrenheit to Celsius temperatures for
@@ -176,8 +230,10 @@ class ACDevice(Device):
         precise control requires using the custom LUT.
         """
 
-        mapping = self.model.value("TempFahToCel").options
-        return {int(f): c for f, c in mapping.items()}
+        if self._f2c is None:
+            mapping = self.model.value("TempFahToCel").options
+            self._f2c = {int(f): c for f, c in mapping.items()}
+        return self._f2c
 
     @property
     def c2f(self):
@@ -188,15 +244,17 @@ class ACDevice(Device):
         are not in the other.
         """
 
-        mapping = self.model.value("TempCelToFah").options
-        out = {}
-        for c, f in mapping.items():
-            try:
-                c_num = int(c)
-            except ValueError:
-                c_num = float(c)
-            out[c_num] = f
-        return out
+        if self._c2f is None:
+            mapping = self.model.value("TempCelToFah").options
+            out = {}
+            for c, f in mapping.items():
+                try:
+                    c_num = int(c)
+                except ValueError:
+                    c_num = float(c)
+                out[c_num] = f
+            self._c2f = out
+        return self._c2f
 
     @property
     def supported_operations(self):
@@ -257,16 +315,26 @@ class ACDevice(Device):
         - "State": Whether the zone is open. Also "1" or "0".
         """
 
+        zone_cmd = self._zone_command(zones)
+        if zone_cmd is not None:
+            self._set_control("DuctZone", zone_cmd)
+
+    @staticmethod
+    def _zone_command(zones):
+        """Get the "DuctZone" control value for `set_zones`, or None if
+        no zone would be on.
+        """
+
         # Ensure at least one zone is enabled: we can't turn all zones
         # off simultaneously.
         on_count = sum(int(zone["State"]) for zone in zones)
         if on_count > 0:
-            zone_cmd = "/".join(
+            return "/".join(
                 "{}_{}".format(zone["No"], zone["State"])
                 for zone in zones
                 if zone["Cfg"] == "1"
             )
-            self._set_control("DuctZone", zone_cmd)
+        return None
 
     def get_zones(self):
         """Get the status of the zones, including whether a zone is
@@ -276,7 +344,7 @@ class ACDevice(Device):
         `set_zones`.
         """
 
-        return self._get_config("DuctZone")
+        return self._get_value("zones")
 
     def set_jet_mode(self, jet_opt):
         """Set jet mode to a value from the `ACJetMode` enum."""
@@ -318,57 +386,37 @@ class ACDevice(Device):
     def get_filter_state(self):
         """Get information about the filter."""
 
-        return self._get_config("Filter")
+        return self._get_value("filter_state")
 
     def get_mfilter_state(self):
         """Get information about the "MFilter" (not sure what this is)."""
 
-        return self._get_config("MFilter")
+        return self._get_value("mfilter_state")
 
     def get_energy_target(self):
         """Get the configured energy target data."""
 
-        return self._get_config("EnergyDesiredValue")
+        return self._get_value("energy_target")
 
     def get_outdoor_power(self):
         """Get instant power usage in watts of the outdoor unit"""
 
-        try:
-            value = self._get_config("OutTotalInstantPower")
-            return value["OutTotalInstantPower"]
-        except InvalidRequestError:
-            # Device does not support outdoor unit instant power usage
-            return 0
+        return self._get_value("outdoor_power")
 
     def get_power(self):
         """Get the instant power usage in watts of the whole unit"""
 
-        try:
-            value = self._get_config("InOutInstantPower")
-            return value["InOutInstantPower"]
-        except InvalidRequestError:
-            # Device does not support whole unit instant power usage
-            return 0
+        return self._get_value("power")
 
     def get_light(self):
         """Get a Boolean indicating whether the display light is on."""
 
-        try:
-            value = self._get_control("DisplayControl")
-            return value == "0"  # Seems backwards, but isn't.
-        except FailedRequestError:
-            # Device does not support reporting display light status.
-            # Since it's probably not changeable the it must be on.
-            return True
+        return self._get_value("light")
 
     def get_volume(self):
         """Get the speaker volume level."""
 
-        try:
-            value = self._get_control("SpkVolume")
-            return int(value)
-        except FailedRequestError:
-            return 0  # Device does not support volume control.
+        return self._get_value("volume")
 
     def poll(self):
         """Poll the device's current state.
@@ -382,19 +430,23 @@ class ACDevice(Device):
         if not hasattr(self, "mon"):
             return None
 
-        res = self.mon.poll_json()
-        if res:
-            return ACStatus(self, res)
-        else:
-            return None
+        data = self.mon.poll()
+        return self._poll_status(data)
 
+    def _parse_status(self, data):
+        """Decode raw monitoring data into an `ACStatus`."""
 
-class ACStatus(object):
+        return ACStatus(self, Monitor.decode_json(data))
+
+
+class ACStatus(DeviceStatus):
     """Higher-level information about an AC device's current status."""
 
+    __slots__ = ("ac",)
+
     def __init__(self, ac, data):
+        super().__init__(data)
         self.ac = ac
-        self.data = data
 
     @staticmethod
     def _str_to_num(s):
@@ -411,39 +463,39 @@ class ACStatus(object):
         else:
             return f
 
-    @property
+    @status_property
     def temp_cur_c(self):
         return self._str_to_num(self.data["TempCur"])
 
-    @property
+    @status_property
     def temp_cur_f(self):
         return self.ac.c2f[self.temp_cur_c]
 
-    @property
+    @status_property
     def temp_cfg_c(self):
         return self._str_to_num(self.data["TempCfg"])
 
-    @property
+    @status_property
     def temp_cfg_f(self):
         return self.ac.c2f[self.temp_cfg_c]
 
-    @property
+    @status_property
     def mode(self):
         return ACMode(lookup_enum("OpMode", self.data, self.ac))
 
-    @property
+    @status_property
     def fan_speed(self):
         return ACFanSpeed(lookup_enum("WindStrength", self.data, self.ac))
 
-    @property
+    @status_property
     def horz_swing(self):
         return ACHSwingMode(lookup_enum("WDirHStep", self.data, self.ac))
 
-    @property
+    @status_property
     def vert_swing(self):
         return ACVSwingMode(lookup_enum("WDirVStep", self.data, self.ac))
 
-    @property
+    @status_property
     def is_on(self):
         op = ACOp(lookup_enum("Operation", self.data, self.ac))
         return op != ACOp.OFF
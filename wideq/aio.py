@@ -0,0 +1,1036 @@
+"""An asyncio interface to the LG SmartThinQ API.
+
+This mirrors the blocking `core.Session`, `client.Client` and
+`client.Monitor` APIs with coroutines, so a single event loop can drive
+many monitoring tasks concurrently. The request formats and the
+decoding of responses and status data are shared with the blocking API.
+
+This module requires the `aiohttp` package (the `aio` extra).
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urljoin
+
+import aiohttp
+
+from . import core, hooks, metrics
+from .client import Device, DeviceInfo, DeviceType, ModelInfo, Monitor
+from .ac import ACDevice, ACOp
+from .dishwasher import DishWasherDevice
+from .dryer import DryerDevice
+from .refrigerator import RefrigeratorDevice
+from .washer import WasherDevice
+
+if TYPE_CHECKING:
+    from .cache import ModelCache
+    from .recording import Recorder
+
+
+LOGGER = logging.getLogger("wideq.aio")
+
+
+def create_http(pool_size: int = core.POOL_SIZE) -> aiohttp.ClientSession:
+    """Get an aiohttp session that keeps up to `pool_size` connections
+    alive per host.
+
+    This must be called from within a running event loop.
+    """
+    connector = aiohttp.TCPConnector(limit_per_host=pool_size)
+    return aiohttp.ClientSession(connector=connector)
+
+
+#: The errors that mean no connection could be made, so that a request
+#: was never sent.
+CONNECT_ERRORS: Tuple[type, ...] = (aiohttp.ClientConnectorError,)
+if hasattr(aiohttp, "ConnectionTimeoutError"):  # New in aiohttp 3.10.
+    CONNECT_ERRORS += (aiohttp.ConnectionTimeoutError,)
+
+
+async def request_json(
+    http: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    timeout: Optional[core.Timeout] = None,
+    deadline: Optional[float] = None,
+    idempotent: Optional[bool] = None,
+    **kwargs,
+) -> Any:
+    """Make an HTTP request and return its decoded JSON response.
+
+    Requests are retried with exponential backoff, bounded by `timeout`
+    and `deadline`, as `core.request` does, and every attempt is
+    recorded in `metrics.METRICS`.
+    """
+    endpoint = metrics.endpoint(url)
+    if timeout is None:
+        timeout = (core.CONNECT_TIMEOUT, core.READ_TIMEOUT)
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout,) * 2
+    if deadline is None:
+        deadline = time.monotonic() + core.REQUEST_BUDGET
+    if idempotent is None:
+        idempotent = method.upper() in core.IDEMPOTENT_METHODS
+
+    for attempt in range(core.RETRY_COUNT + 1):
+        last = attempt == core.RETRY_COUNT
+        start = time.monotonic()
+        remaining = deadline - start
+        if remaining <= 0:
+            metrics.METRICS.record_error(endpoint, "deadline")
+            raise core.DeadlineExceededError(f"deadline passed for {url}")
+        attempt_timeout = aiohttp.ClientTimeout(
+            total=remaining,
+            sock_connect=min(connect, remaining),
+            sock_read=min(read, remaining),
+        )
+        try:
+            async with http.request(
+                method, url, timeout=attempt_timeout, **kwargs
+            ) as res:
+                content = await res.read()
+                metrics.METRICS.record_request(
+                    endpoint,
+                    res.status,
+                    time.monotonic() - start,
+                    int(res.request_info.headers.get("Content-Length", 0)),
+                    len(content),
+                )
+                if (
+                    last
+                    or not idempotent
+                    or res.status not in core.RETRY_STATUSES
+                ):
+                    return json.loads(content)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+            metrics.METRICS.record_error(endpoint, type(exc).__name__)
+            if last or not (idempotent or isinstance(exc, CONNECT_ERRORS)):
+                raise
+
+        backoff = core.RETRY_FACTOR * (2**attempt)
+        if time.monotonic() + backoff >= deadline:
+            metrics.METRICS.record_error(endpoint, "deadline")
+            raise core.DeadlineExceededError(f"no time left to retry {url}")
+        metrics.METRICS.record_retry(endpoint)
+        await asyncio.sleep(backoff)
+
+
+async def lgedm_post(
+    http: aiohttp.ClientSession,
+    url,
+    data=None,
+    access_token=None,
+    session_id=None,
+    timeout=None,
+    deadline=None,
+    idempotent=False,
+):
+    """Make an HTTP request in the format used by the API servers.
+
+    This is the asynchronous equivalent of `core.lgedm_post`.
+    """
+    headers = core.lgedm_headers(access_token, session_id)
+    call = None
+    if hooks.HOOKS[hooks.REQUEST]:
+        call = hooks.start(hooks.REQUEST, metrics.endpoint(url))
+    try:
+        body = await request_json(
+            http,
+            "POST",
+            url,
+            timeout,
+            deadline,
+            idempotent,
+            json={core.DATA_ROOT: data},
+            headers=headers,
+        )
+        try:
+            out = core.lgedm_unwrap(body)
+        except core.APIError as exc:
+            metrics.METRICS.record_error(metrics.endpoint(url), exc.code)
+            raise
+    except Exception as exc:
+        if call is not None:
+            hooks.finish(call, exc)
+        raise
+    if call is not None:
+        hooks.finish(call)
+    return out
+
+
+async def discover_gateway(
+    http: aiohttp.ClientSession,
+    country,
+    language,
+    timeout=None,
+    deadline=None,
+) -> core.Gateway:
+    """Load information about the hosts to use for API interaction.
+
+    This is the asynchronous equivalent of `core.Gateway.discover`.
+    """
+    gw = await lgedm_post(
+        http,
+        core.GATEWAY_URL,
+        {"countryCode": country, "langCode": language},
+        timeout=timeout,
+        deadline=deadline,
+    )
+    return core.Gateway(
+        gw["empUri"], gw["thinqUri"], gw["oauthUri"], country, language
+    )
+
+
+async def refresh_auth(
+    http: aiohttp.ClientSession, auth: core.Auth, timeout=None, deadline=None
+) -> core.Auth:
+    """Refresh an authentication, returning a new Auth object.
+
+    May raise a `core.TokenError`.
+    """
+    token_url, data, headers = core.refresh_auth_request(
+        auth.gateway.oauth_root, auth.refresh_token
+    )
+    res_data = await request_json(
+        http, "POST", token_url, timeout, deadline, data=data, headers=headers
+    )
+    access_token = core.refresh_auth_result(res_data)
+    return core.Auth(auth.gateway, access_token, auth.refresh_token)
+
+
+async def start_session(
+    http: aiohttp.ClientSession, auth: core.Auth, timeout=None, deadline=None
+) -> Tuple["AsyncSession", List[Dict[str, Any]]]:
+    """Start an API session for the logged-in user. Return the
+    AsyncSession object and a list of the user's devices.
+    """
+    url, data = core.login_request(
+        auth.gateway.api_root,
+        auth.access_token,
+        auth.gateway.country,
+        auth.gateway.language,
+    )
+    session_info = await lgedm_post(
+        http, url, data, timeout=timeout, deadline=deadline
+    )
+    session_id = session_info["jsessionId"]
+    return (
+        AsyncSession(auth, session_id, http),
+        core.get_list(session_info, "item"),
+    )
+
+
+class AsyncSession(object):
+    """An asynchronous equivalent of `core.Session`."""
+
+    def __init__(
+        self,
+        auth: core.Auth,
+        session_id,
+        http: aiohttp.ClientSession,
+        timeout: core.Timeout = (core.CONNECT_TIMEOUT, core.READ_TIMEOUT),
+        budget: float = core.REQUEST_BUDGET,
+    ) -> None:
+        self.auth = auth
+        self.session_id = session_id
+        self.http = http
+
+        # The timeout for each attempt at a request, and how many
+        # seconds a request may take in all. See `request_json`.
+        self.timeout = timeout
+        self.budget = budget
+
+        #: Called with the device ID and data of every frame of
+        #: monitoring data polled, if set. See `core.Session.on_frame`.
+        self.on_frame: Optional[Callable[[str, bytes], None]] = None
+
+    def set_credentials(self, auth: core.Auth, session_id) -> None:
+        """Switch the session to a new `Auth` and session ID, as
+        `core.Session.set_credentials` does.
+        """
+        self.auth = auth
+        self.session_id = session_id
+
+    async def post(self, path, data=None, deadline=None):
+        """Make a POST request to the API server, which must finish by
+        `deadline` (a `time.monotonic()` time), or within the session's
+        `budget` if it is not given.
+        """
+
+        url = urljoin(self.auth.gateway.api_root + "/", path)
+        if deadline is None:
+            deadline = time.monotonic() + self.budget
+        return await lgedm_post(
+            self.http,
+            url,
+            data,
+            self.auth.access_token,
+            self.session_id,
+            self.timeout,
+            deadline,
+        )
+
+    async def get_devices(self) -> List[Dict[str, Any]]:
+        """Get a list of devices associated with the user's account."""
+
+        return core.get_list(await self.post("device/deviceList"), "item")
+
+    async def monitor_start(self, device_id):
+        """Begin monitoring a device's status and return a work ID."""
+
+        res = await self.post(
+            "rti/rtiMon",
+            core.monitor_request(device_id, core.gen_uuid(), "Start"),
+        )
+        return res["workId"]
+
+    async def monitor_poll(self, device_id, work_id) -> Optional[bytes]:
+        """Get the result of a monitoring task.
+
+        Return a bytestring, or None if the monitoring is not yet ready.
+        May raise a `core.MonitorError`.
+        """
+
+        work_list = [{"deviceId": device_id, "workId": work_id}]
+        res = await self.post("rti/rtiResult", {"workList": work_list})
+        data = core.monitor_result(device_id, res["workList"])
+        if data and self.on_frame is not None:
+            self.on_frame(device_id, data)
+        return data
+
+    async def monitor_poll_many(self, work_items) -> Dict[str, Any]:
+        """Get the results of several monitoring tasks in one request.
+
+        See `core.Session.monitor_poll_many`.
+        """
+
+        work_list = [
+            {"deviceId": device_id, "workId": work_id}
+            for device_id, work_id in work_items
+        ]
+        res = await self.post("rti/rtiResult", {"workList": work_list})
+        results = core.monitor_results(work_items, res)
+        if self.on_frame is not None:
+            for device_id, data in results.items():
+                if isinstance(data, bytes) and data:
+                    self.on_frame(device_id, data)
+        return results
+
+    async def monitor_stop(self, device_id, work_id):
+        """Stop monitoring a device."""
+
+        await self.post(
+            "rti/rtiMon", core.monitor_request(device_id, work_id, "Stop")
+        )
+
+    async def set_device_controls(self, device_id, values):
+        """Control a device's settings.
+
+        `values` is a key/value map containing the settings to update.
+        """
+
+        return await self.post(
+            "rti/rtiControl",
+            core.control_request(device_id, "Control", "Set", values),
+        )
+
+    async def get_device_config(self, device_id, key, category="Config"):
+        """Get a device configuration option."""
+
+        res = await self.post(
+            "rti/rtiControl",
+            core.control_request(device_id, category, "Get", key),
+        )
+        return res["returnData"]
+
+
+class AsyncMonitor(object):
+    """An asynchronous equivalent of `client.Monitor`.
+
+    Like its blocking counterpart, this restarts the monitoring task
+    when it fails.
+    """
+
+    def __init__(self, session: AsyncSession, device_id: str) -> None:
+        self.session = session
+        self.device_id = device_id
+        self._started_at: Optional[float] = None
+
+    async def start(self) -> None:
+        self.work_id = await self.session.monitor_start(self.device_id)
+        self._started_at = time.monotonic()
+
+    async def stop(self) -> None:
+        await self.session.monitor_stop(self.device_id, self.work_id)
+
+    async def poll(self) -> Optional[bytes]:
+        """Get the current status data (a bytestring) or None if the
+        device is not yet ready.
+        """
+
+        if hooks.HOOKS[hooks.POLL]:
+            call = hooks.start(hooks.POLL, self.device_id)
+            work_id = self.work_id
+            try:
+                data = await self._poll()
+            except Exception as exc:
+                hooks.finish(call, exc)
+                raise
+            if data is None:
+                restarted = self.work_id != work_id
+                call.outcome = "restarted" if restarted else "warmup"
+            else:
+                call.size = len(data)
+            hooks.finish(call)
+            return data
+        return await self._poll()
+
+    async def _poll(self) -> Optional[bytes]:
+        try:
+            data = await self.session.monitor_poll(
+                self.device_id, self.work_id
+            )
+        except core.MonitorError:
+            # Try to restart the task.
+            await self.stop()
+            await self.start()
+            return None
+        if data and self._started_at is not None:
+            warmup = time.monotonic() - self._started_at
+            metrics.METRICS.record_warmup(warmup)
+            self._started_at = None
+        return data
+
+    async def poll_json(self) -> Optional[Dict[str, Any]]:
+        """For devices where status is reported via JSON data, get the
+        decoded status result (or None if status is not available).
+        """
+
+        data = await self.poll()
+        return Monitor.decode_json(data) if data else None
+
+    async def __aenter__(self) -> "AsyncMonitor":
+        await self.start()
+        return self
+
+    async def __aexit__(self, type, value, tb) -> None:
+        await self.stop()
+
+
+class AsyncClient(object):
+    """An asynchronous equivalent of `client.Client`.
+
+    The serialized state produced by `dump` and accepted by `load` is
+    the same as for `client.Client`. Close the client (or use it as an
+    asynchronous context manager) to release its HTTP connections.
+    """
+
+    def __init__(
+        self,
+        gateway: Optional[core.Gateway] = None,
+        auth: Optional[core.Auth] = None,
+        session: Optional[AsyncSession] = None,
+        country: str = core.DEFAULT_COUNTRY,
+        language: str = core.DEFAULT_LANGUAGE,
+        pool_size: int = core.POOL_SIZE,
+        recorder: Optional["Recorder"] = None,
+        timeout: core.Timeout = (core.CONNECT_TIMEOUT, core.READ_TIMEOUT),
+        budget: float = core.REQUEST_BUDGET,
+        model_cache: Optional["ModelCache"] = None,
+    ) -> None:
+        # The pooled HTTP connections, which can only be created once an
+        # event loop is running.
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._pool_size = pool_size
+
+        # The timeout for each attempt at a request, and how many seconds
+        # a request may take in all, retries included (see
+        # `request_json`).
+        self._timeout = timeout
+        self._budget = budget
+
+        self._gateway: Optional[core.Gateway] = gateway
+        self._auth: Optional[core.Auth] = auth
+        self._session: Optional[AsyncSession] = session
+
+        # Tokens loaded from serialized state without a gateway, for
+        # which we have not yet created a `core.Auth`, and a session ID
+        # for which we have not yet created an `AsyncSession`.
+        self._auth_state: Optional[Dict[str, str]] = None
+        self._session_id: Optional[str] = None
+
+        # When (as a Unix timestamp) the current access token and
+        # session were obtained, if known.
+        self._refreshed_at: Optional[float] = None
+
+        self._devices: List[Dict[str, Any]] = []
+        self._model_info: Dict[str, Any] = {}
+        self._models: Dict[str, ModelInfo] = {}
+
+        # An optional on-disk cache of model info, as for
+        # `client.Client`.
+        self._model_cache = model_cache
+
+        # The login, the session refresh, and each model info download
+        # in progress. Callers that need one of these while it is
+        # running wait for it rather than starting another.
+        self._session_task: Optional[asyncio.Future] = None
+        self._refresh_task: Optional[asyncio.Future] = None
+        self._model_tasks: Dict[str, asyncio.Future] = {}
+        self._country: str = country
+        self._language: str = language
+
+        # Where to record the monitoring data polled over this client's
+        # session, if anywhere. See `_record_frame`.
+        self.recorder = recorder
+        if session is not None:
+            session.on_frame = self._record_frame
+
+    @property
+    def http(self) -> aiohttp.ClientSession:
+        if not self._http:
+            self._http = create_http(self._pool_size)
+        return self._http
+
+    async def get_gateway(self) -> core.Gateway:
+        if not self._gateway:
+            self._gateway = await discover_gateway(
+                self.http,
+                self._country,
+                self._language,
+                self._timeout,
+                self._deadline(),
+            )
+        return self._gateway
+
+    @property
+    def auth(self) -> core.Auth:
+        if not self._auth:
+            assert False, "unauthenticated"
+        return self._auth
+
+    async def get_auth(self) -> core.Auth:
+        """Get the `core.Auth`, discovering the gateway first if tokens
+        were loaded without one.
+        """
+        if not self._auth and self._auth_state is not None:
+            gateway = await self.get_gateway()
+            state, self._auth_state = self._auth_state, None
+            self._auth = core.Auth(
+                gateway, state["access_token"], state["refresh_token"]
+            )
+        return self.auth
+
+    async def get_session(self) -> AsyncSession:
+        if not self._session:
+            if self._session_id:
+                auth = await self.get_auth()
+                self._session = self._configure(
+                    AsyncSession(auth, self._session_id, self.http)
+                )
+            else:
+                if self._session_task is None:
+                    self._session_task = asyncio.ensure_future(
+                        self._start_session()
+                    )
+                # Shielded, so that a cancelled caller does not cancel
+                # the login for the others.
+                return await asyncio.shield(self._session_task)
+        return self._session
+
+    async def _start_session(self) -> AsyncSession:
+        try:
+            session, self._devices = await start_session(
+                self.http,
+                await self.get_auth(),
+                self._timeout,
+                self._deadline(),
+            )
+        finally:
+            self._session_task = None
+        self._refreshed_at = time.time()
+        self._session = self._configure(session)
+        return session
+
+    def _deadline(self) -> float:
+        """Get the deadline for a request made now."""
+        return time.monotonic() + self._budget
+
+    def _configure(self, session: AsyncSession) -> AsyncSession:
+        """Apply the client's timeouts, and its recorder, to a new
+        session.
+        """
+        session.timeout = self._timeout
+        session.budget = self._budget
+        session.on_frame = self._record_frame
+        return session
+
+    def _record_frame(self, device_id: str, data: bytes) -> None:
+        """Record a frame of monitoring data, if the client has a
+        `recorder`.
+        """
+        recorder = self.recorder
+        if recorder is None:
+            return
+        for device in self._devices:
+            if device.get("deviceId") == device_id:
+                break
+        else:
+            device = {"deviceId": device_id, "modelJsonUrl": ""}
+        recorder.record(DeviceInfo(device), data)
+
+    async def get_devices(self) -> List[DeviceInfo]:
+        """DeviceInfo objects describing the user's devices."""
+
+        session = await self.get_session()
+        if not self._devices:
+            self._devices = await session.get_devices()
+        return [DeviceInfo(d) for d in self._devices]
+
+    async def get_device(self, device_id) -> Optional[DeviceInfo]:
+        """Look up a DeviceInfo object by device ID.
+
+        Return None if the device does not exist.
+        """
+
+        for device in await self.get_devices():
+            if device.id == device_id:
+                return device
+        return None
+
+    async def get_device_obj(self, device_id) -> Optional["AsyncDevice"]:
+        """Look up an `AsyncDevice` object by device ID.
+
+        Return a plain AsyncDevice if no subclass exists for the device
+        type. Return None if the device does not exist.
+        """
+
+        device_info = await self.get_device(device_id)
+        if not device_info:
+            return None
+        model = await self.model_info(device_info)
+        cls = device_classes().get(device_info.type, AsyncDevice)
+        return cls(self, device_info, model)
+
+    async def model_info(self, device: DeviceInfo) -> ModelInfo:
+        """For a DeviceInfo object, get a ModelInfo object describing
+        the model's capabilities.
+        """
+        url = device.model_info_url
+        model = self._models.get(url)
+        if model is None:
+            task = self._model_tasks.get(url)
+            if task is None:
+                task = self._model_tasks[url] = asyncio.ensure_future(
+                    self._load_model(url)
+                )
+            return await asyncio.shield(task)
+        return model
+
+    async def _load_model(self, url: str) -> ModelInfo:
+        try:
+            cache = self._model_cache
+            if cache is not None:
+                model = cache.get(url)
+                if model is None:
+                    data = await request_json(
+                        self.http, "GET", url, self._timeout, self._deadline()
+                    )
+                    model = cache.put(url, data)
+            else:
+                if url not in self._model_info:
+                    self._model_info[url] = await request_json(
+                        self.http, "GET", url, self._timeout, self._deadline()
+                    )
+                model = ModelInfo(self._model_info[url])
+            self._models[url] = model
+        finally:
+            del self._model_tasks[url]
+        return model
+
+    async def refresh(self) -> None:
+        """Get a new access token and start a new session.
+
+        The existing `AsyncSession` is updated in place, so monitors and
+        devices that hold on to it use the new session too. Callers that
+        ask for a refresh while one is running wait for that one.
+        """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+        await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self) -> None:
+        try:
+            auth = await refresh_auth(
+                self.http,
+                await self.get_auth(),
+                self._timeout,
+                self._deadline(),
+            )
+            session, devices = await start_session(
+                self.http, auth, self._timeout, self._deadline()
+            )
+        finally:
+            self._refresh_task = None
+        self._auth = auth
+        self._devices = devices
+        self._refreshed_at = time.time()
+        if self._session:
+            self._session.set_credentials(session.auth, session.session_id)
+        else:
+            self._session = self._configure(session)
+
+    async def close(self) -> None:
+        """Close the client's pooled HTTP connections."""
+
+        if self._http:
+            await self._http.close()
+            self._http = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, type, value, tb) -> None:
+        await self.close()
+
+    @classmethod
+    def load(
+        cls,
+        state: Dict[str, Any],
+        model_cache: Optional["ModelCache"] = None,
+        **kwargs,
+    ) -> "AsyncClient":
+        """Load a client from serialized state, as `client.Client.load`
+        does.
+
+        If the state has no gateway, it is discovered when it is first
+        needed.
+        """
+
+        if model_cache is None and "model_cache" in state:
+            from .cache import ModelCache
+
+            model_cache = ModelCache(state["model_cache"])
+        client = cls(model_cache=model_cache, **kwargs)
+
+        if "gateway" in state:
+            client._gateway = core.Gateway.deserialize(state["gateway"])
+
+        if "auth" in state:
+            data = state["auth"]
+            if client._gateway:
+                client._auth = core.Auth(
+                    client._gateway,
+                    data["access_token"],
+                    data["refresh_token"],
+                )
+            else:
+                client._auth_state = dict(data)
+
+        if "session" in state:
+            client._session_id = state["session"]
+
+        if "model_info" in state:
+            if model_cache is None:
+                client._model_info = state["model_info"]
+            else:
+                # Move embedded model info into the cache.
+                for url, data in state["model_info"].items():
+                    if url not in model_cache:
+                        model_cache.put(url, data)
+
+        if "country" in state:
+            client._country = state["country"]
+
+        if "language" in state:
+            client._language = state["language"]
+
+        if "refreshed_at" in state:
+            client._refreshed_at = state["refreshed_at"]
+
+        return client
+
+    def dump(self) -> Dict[str, Any]:
+        """Serialize the client state, as `client.Client.dump` does."""
+
+        out: Dict[str, Any] = {}
+        if self._model_cache is None:
+            out["model_info"] = dict(self._model_info)
+        else:
+            out["model_cache"] = self._model_cache.path
+
+        if self._gateway:
+            out["gateway"] = self._gateway.serialize()
+
+        if self._auth:
+            out["auth"] = self._auth.serialize()
+        elif self._auth_state is not None:
+            out["auth"] = dict(self._auth_state)
+
+        if self._session:
+            out["session"] = self._session.session_id
+        elif self._session_id:
+            out["session"] = self._session_id
+
+        out["country"] = self._country
+        out["language"] = self._language
+
+        if self._refreshed_at is not None:
+            out["refreshed_at"] = self._refreshed_at
+
+        return out
+
+
+def _current_task() -> Optional["asyncio.Task[Any]"]:
+    """Get the running task. `asyncio.current_task` is new in Python
+    3.7.
+    """
+    if hasattr(asyncio, "current_task"):
+        return asyncio.current_task()
+    return asyncio.Task.current_task()  # type: ignore
+
+
+class _Batch(object):
+    """The asynchronous context manager returned by `AsyncDevice.batch`."""
+
+    def __init__(self, device: "AsyncDevice") -> None:
+        self.device = device
+        self.outermost = False
+
+    async def __aenter__(self) -> None:
+        if self.device._pending_controls is None:
+            self.device._pending_controls = {}
+            self.outermost = True
+
+    async def __aexit__(self, type, value, tb) -> None:
+        if not self.outermost:
+            return
+        pending = self.device._pending_controls
+        self.device._pending_controls = None
+        if pending and type is None:
+            session = await self.device.client.get_session()
+            await session.set_device_controls(self.device.device.id, pending)
+
+
+class AsyncDevice(Device):
+    """A device whose monitoring is driven by coroutines.
+
+    Status data is decoded exactly as for the corresponding blocking
+    `Device` subclass. That class's control and configuration methods,
+    such as `ACDevice.set_celsius` or `ACDevice.get_all_configs`, are
+    coroutines here: `await device.set_celsius(22)`. Combine changes
+    with `async with device.batch():`. Each task has its own batch.
+    """
+
+    client: AsyncClient  # type: ignore
+
+    def __init__(
+        self, client: AsyncClient, device: DeviceInfo, model: ModelInfo
+    ):
+        super().__init__(client, device, model)  # type: ignore
+
+        # The control changes of each task's `batch` block.
+        self._task_batches: Dict[Any, Dict[str, Any]] = {}
+
+    @property
+    def _pending_controls(self) -> Optional[Dict[str, Any]]:
+        return self._task_batches.get(_current_task())
+
+    @_pending_controls.setter
+    def _pending_controls(self, pending: Optional[Dict[str, Any]]) -> None:
+        if pending is None:
+            self._task_batches.pop(_current_task(), None)
+        else:
+            self._task_batches[_current_task()] = pending
+
+    async def _set_control(self, key, value):
+        """Set a device's control for `key` to `value`, deferring the
+        change to the end of a `batch` block inside one.
+        """
+        if self._pending_controls is not None:
+            self._pending_controls[key] = value
+            return
+
+        session = await self.client.get_session()
+        await session.set_device_controls(self.device.id, {key: value})
+
+    def batch(self) -> _Batch:  # type: ignore
+        """Combine the control changes made in an `async with` block
+        into a single request, as `Device.batch` does.
+        """
+        return _Batch(self)
+
+    async def _get_config(self, key):
+        """Look up a device's configuration for a given value."""
+        session = await self.client.get_session()
+        data = await session.get_device_config(self.device.id, key)
+        return self._decode_config(data)
+
+    async def _get_control(self, key):
+        """Look up a device's control value."""
+        session = await self.client.get_session()
+        data = await session.get_device_config(self.device.id, key, "Control")
+        return self._decode_control(data)
+
+    async def get_configs(  # type: ignore
+        self, keys: Iterable[str] = (), controls: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """Look up several configuration and control values at once,
+        concurrently. See `Device.get_configs`.
+        """
+        lookups = self._config_lookups(keys, controls)
+        results = await asyncio.gather(
+            *(get(key) for key, get in lookups), return_exceptions=True
+        )
+        return {key: result for (key, _), result in zip(lookups, results)}
+
+    async def _get_value(self, name):
+        """Get one of the values in `CONFIG_VALUES`."""
+        category, key, convert = self.CONFIG_VALUES[name]
+        get = self._get_control if category == "Control" else self._get_config
+        try:
+            result = await get(key)
+        except Exception as exc:
+            result = exc
+        return convert(result)
+
+    async def get_all_configs(self) -> Dict[str, Any]:  # type: ignore
+        """Get every value in `CONFIG_VALUES` concurrently. See
+        `Device.get_all_configs`.
+        """
+        values = await self.get_configs(*self._config_keys())
+        return {
+            name: convert(values[key])
+            for name, (_, key, convert) in self.CONFIG_VALUES.items()
+        }
+
+    async def monitor_start(self):
+        """Start monitoring the device's status."""
+        session = await self.client.get_session()
+        mon = AsyncMonitor(session, self.device.id)
+        await mon.start()
+        self.mon = mon
+
+    async def monitor_stop(self):
+        """Stop monitoring the device's status."""
+        await self.mon.stop()
+
+    async def poll(self):
+        """Poll the device's current state.
+
+        Monitoring must be started first with `monitor_start`. Return a
+        status object or None if the status is not yet available.
+        """
+        # Abort if monitoring has not started yet.
+        if not hasattr(self, "mon"):
+            return None
+
+        data = await self.mon.poll()
+        return self._poll_status(data)
+
+
+class AsyncACDevice(AsyncDevice, ACDevice):
+    """An asynchronous interface for an AC/HVAC device."""
+
+    async def _set_enum(self, key, value):
+        """Set a control to the model's value for an enum member."""
+
+        await self._set_control(key, self.model.enum_value(key, value.value))
+
+    async def set_celsius(self, c):
+        """Set the device's target temperature in Celsius degrees."""
+
+        await self._set_control("TempCfg", c)
+
+    async def set_fahrenheit(self, f):
+        """Set the device's target temperature in Fahrenheit degrees."""
+
+        await self.set_celsius(self.f2c[f])
+
+    async def set_zones(self, zones):
+        """Turn off or on the device's zones. See `ACDevice.set_zones`."""
+
+        zone_cmd = self._zone_command(zones)
+        if zone_cmd is not None:
+            await self._set_control("DuctZone", zone_cmd)
+
+    async def set_jet_mode(self, jet_opt):
+        """Set jet mode to a value from the `ACJetMode` enum."""
+
+        await self._set_enum("Jet", jet_opt)
+
+    async def set_fan_speed(self, speed):
+        """Set the fan speed to a value from the `ACFanSpeed` enum."""
+
+        await self._set_enum("WindStrength", speed)
+
+    async def set_horz_swing(self, swing):
+        """Set the horizontal swing to an `ACHSwingMode` value."""
+
+        await self._set_enum("WDirHStep", swing)
+
+    async def set_vert_swing(self, swing):
+        """Set the vertical swing to an `ACVSwingMode` value."""
+
+        await self._set_enum("WDirVStep", swing)
+
+    async def set_mode(self, mode):
+        """Set the device's operating mode to an `OpMode` value."""
+
+        await self._set_enum("OpMode", mode)
+
+    async def set_on(self, is_on):
+        """Turn on or off the device (according to a boolean)."""
+
+        op = self.supported_on_operation if is_on else ACOp.OFF
+        await self._set_enum("Operation", op)
+
+
+class AsyncDishWasherDevice(AsyncDevice, DishWasherDevice):  # type: ignore
+    """An asynchronous interface for a dishwasher."""
+
+
+class AsyncDryerDevice(AsyncDevice, DryerDevice):  # type: ignore
+    """An asynchronous interface for a dryer."""
+
+
+class AsyncRefrigeratorDevice(AsyncDevice, RefrigeratorDevice):  # type: ignore
+    """An asynchronous interface for a refrigerator."""
+
+    async def set_temp_refrigerator_c(self, temp):
+        """Set the refrigerator temperature in Celsius."""
+        value = self.model.enum_value("TempRefrigerator", str(temp))
+        await self._set_control("RETM", value)
+
+    async def set_temp_freezer_c(self, temp):
+        """Set the freezer temperature in Celsius."""
+        value = self.model.enum_value("TempFreezer", str(temp))
+        await self._set_control("REFT", value)
+
+
+class AsyncWasherDevice(AsyncDevice, WasherDevice):  # type: ignore
+    """An asynchronous interface for a washer."""
+
+
+def device_classes():
+    """The mapping of every AsyncDevice subclass related to the
+    DeviceType enum.
+    """
+    return {
+        DeviceType.AC: AsyncACDevice,
+        DeviceType.KIMCHI_REFRIGERATOR: AsyncRefrigeratorDevice,
+        DeviceType.REFRIGERATOR: AsyncRefrigeratorDevice,
+        DeviceType.DISHWASHER: AsyncDishWasherDevice,
+        DeviceType.DRYER: AsyncDryerDevice,
+        DeviceType.WASHER: AsyncWasherDevice,
+    }
@@ -0,0 +1,127 @@
+"""An on-disk cache of model info, shared by clients and processes.
+
+Model info data is large and the same for every device of a model, so
+a `ModelCache` stores it once per model info URL. Each entry is kept in
+two forms: the raw JSON, and a compiled `ModelInfo` whose lookup tables
+are already built. Both are gzip-compressed and written atomically, so
+any number of processes may read and fill the same cache directory.
+
+Compiled entries are pickles, and loading a pickle can run arbitrary
+code, so the cache directory must only be writable by trusted users.
+New directories are created readable by their owner only.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Optional
+
+from .client import ModelInfo
+
+
+LOGGER = logging.getLogger("wideq.cache")
+
+#: The version of the compiled entry format. Compiled entries written
+#: with a different version are ignored and rebuilt from the raw JSON.
+COMPILED_VERSION = 1
+
+
+def default_cache_dir() -> str:
+    """Get the default directory for cached model info:
+    `$XDG_CACHE_HOME/wideq/models`, falling back to `~/.cache`.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "wideq", "models")
+
+
+class ModelCache(object):
+    """A directory of model info entries, keyed by model info URL."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or default_cache_dir()
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    def _entry_path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode("utf8")).hexdigest()
+        return os.path.join(self.path, key + suffix)
+
+    def _read(self, path: str) -> Optional[bytes]:
+        try:
+            with gzip.open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path: str, payload: bytes) -> None:
+        """Write a compressed file so that readers only ever see it
+        whole: write to a temporary file and move it into place.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with gzip.GzipFile(fileobj=f, mode="wb", mtime=0) as gz:
+                    gz.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def __contains__(self, url: str) -> bool:
+        return os.path.exists(self._entry_path(url, ".json.gz"))
+
+    def get_data(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the raw model info data for a URL, or None if it is not
+        cached.
+        """
+        payload = self._read(self._entry_path(url, ".json.gz"))
+        if payload is None:
+            return None
+        return json.loads(payload.decode("utf8"))
+
+    def get(self, url: str) -> Optional[ModelInfo]:
+        """Get the compiled `ModelInfo` for a URL, or None if it is not
+        cached.
+
+        If the compiled entry is missing, stale or unreadable, it is
+        rebuilt from the raw JSON.
+        """
+        compiled_path = self._entry_path(url, ".pickle.gz")
+        try:
+            payload = self._read(compiled_path)
+            if payload is not None:
+                version, model = pickle.loads(payload)
+                if version == COMPILED_VERSION:
+                    return model
+        except Exception:
+            LOGGER.warning(
+                "Ignoring unreadable compiled model info: %s",
+                compiled_path,
+                exc_info=True,
+            )
+
+        data = self.get_data(url)
+        if data is None:
+            return None
+        return self._put_compiled(url, data)
+
+    def put(self, url: str, data: Dict[str, Any]) -> ModelInfo:
+        """Store the raw model info data for a URL and return the
+        compiled `ModelInfo`.
+        """
+        payload = json.dumps(data).encode("utf8")
+        self._write(self._entry_path(url, ".json.gz"), payload)
+        return self._put_compiled(url, data)
+
+    def _put_compiled(self, url: str, data: Dict[str, Any]) -> ModelInfo:
+        model = ModelInfo(data)
+        model.compile()
+        payload = pickle.dumps(
+            (COMPILED_VERSION, model), pickle.HIGHEST_PROTOCOL
+        )
+        self._write(self._entry_path(url, ".pickle.gz"), payload)
+        return model
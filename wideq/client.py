@@ -4,13 +4,31 @@ SmartThinQ API for most use cases.
 import json
 import enum
 import logging
-import requests
 import base64
+import contextlib
 import re
+import struct
+import threading
+import time
 from collections import namedtuple
-from typing import Any, Dict, Generator, List, Optional
-
-from . import core
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from . import core, hooks, metrics
+
+if TYPE_CHECKING:
+    from .cache import ModelCache
+    from .recording import Recorder
 
 
 #: Represents an unknown enum value.
@@ -26,12 +44,38 @@ class Monitor(object):
     makes one `Monitor` object suitable for long-term monitoring.
     """
 
-    def __init__(self, session: core.Session, device_id: str) -> None:
+    def __init__(
+        self,
+        session: core.Session,
+        device_id: str,
+        model: Optional["ModelInfo"] = None,
+    ) -> None:
         self.session = session
         self.device_id = device_id
 
+        # The device's model, used to decode status data. Without one,
+        # status data is assumed to be JSON.
+        self.model = model
+
+        # The last frame of status data and its decoding. Most frames
+        # from an idle device are identical, so they need not be
+        # decoded again.
+        self._frame: Optional[bytes] = None
+        self._decoded: Optional[Dict[str, Any]] = None
+
+        # When the task was started, until it produces data.
+        self._started_at: Optional[float] = None
+
     def start(self) -> None:
         self.work_id = self.session.monitor_start(self.device_id)
+        self._started_at = time.monotonic()
+
+    def _warmed_up(self) -> None:
+        """Note that the task has produced data."""
+        if self._started_at is not None:
+            warmup = time.monotonic() - self._started_at
+            metrics.METRICS.record_warmup(warmup)
+            self._started_at = None
 
     def stop(self) -> None:
         self.session.monitor_stop(self.device_id, self.work_id)
@@ -39,15 +83,38 @@ class Monitor(object):
     def poll(self) -> Optional[bytes]:
         """Get the current status data (a bytestring) or None if the
         device is not yet ready.
+
+        The poll is seen by any `hooks.POLL` hooks.
         """
 
+        if hooks.HOOKS[hooks.POLL]:
+            call = hooks.start(hooks.POLL, self.device_id)
+            work_id = self.work_id
+            try:
+                data = self._poll()
+            except Exception as exc:
+                hooks.finish(call, exc)
+                raise
+            if data is None:
+                restarted = self.work_id != work_id
+                call.outcome = "restarted" if restarted else "warmup"
+            else:
+                call.size = len(data)
+            hooks.finish(call)
+            return data
+        return self._poll()
+
+    def _poll(self) -> Optional[bytes]:
         try:
-            return self.session.monitor_poll(self.device_id, self.work_id)
+            data = self.session.monitor_poll(self.device_id, self.work_id)
         except core.MonitorError:
             # Try to restart the task.
             self.stop()
             self.start()
             return None
+        if data:
+            self._warmed_up()
+        return data
 
     @staticmethod
     def decode_json(data: bytes) -> Dict[str, Any]:
@@ -63,6 +130,54 @@ class Monitor(object):
         data = self.poll()
         return self.decode_json(data) if data else None
 
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """Decode a frame of status data.
+
+        If the frame is identical to the previous one, the previous
+        result is returned again (the very same dict, which callers
+        should not modify).
+        """
+
+        if data != self._frame:
+            if self.model:
+                self._decoded = self.model.decode_monitor(data)
+            else:
+                self._decoded = self.decode_json(data)
+            self._frame = data
+        return self._decoded  # type: ignore
+
+    def poll_decoded(self) -> Optional[Dict[str, Any]]:
+        """Get the decoded current status (or None if status is not
+        available). See `decode`.
+        """
+
+        data = self.poll()
+        return self.decode(data) if data else None
+
+    def poll_changes(self) -> Optional[Dict[str, Any]]:
+        """Get the decoded status fields that changed since the previous
+        frame, as a dict mapping field names to their new values.
+
+        Every field is reported for the first frame. Return an empty
+        dict if nothing changed, or None if status is not available.
+        """
+
+        data = self.poll()
+        if not data:
+            return None
+
+        previous = self._decoded
+        decoded = self.decode(data)
+        if previous is None:
+            return dict(decoded)
+        if decoded is previous:
+            return {}
+        return {
+            key: value
+            for key, value in decoded.items()
+            if key not in previous or previous[key] != value
+        }
+
     def __enter__(self) -> "Monitor":
         self.start()
         return self
@@ -71,6 +186,71 @@ class Monitor(object):
         self.stop()
 
 
+class MonitorGroup(object):
+    """Monitoring tasks for several devices that are polled together.
+
+    Each call to `poll` retrieves the status of every device in a single
+    API request. When the task for one device fails, only that task is
+    restarted.
+    """
+
+    def __init__(self, session: core.Session, device_ids: List[str]) -> None:
+        self.session = session
+        self.monitors = {
+            device_id: Monitor(session, device_id) for device_id in device_ids
+        }
+
+    def start(self) -> None:
+        for mon in self.monitors.values():
+            mon.start()
+
+    def stop(self) -> None:
+        for mon in self.monitors.values():
+            mon.stop()
+
+    def poll(self) -> Dict[str, Optional[bytes]]:
+        """Get the current status data for every device, as a dict
+        mapping device IDs to bytestrings (or None for devices that are
+        not yet ready).
+        """
+
+        work_items = [
+            (mon.device_id, mon.work_id) for mon in self.monitors.values()
+        ]
+        results = self.session.monitor_poll_many(work_items)
+        for device_id, result in results.items():
+            mon = self.monitors[device_id]
+            if isinstance(result, core.MonitorError):
+                # Try to restart the failed task.
+                mon.stop()
+                mon.start()
+                results[device_id] = None
+            elif result:
+                mon._warmed_up()
+        return results
+
+    def __enter__(self) -> "MonitorGroup":
+        self.start()
+        return self
+
+    def __exit__(self, type, value, tb) -> None:
+        self.stop()
+
+
+#: How long, in seconds, an access token and session stay valid.
+SESSION_LIFETIME = 3600
+#: How long before the end of `SESSION_LIFETIME` to refresh.
+REFRESH_MARGIN = 300
+#: How long to wait before retrying a failed refresh ahead of expiry.
+REFRESH_RETRY_DELAY = 60
+#: The most model info downloads to run at once in `Client.warm_up`.
+WARM_UP_WORKERS = 8
+#: How long, in seconds, to wait for a model info download.
+MODEL_INFO_TIMEOUT = 30.0
+#: The most lookups to run at once in `Device.get_configs`.
+CONFIG_WORKERS = 8
+
+
 class Client(object):
     """A higher-level API wrapper that provides a session more easily
     and allows serialization of state.
@@ -83,7 +263,53 @@ class Client(object):
         session: Optional[core.Session] = None,
         country: str = core.DEFAULT_COUNTRY,
         language: str = core.DEFAULT_LANGUAGE,
+        pool_size: int = core.POOL_SIZE,
+        session_lifetime: float = SESSION_LIFETIME,
+        model_cache: Optional["ModelCache"] = None,
+        timeout: core.Timeout = (core.CONNECT_TIMEOUT, core.READ_TIMEOUT),
+        budget: float = core.REQUEST_BUDGET,
+        transport: Optional[core.Transport] = None,
+        recorder: Optional["Recorder"] = None,
     ) -> None:
+        # The transport, normally with pooled HTTP connections, shared
+        # by every request made on behalf of this client.
+        self._http = transport or core.RequestsTransport(
+            core.retry_session(pool_size)
+        )
+
+        # The timeout for each attempt at a request, and how many seconds
+        # a request may take in all, retries included (see
+        # `core.request`).
+        self._timeout = timeout
+        self._budget = budget
+
+        # When (as a Unix timestamp) the current access token and
+        # session were obtained, if known, and how long they last.
+        self._refreshed_at: Optional[float] = None
+        self._session_lifetime = session_lifetime
+
+        # When (by `time.monotonic`) a refresh made ahead of expiry last
+        # failed, so that it is not retried on every use of the session.
+        self._refresh_failed_at: Optional[float] = None
+
+        # Only one thread refreshes at a time. The generation counts
+        # completed refreshes, so that threads that were waiting on the
+        # lock can tell that the refresh they wanted has happened.
+        self._refresh_lock = threading.Lock()
+        self._refresh_generation = 0
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+
+        # The gateway, session, device list and each model are set up
+        # at most once, on first use, even if several threads want them
+        # at the same time: one does the work while the others wait.
+        # Sessions are started under `_refresh_lock`, and each model is
+        # loaded under its own lock from `_model_locks`.
+        self._gateway_lock = threading.Lock()
+        self._devices_lock = threading.Lock()
+        self._models_lock = threading.Lock()
+        self._model_locks: Dict[str, threading.Lock] = {}
+
         # The three steps required to get access to call the API.
         self._gateway: Optional[core.Gateway] = gateway
         self._auth: Optional[core.Auth] = auth
@@ -93,10 +319,27 @@ class Client(object):
         # raw JSON list data describing the devices.
         self._devices: List[Dict[str, Any]] = []
 
+        # The index of those devices, updated when the list is replaced.
+        self._registry = DeviceRegistry()
+
         # Cached model info data. This is a mapping from URLs to JSON
         # responses.
         self._model_info: Dict[str, Any] = {}
 
+        # The ModelInfo objects built from that data, shared by every
+        # device of the same model.
+        self._models: Dict[str, ModelInfo] = {}
+
+        # An optional on-disk cache of model info. When there is one,
+        # model info data is kept there instead of in `_model_info`.
+        self._model_cache = model_cache
+
+        # Where to record the monitoring data polled over this client's
+        # session, if anywhere. See `_record_frame`.
+        self.recorder = recorder
+        if session is not None:
+            session.on_frame = self._record_frame
+
         # Locale information used to discover a gateway, if necessary.
         self._country: str = country
         self._language: str = language
@@ -104,9 +347,15 @@ class Client(object):
     @property
     def gateway(self) -> core.Gateway:
         if not self._gateway:
-            self._gateway = core.Gateway.discover(
-                self._country, self._language
-            )
+            with self._gateway_lock:
+                if not self._gateway:
+                    self._gateway = core.Gateway.discover(
+                        self._country,
+                        self._language,
+                        self._http,
+                        self._deadline(),
+                        self._timeout,
+                    )
         return self._gateway
 
     @property
@@ -118,16 +367,104 @@ class Client(object):
     @property
     def session(self) -> core.Session:
         if not self._session:
-            self._session, self._devices = self.auth.start_session()
+            with self._refresh_lock:
+                if not self._session:
+                    session, self._devices = self.auth.start_session(
+                        self._deadline(), self._timeout
+                    )
+                    self._refreshed_at = time.time()
+                    self._session = self._configure(session)
+        elif self.needs_refresh() and not self._refresh_backing_off():
+            try:
+                self.refresh()
+            except Exception:
+                if self._expired():
+                    raise
+                # The session is still valid for a while, so keep using
+                # it and try again later.
+                self._refresh_failed_at = time.monotonic()
+                LOGGER.warning(
+                    "Could not refresh the session ahead of expiry",
+                    exc_info=True,
+                )
         return self._session
 
+    def _expired(self) -> bool:
+        """Check whether the session has outlived `session_lifetime`."""
+        if self._refreshed_at is None:
+            return False
+        return time.time() - self._refreshed_at > self._session_lifetime
+
+    def _refresh_backing_off(self) -> bool:
+        """Check whether a refresh ahead of expiry failed too recently
+        to try again, unless the session has expired.
+        """
+        failed_at = self._refresh_failed_at
+        return (
+            failed_at is not None
+            and time.monotonic() - failed_at < REFRESH_RETRY_DELAY
+            and not self._expired()
+        )
+
+    def _deadline(self) -> float:
+        """Get the deadline for a request made now."""
+        return time.monotonic() + self._budget
+
+    def _configure(self, session: core.Session) -> core.Session:
+        """Apply the client's timeouts, and its recorder, to a new
+        session.
+        """
+        session.timeout = self._timeout
+        session.budget = self._budget
+        session.on_frame = self._record_frame
+        return session
+
+    def _record_frame(self, device_id: str, data: bytes) -> None:
+        """Record a frame of monitoring data, polled over the client's
+        session in any way, if the client has a `recorder`.
+        """
+        recorder = self.recorder
+        if recorder is None:
+            return
+        info = self.registry.get(device_id)
+        if info is None:
+            info = DeviceInfo({"deviceId": device_id, "modelJsonUrl": ""})
+        recorder.record(info, data)
+
     @property
-    def devices(self) -> Generator["DeviceInfo", None, None]:
-        """DeviceInfo objects describing the user's devices."""
+    def registry(self) -> "DeviceRegistry":
+        """The index of the user's devices, fetching the device list if
+        we do not have it yet.
+        """
 
         if not self._devices:
-            self._devices = self.session.get_devices()
-        return (DeviceInfo(d) for d in self._devices)
+            with self._devices_lock:
+                if not self._devices:
+                    self._devices = self.session.get_devices()
+        if self._registry.source is not self._devices:
+            self._registry.update(self._devices)
+        return self._registry
+
+    @property
+    def devices(self) -> Iterator["DeviceInfo"]:
+        """DeviceInfo objects describing the user's devices."""
+
+        return iter(self.registry)
+
+    def refresh_devices(self) -> "DeviceChanges":
+        """Get the device list again, and return how it changed since
+        the last call (or since the list was first fetched), including
+        changes in the lists got by refreshing the session.
+
+        Devices keep their `DeviceInfo` and `Device` objects unless
+        their model or type changed.
+        """
+
+        registry = self.registry
+        devices = self.session.get_devices()
+        self._devices = devices
+        registry.update(devices)
+        return registry.report()
 
     def get_device(self, device_id) -> Optional["DeviceInfo"]:
         """Look up a DeviceInfo object by device ID.
@@ -135,22 +472,21 @@ class Client(object):
         Return None if the device does not exist.
         """
 
-        for device in self.devices:
-            if device.id == device_id:
-                return device
-        return None
+        return self.registry.get(device_id)
 
     def get_device_obj(self, device_id):
         """Look up a subclass of Device object by device ID.
 
         Return a Device instance if no subclass exists for the device type.
-        Return None if the device does not exist.
+        Return None if the device does not exist. The same object is
+        returned each time, for as long as the device's details do not
+        change.
         """
+        return self.registry.device(device_id, self._make_device)
+
+    def _make_device(self, device_info: "DeviceInfo") -> "Device":
         from . import util
 
-        device_info = self.get_device(device_id)
-        if not device_info:
-            return None
         classes = util.device_classes()
         if device_info.type in classes:
             return classes[device_info.type](self, device_info)
@@ -161,10 +497,24 @@ class Client(object):
         return Device(self, device_info)
 
     @classmethod
-    def load(cls, state: Dict[str, Any]) -> "Client":
-        """Load a client from serialized state."""
+    def load(
+        cls,
+        state: Dict[str, Any],
+        model_cache: Optional["ModelCache"] = None,
+        **kwargs,
+    ) -> "Client":
+        """Load a client from serialized state.
+
+        If the state was dumped by a client with a model cache, the same
+        cache directory is used unless another `model_cache` is given.
+        Other keyword arguments are passed to the constructor.
+        """
+
+        if model_cache is None and "model_cache" in state:
+            from .cache import ModelCache
 
-        client = cls()
+            model_cache = ModelCache(state["model_cache"])
+        client = cls(model_cache=model_cache, **kwargs)
 
         if "gateway" in state:
             client._gateway = core.Gateway.deserialize(state["gateway"])
@@ -172,14 +522,25 @@ class Client(object):
         if "auth" in state:
             data = state["auth"]
             client._auth = core.Auth(
-                client.gateway, data["access_token"], data["refresh_token"]
+                client.gateway,
+                data["access_token"],
+                data["refresh_token"],
+                client._http,
             )
 
         if "session" in state:
-            client._session = core.Session(client.auth, state["session"])
+            client._session = client._configure(
+                core.Session(client.auth, state["session"], client._http)
+            )
 
         if "model_info" in state:
-            client._model_info = state["model_info"]
+            if model_cache is None:
+                client._model_info = state["model_info"]
+            else:
+                # Move embedded model info into the cache.
+                for url, data in state["model_info"].items():
+                    if url not in model_cache:
+                        model_cache.put(url, data)
 
         if "country" in state:
             client._country = state["country"]
@@ -187,14 +548,23 @@ class Client(object):
         if "language" in state:
             client._language = state["language"]
 
+        if "refreshed_at" in state:
+            client._refreshed_at = state["refreshed_at"]
+
         return client
 
     def dump(self) -> Dict[str, Any]:
-        """Serialize the client state."""
+        """Serialize the client state.
 
-        out: Dict[str, Any] = {
-            "model_info": self._model_info,
-        }
+        Model info data is embedded in the state unless the client has a
+        model cache, in which case the state refers to the cache.
+        """
+
+        out: Dict[str, Any] = {}
+        if self._model_cache is None:
+            out["model_info"] = dict(self._model_info)
+        else:
+            out["model_cache"] = self._model_cache.path
 
         if self._gateway:
             out["gateway"] = self._gateway.serialize()
@@ -208,11 +578,91 @@ class Client(object):
         out["country"] = self._country
         out["language"] = self._language
 
+        if self._refreshed_at is not None:
+            out["refreshed_at"] = self._refreshed_at
+
         return out
 
+    def needs_refresh(self) -> bool:
+        """Check whether the session is about to expire, so it should be
+        refreshed before it is used.
+        """
+        if self._refreshed_at is None:
+            return False
+        age = time.time() - self._refreshed_at
+        return age > self._session_lifetime - REFRESH_MARGIN
+
     def refresh(self) -> None:
-        self._auth = self.auth.refresh()
-        self._session, self._devices = self.auth.start_session()
+        """Get a new access token and start a new session.
+
+        Only one refresh happens at a time: a thread that calls this
+        while another thread is refreshing waits for that refresh to
+        finish and then returns without refreshing again.
+
+        The existing `core.Session` object is updated in place, so
+        objects that hold on to it (such as monitors) use the new
+        session too.
+        """
+        generation = self._refresh_generation
+        with self._refresh_lock:
+            if generation != self._refresh_generation:
+                return
+
+            self._auth = self.auth.refresh(self._deadline(), self._timeout)
+            session, self._devices = self._auth.start_session(
+                self._deadline(), self._timeout
+            )
+            if self._session:
+                self._session.set_credentials(session.auth, session.session_id)
+            else:
+                self._session = self._configure(session)
+            self._refreshed_at = time.time()
+            self._refresh_failed_at = None
+            self._refresh_generation += 1
+
+    def start_auto_refresh(self) -> None:
+        """Refresh the session in a background thread, shortly before it
+        is due to expire.
+        """
+        if self._refresh_thread:
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._auto_refresh, name="wideq-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def stop_auto_refresh(self) -> None:
+        """Stop the background refresh thread."""
+        if self._refresh_thread:
+            self._refresh_stop.set()
+            self._refresh_thread.join()
+            self._refresh_thread = None
+
+    def _auto_refresh(self) -> None:
+        delay = 0.0
+        while not self._refresh_stop.wait(delay):
+            if self.needs_refresh() or self._refreshed_at is None:
+                try:
+                    self.refresh()
+                except Exception:
+                    LOGGER.exception("Background session refresh failed")
+                    delay = REFRESH_RETRY_DELAY
+                    continue
+            due = (
+                self._refreshed_at  # type: ignore
+                + self._session_lifetime
+                - REFRESH_MARGIN
+            )
+            delay = max(due - time.time(), 0.0)
+
+    def close(self) -> None:
+        """Stop refreshing in the background and close the client's
+        transport and its pooled HTTP connections.
+        """
+
+        self.stop_auto_refresh()
+        self._http.close()
 
     @classmethod
     def from_token(
@@ -229,7 +679,9 @@ class Client(object):
             country=country or core.DEFAULT_COUNTRY,
             language=language or core.DEFAULT_LANGUAGE,
         )
-        client._auth = core.Auth(client.gateway, None, refresh_token)
+        client._auth = core.Auth(
+            client.gateway, None, refresh_token, client._http
+        )
         client.refresh()
         return client
 
@@ -237,11 +689,94 @@ class Client(object):
         """For a DeviceInfo object, get a ModelInfo object describing
         the model's capabilities.
         """
+        return self._load_model(device)
+
+    def _load_model(
+        self, device: "DeviceInfo", timeout: Optional[core.Timeout] = None
+    ) -> "ModelInfo":
+        """Get the shared ModelInfo for a device's model, building it
+        if no other thread has.
+        """
+        url = device.model_info_url
+        model = self._models.get(url)
+        if model is not None:
+            return model
+        with self._models_lock:
+            lock = self._model_locks.setdefault(url, threading.Lock())
+        with lock:
+            model = self._models.get(url)
+            if model is None:
+                model = self._models[url] = self._build_model(device, timeout)
+        return model
+
+    def _build_model(
+        self, device: "DeviceInfo", timeout: Optional[core.Timeout] = None
+    ) -> "ModelInfo":
+        """Build a ModelInfo for a device from the model cache or the
+        model info data we already have, downloading the data if we do
+        not have it.
+        """
         url = device.model_info_url
+        timeout = timeout or self._timeout
+        if self._model_cache is not None:
+            model = self._model_cache.get(url)
+            if model is None:
+                data = device.load_model_info(self._http, timeout)
+                model = self._model_cache.put(url, data)
+            return model
+
         if url not in self._model_info:
-            self._model_info[url] = device.load_model_info()
+            data = device.load_model_info(self._http, timeout)
+            self._model_info[url] = data
         return ModelInfo(self._model_info[url])
 
+    def warm_up(
+        self,
+        max_workers: int = WARM_UP_WORKERS,
+        timeout: float = MODEL_INFO_TIMEOUT,
+    ) -> List["DeviceInfo"]:
+        """Start a session, get the device list, and load the model info
+        for every device, so that creating `Device` objects afterwards
+        needs no more requests.
+
+        The model info for each distinct model is downloaded and
+        compiled on a pool of up to `max_workers` threads. Each download
+        is retried like any other request, with each attempt giving up
+        after `timeout` seconds; models that fail to load are logged and
+        skipped, and are loaded again on demand.
+
+        Return the user's devices.
+        """
+        devices = list(self.devices)
+
+        pending: Dict[str, DeviceInfo] = {}
+        for device in devices:
+            url = device.model_info_url
+            if url not in self._models:
+                pending.setdefault(url, device)
+        if not pending:
+            return devices
+
+        def build(device: DeviceInfo) -> ModelInfo:
+            model = self._load_model(device, timeout)
+            model.compile()
+            return model
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(pending)),
+            thread_name_prefix="wideq-warm-up",
+        ) as pool:
+            futures = {
+                url: pool.submit(build, device)
+                for url, device in pending.items()
+            }
+        for url, future in futures.items():
+            try:
+                future.result()
+            except Exception:
+                LOGGER.exception("Could not load model info from %s", url)
+        return devices
+
 
 class DeviceType(enum.Enum):
     """The category of device."""
@@ -304,9 +839,183 @@ class DeviceInfo(object):
 
         return DeviceType(self.data["deviceType"])
 
-    def load_model_info(self):
-        """Load JSON data describing the model's capabilities."""
-        return requests.get(self.model_info_url).json()
+    def load_model_info(self, http=None, timeout=None, deadline=None):
+        """Load JSON data describing the model's capabilities.
+
+        The data is fetched over the `core.Transport` (or Requests
+        session) `http`, or the process-wide `core.shared_session` if it
+        is not given, and is retried within the `timeout` and `deadline`
+        as described for `core.request`.
+        """
+        res = core.request("GET", self.model_info_url, http, timeout, deadline)
+        return res.json()
+
+
+#: The changes between two device lists: lists of the `DeviceInfo`
+#: objects of devices that were added, removed, and changed (in one of
+#: `DEVICE_CHANGE_FIELDS`).
+DeviceChanges = namedtuple("DeviceChanges", ["added", "removed", "changed"])
+
+#: The fields of a device list entry whose changes are reported.
+DEVICE_CHANGE_FIELDS = ("alias", "modelJsonUrl", "deviceType")
+
+
+class DeviceRegistry(object):
+    """An index of a user's devices, by ID, type and model.
+
+    The registry holds one `DeviceInfo` for each device, and the
+    `Device` object made for it, if any. Updating the registry from a
+    new device list keeps both for every device whose model and type
+    have not changed; only their data is updated.
+
+    The registry may be updated more often than its changes are looked
+    at, as when a client gets a new device list by refreshing its
+    session, so it also keeps the devices as they were when it last
+    reported its changes with `report`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._infos: Dict[str, DeviceInfo] = {}
+        self._objects: Dict[str, "Device"] = {}
+        self._by_type: Dict[DeviceType, List[DeviceInfo]] = {}
+        self._by_model: Dict[str, List[DeviceInfo]] = {}
+
+        # The device list that the registry was last updated from.
+        self.source: Optional[List[Dict[str, Any]]] = None
+
+        # Each device's `DeviceInfo` and data as of the last `report`.
+        self._reported: Dict[str, Tuple[DeviceInfo, Dict[str, Any]]] = {}
+
+    def update(self, devices: List[Dict[str, Any]]) -> DeviceChanges:
+        """Update the registry from a device list, as returned by
+        `core.Session.get_devices`, and return the changes. Nothing is
+        done if the registry was last updated from the same list.
+        """
+        with self._lock:
+            if devices is self.source:
+                return DeviceChanges([], [], [])
+            return self._update(devices)
+
+    def _update(self, devices: List[Dict[str, Any]]) -> DeviceChanges:
+        changes = DeviceChanges([], [], [])
+        infos: Dict[str, DeviceInfo] = {}
+        for data in devices:
+            device_id = data["deviceId"]
+            info = self._infos.get(device_id)
+            if info is None:
+                info = DeviceInfo(data)
+                changes.added.append(info)
+            elif info.data != data:
+                old = info.data
+                if any(
+                    old.get(key) != data.get(key)
+                    for key in ("modelJsonUrl", "deviceType")
+                ):
+                    # The device needs a new `Device` object.
+                    info = DeviceInfo(data)
+                    self._objects.pop(device_id, None)
+                else:
+                    info.data = data
+                if any(
+                    old.get(key) != data.get(key)
+                    for key in DEVICE_CHANGE_FIELDS
+                ):
+                    changes.changed.append(info)
+            infos[device_id] = info
+        for device_id, info in self._infos.items():
+            if device_id not in infos:
+                changes.removed.append(info)
+                self._objects.pop(device_id, None)
+
+        by_type: Dict[DeviceType, List[DeviceInfo]] = {}
+        by_model: Dict[str, List[DeviceInfo]] = {}
+        for info in infos.values():
+            try:
+                by_type.setdefault(info.type, []).append(info)
+            except ValueError:
+                pass  # An unknown type of device.
+            model_id = str(info.data.get("modelNm", ""))
+            by_model.setdefault(model_id, []).append(info)
+
+        if self.source is None:
+            # The first device list is where changes are counted from.
+            self._reported = {
+                device_id: (info, info.data)
+                for device_id, info in infos.items()
+            }
+        self._infos = infos
+        self._by_type = by_type
+        self._by_model = by_model
+        self.source = devices
+        return changes
+
+    def report(self) -> DeviceChanges:
+        """Get the changes to the devices since the last report (or
+        since the registry was first updated), however many updates
+        they were made in.
+        """
+        with self._lock:
+            changes = DeviceChanges([], [], [])
+            for device_id, info in self._infos.items():
+                reported = self._reported.get(device_id)
+                if reported is None:
+                    changes.added.append(info)
+                    continue
+                old, data = reported
+                if old is not info or any(
+                    data.get(key) != info.data.get(key)
+                    for key in DEVICE_CHANGE_FIELDS
+                ):
+                    changes.changed.append(info)
+            for device_id, (old, _) in self._reported.items():
+                if device_id not in self._infos:
+                    changes.removed.append(old)
+            self._reported = {
+                device_id: (info, info.data)
+                for device_id, info in self._infos.items()
+            }
+            return changes
+
+    def get(self, device_id: str) -> Optional[DeviceInfo]:
+        """Look up a device by ID, or return None if there is none."""
+        return self._infos.get(device_id)
+
+    def device(
+        self, device_id: str, build: Callable[[DeviceInfo], "Device"]
+    ) -> Optional["Device"]:
+        """Get the `Device` object for a device, made by `build` the
+        first time, or return None if there is no such device.
+        """
+        device = self._objects.get(device_id)
+        if device is not None:
+            return device
+        info = self._infos.get(device_id)
+        if info is None:
+            return None
+        device = build(info)
+        with self._lock:
+            # Keep the object only if the device has not changed since.
+            if self._infos.get(device_id) is info:
+                device = self._objects.setdefault(device_id, device)
+        return device
+
+    def by_type(self, device_type: DeviceType) -> List[DeviceInfo]:
+        """Get the devices of a type."""
+        return list(self._by_type.get(device_type, ()))
+
+    def by_model(self, model_id: str) -> List[DeviceInfo]:
+        """Get the devices of a model, by model name."""
+        return list(self._by_model.get(model_id, ()))
+
+    def __iter__(self) -> Iterator[DeviceInfo]:
+        return iter(list(self._infos.values()))
+
+    def __len__(self) -> int:
+        return len(self._infos)
+
+    def __contains__(self, device_id: object) -> bool:
+        return device_id in self._infos
 
 
 BitValue = namedtuple("BitValue", ["options"])
@@ -318,12 +1027,109 @@ ReferenceValue = namedtuple("ReferenceValue", ["reference"])
 StringValue = namedtuple("StringValue", ["comment"])
 
 
+#: Struct format characters for big-endian unsigned integers, by size.
+_STRUCT_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+class BinaryProtocol(object):
+    """A decoder for binary status data, compiled once from a model's
+    `Monitoring.protocol` description.
+
+    Each protocol item describes a big-endian unsigned integer field by
+    its `startByte` and `length`. When the fields do not overlap and
+    have standard integer sizes, a whole frame is decoded with a single
+    `struct` call; otherwise each field is sliced out of the frame.
+    """
+
+    def __init__(self, protocol: List[Dict[str, Any]]) -> None:
+        items = sorted(protocol, key=lambda item: item["startByte"])
+        self.keys = [item["value"] for item in items]
+        self.slices = [
+            (item["startByte"], item["startByte"] + item["length"])
+            for item in items
+        ]
+        self.struct = self._compile(items)
+
+    @staticmethod
+    def _compile(items) -> Optional[struct.Struct]:
+        """Build a `Struct` that unpacks every field at once, or return
+        None if the fields cannot be described that way.
+        """
+        fmt = ">"
+        offset = 0
+        for item in items:
+            start, length = item["startByte"], item["length"]
+            if start < offset or length not in _STRUCT_FORMATS:
+                return None
+            if start > offset:
+                fmt += "{}x".format(start - offset)
+            fmt += _STRUCT_FORMATS[length]
+            offset = start + length
+        return struct.Struct(fmt)
+
+    def decode(self, data: bytes, raw: bool = False) -> Dict[str, Any]:
+        """Decode a frame of status data into a dict mapping each field
+        name to its value: an `int` if `raw` is set, or otherwise the
+        value formatted as a string.
+
+        Fields that lie beyond the end of a short frame decode as 0.
+        """
+        if self.struct and len(data) >= self.struct.size:
+            values = self.struct.unpack_from(data)
+        else:
+            values = tuple(
+                int.from_bytes(data[start:end], "big")
+                for start, end in self.slices
+            )
+        if raw:
+            return dict(zip(self.keys, values))
+        return dict(zip(self.keys, map(str, values)))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # `Struct` objects cannot be pickled, so store the format.
+        state = self.__dict__.copy()
+        state["struct"] = self.struct.format if self.struct else None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        fmt = state.pop("struct")
+        self.__dict__.update(state)
+        self.struct = struct.Struct(fmt) if fmt else None
+
+
 class ModelInfo(object):
     """A description of a device model's capabilities."""
 
-    def __init__(self, data):
+    def __init__(self, data) -> None:
         self.data = data
 
+        # Lookup tables, built from the raw data on first use. The
+        # status properties of every device of this model go through
+        # these, so they should only be computed once.
+        self._values: Dict[str, Any] = {}
+        self._enum_values: Dict[str, Dict[str, str]] = {}
+        self._binary_protocol: Optional[BinaryProtocol] = None
+        self._binary_monitor_data: Optional[bool] = None
+
+    def compile(self) -> None:
+        """Build every lookup table now rather than on first use.
+
+        This does all of the work of interpreting the raw data up front,
+        so that a compiled `ModelInfo` can be stored (see
+        `wideq.cache.ModelCache`) and reused without that work.
+        """
+        for name in self.data.get("Value", {}):
+            try:
+                value = self.value(name)
+            except (KeyError, ValueError):
+                continue
+            if isinstance(value, EnumValue):
+                self._enum_values[name] = {
+                    v: k for k, v in value.options.items()
+                }
+        if "Monitoring" in self.data and self.binary_monitor_data:
+            self.binary_protocol
+
     def value(self, name: str):
         """Look up information about a value.
 
@@ -332,6 +1138,14 @@ class ModelInfo(object):
             `ReferenceValue`, `StringValue`).
         :raises ValueError: If an unsupported type is encountered.
         """
+        try:
+            return self._values[name]
+        except KeyError:
+            value = self._values[name] = self._parse_value(name)
+            return value
+
+    def _parse_value(self, name: str):
+        """Build the description of a value from the raw data."""
         d = self.data["Value"][name]
         if d["type"] in ("Enum", "enum"):
             return EnumValue(d["option"])
@@ -361,8 +1175,12 @@ class ModelInfo(object):
 
     def enum_value(self, key, name):
         """Look up the encoded value for a friendly enum name."""
-        options = self.value(key).options
-        options_inv = {v: k for k, v in options.items()}  # Invert the map.
+        try:
+            options_inv = self._enum_values[key]
+        except KeyError:
+            options = self.value(key).options
+            options_inv = {v: k for k, v in options.items()}  # Invert it.
+            self._enum_values[key] = options_inv
         return options_inv[name]
 
     def enum_name(self, key, value):
@@ -397,33 +1215,114 @@ class ModelInfo(object):
     @property
     def binary_monitor_data(self):
         """Check that type of monitoring is BINARY(BYTE)."""
-        return self.data["Monitoring"]["type"] == "BINARY(BYTE)"
-
-    def decode_monitor_binary(self, data):
-        """Decode binary encoded status data."""
-        decoded = {}
-        for item in self.data["Monitoring"]["protocol"]:
-            key = item["value"]
-            value = 0
-            for v in data[
-                item["startByte"] : item["startByte"] + item["length"]
-            ]:
-                value = (value << 8) + v
-            decoded[key] = str(value)
-        return decoded
+        if self._binary_monitor_data is None:
+            monitoring_type = self.data["Monitoring"]["type"]
+            self._binary_monitor_data = monitoring_type == "BINARY(BYTE)"
+        return self._binary_monitor_data
+
+    @property
+    def binary_protocol(self) -> BinaryProtocol:
+        """The compiled decoder for this model's binary status data."""
+        if self._binary_protocol is None:
+            protocol = self.data["Monitoring"]["protocol"]
+            self._binary_protocol = BinaryProtocol(protocol)
+        return self._binary_protocol
+
+    def decode_monitor_binary(self, data, raw=False):
+        """Decode binary encoded status data.
+
+        Values are strings, or `int`s if `raw` is set.
+        """
+        return self.binary_protocol.decode(data, raw)
 
     def decode_monitor_json(self, data):
         """Decode a bytestring that encodes JSON status data."""
         return json.loads(data.decode("utf8"))
 
-    def decode_monitor(self, data):
-        """Decode  status data."""
+    def decode_monitor(self, data, raw=False):
+        """Decode  status data.
+
+        For binary data, `raw` requests `int` values instead of strings.
+        Decoding is seen by any `hooks.DECODE` hooks.
+        """
+        if hooks.HOOKS[hooks.DECODE]:
+            name = self.data.get("Info", {}).get("modelName", "")
+            call = hooks.start(hooks.DECODE, name, len(data))
+            try:
+                out = self._decode_monitor(data, raw)
+            except Exception as exc:
+                hooks.finish(call, exc)
+                raise
+            hooks.finish(call)
+            return out
+        return self._decode_monitor(data, raw)
+
+    def _decode_monitor(self, data, raw):
         if self.binary_monitor_data:
-            return self.decode_monitor_binary(data)
+            return self.decode_monitor_binary(data, raw)
         else:
             return self.decode_monitor_json(data)
 
 
+class status_property(object):
+    """A read-only property of a `DeviceStatus`, computed at most once
+    per status object.
+
+    Use it like `@property`. The value is memoized in the status
+    object's cache the first time it is read.
+    """
+
+    def __init__(self, func) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        try:
+            return obj._cache[self.name]
+        except KeyError:
+            value = obj._cache[self.name] = self.func(obj)
+            return value
+
+    def __set__(self, obj, value):
+        raise AttributeError("can't set attribute")
+
+
+class DeviceStatus(object):
+    """Higher-level information about a device's current status, decoded
+    from one frame of monitoring data.
+
+    Subclasses declare their decoded fields with `status_property`, so
+    each one is decoded at most once no matter how often it is read.
+    """
+
+    __slots__ = ("data", "_cache")
+
+    #: The names of the status properties of this class.
+    fields: Tuple[str, ...] = ()
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+        self._cache: Dict[str, Any] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        names: Dict[str, None] = {}
+        for klass in reversed(cls.__mro__):
+            for name, attr in vars(klass).items():
+                if isinstance(attr, status_property):
+                    names[name] = None
+        cls.fields = tuple(names)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a snapshot of every status property, as a dict mapping
+        property names to values.
+        """
+        return {name: getattr(self, name) for name in self.fields}
+
+
 class Device(object):
     """A higher-level interface to a specific device.
 
@@ -432,21 +1331,88 @@ class Device(object):
     regarding the device.
     """
 
-    def __init__(self, client: Client, device: DeviceInfo):
+    #: The values read by `get_all_configs`, by name: for each, whether
+    #: it is a "Config" or "Control" value, its key, and a function that
+    #: converts the result of looking it up (the value, or the exception
+    #: that the lookup raised) into the value to return.
+    CONFIG_VALUES: Dict[str, Tuple[str, str, Callable[[Any], Any]]] = {}
+
+    def __init__(
+        self,
+        client: Client,
+        device: DeviceInfo,
+        model: Optional[ModelInfo] = None,
+    ):
         """Create a wrapper for a `DeviceInfo` object associated with a
         `Client`.
+
+        The device's `ModelInfo` is looked up through the client unless
+        it is given.
         """
         self.client = client
         self.device = device
-        self.model: ModelInfo = client.model_info(device)
+        self.model: ModelInfo = model or client.model_info(device)
+
+        # Control changes held back until the end of a `batch` block.
+        # A device object is shared between threads, so each thread
+        # has its own batch.
+        self._batches = threading.local()
+
+        # The last frame of monitoring data and the status object built
+        # from it, reused while the frame does not change.
+        self._frame: Optional[bytes] = None
+        self._status: Any = None
+
+    @property
+    def _pending_controls(self) -> Optional[Dict[str, Any]]:
+        """The control changes of the current thread's `batch` block, or
+        None outside one.
+        """
+        return getattr(self._batches, "pending", None)
+
+    @_pending_controls.setter
+    def _pending_controls(self, pending: Optional[Dict[str, Any]]) -> None:
+        self._batches.pending = pending
 
     def _set_control(self, key, value):
-        """Set a device's control for `key` to `value`."""
+        """Set a device's control for `key` to `value`.
+
+        Inside a `batch` block, the change is deferred until the end of
+        the block.
+        """
+        if self._pending_controls is not None:
+            self._pending_controls[key] = value
+            return
+
         self.client.session.set_device_controls(
             self.device.id,
             {key: value},
         )
 
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Combine the control changes made in a `with` block into a
+        single request, sent when the block ends.
+
+        If the same control is set more than once, the last value wins.
+        Nested blocks are merged into the outermost one. If the block
+        raises an exception, its changes are discarded. Only changes
+        made by the thread running the block are batched.
+        """
+        if self._pending_controls is not None:
+            yield
+            return
+
+        self._pending_controls = {}
+        try:
+            yield
+            pending = self._pending_controls
+        finally:
+            self._pending_controls = None
+
+        if pending:
+            self.client.session.set_device_controls(self.device.id, pending)
+
     def _get_config(self, key):
         """Look up a device's configuration for a given value.
 
@@ -456,6 +1422,11 @@ class Device(object):
             self.device.id,
             key,
         )
+        return self._decode_config(data)
+
+    @staticmethod
+    def _decode_config(data):
+        """Decode a configuration value: base64-encoded JSON."""
         data = base64.b64decode(data).decode("utf8")
         try:
             return json.loads(data)
@@ -468,6 +1439,92 @@ class Device(object):
             except json.decoder.JSONDecodeError:
                 raise core.MalformedResponseError(data)
 
+    def get_configs(
+        self,
+        keys: Iterable[str] = (),
+        controls: Iterable[str] = (),
+        max_workers: int = CONFIG_WORKERS,
+    ) -> Dict[str, Any]:
+        """Look up several configuration and control values at once.
+
+        Each of `keys` is looked up as by `_get_config` and each of
+        `controls` as by `_get_control`. The requests are made on a pool
+        of up to `max_workers` threads, sharing the client's pooled
+        connections, so they take about as long as the slowest one.
+
+        Return a dict mapping each key to its value or, if its lookup
+        failed, to the exception that it raised. A key may not be both a
+        configuration and a control key.
+        """
+        lookups = self._config_lookups(keys, controls)
+        if not lookups:
+            return {}
+
+        # Start the session, if need be, before the requests need it.
+        self.client.session
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(lookups)),
+            thread_name_prefix="wideq-config",
+        ) as pool:
+            futures = {key: pool.submit(get, key) for key, get in lookups}
+        out: Dict[str, Any] = {}
+        for key, future in futures.items():
+            try:
+                out[key] = future.result()
+            except Exception as exc:
+                out[key] = exc
+        return out
+
+    def _config_lookups(
+        self, keys: Iterable[str], controls: Iterable[str]
+    ) -> List[Tuple[str, Callable[[str], Any]]]:
+        """Pair each of `keys` and `controls` with the method that looks
+        it up, for `get_configs`.
+        """
+        lookups = [(key, self._get_config) for key in keys]
+        lookups += [(key, self._get_control) for key in controls]
+        seen = set()
+        for key, _ in lookups:
+            if key in seen:
+                raise ValueError("key looked up twice: {}".format(key))
+            seen.add(key)
+        return lookups
+
+    def _get_value(self, name):
+        """Get one of the values in `CONFIG_VALUES`."""
+        category, key, convert = self.CONFIG_VALUES[name]
+        get = self._get_control if category == "Control" else self._get_config
+        try:
+            result = get(key)
+        except Exception as exc:
+            result = exc
+        return convert(result)
+
+    def get_all_configs(self) -> Dict[str, Any]:
+        """Get every value in `CONFIG_VALUES`, with their requests made
+        concurrently (see `get_configs`).
+
+        Return a dict mapping each value's name to the value. If a
+        request fails in a way that its conversion does not handle, its
+        exception is raised.
+        """
+        values = self.get_configs(*self._config_keys())
+        return {
+            name: convert(values[key])
+            for name, (_, key, convert) in self.CONFIG_VALUES.items()
+        }
+
+    def _config_keys(self) -> Tuple[List[str], List[str]]:
+        """Split the keys of `CONFIG_VALUES` into configuration and
+        control keys.
+        """
+        keys: List[str] = []
+        controls: List[str] = []
+        for category, key, _ in self.CONFIG_VALUES.values():
+            (controls if category == "Control" else keys).append(key)
+        return keys, controls
+
     def _get_control(self, key):
         """Look up a device's control value."""
         data = self.client.session.get_device_config(
@@ -475,14 +1532,38 @@ class Device(object):
             key,
             "Control",
         )
+        return self._decode_control(data)
 
+    @staticmethod
+    def _decode_control(data):
+        """Decode a control value."""
         # The response comes in a funky key/value format: "(key:value)".
         _, value = data[1:-1].split(":")
         return value
 
+    def _poll_status(self, data: Optional[bytes]):
+        """Get the status object for a frame of monitoring data (or None
+        if there is no data).
+
+        The previous status object is returned again if the frame has
+        not changed.
+        """
+        if not data:
+            return None
+        if data != self._frame:
+            self._status = self._parse_status(data)
+            self._frame = data
+        return self._status
+
+    def _parse_status(self, data: bytes):
+        """Build a status object for this device from raw monitoring
+        data. Subclasses that support polling implement this.
+        """
+        raise NotImplementedError
+
     def monitor_start(self):
         """Start monitoring the device's status."""
-        mon = Monitor(self.client.session, self.device.id)
+        mon = Monitor(self.client.session, self.device.id, self.model)
         mon.start()
         self.mon = mon
 
@@ -1,16 +1,22 @@
 """A low-level, general abstraction for the LG SmartThinQ API.
 """
 import base64
+import json
 import uuid
+from collections import namedtuple
 from urllib.parse import urljoin, urlencode, urlparse, parse_qs
 import hashlib
 import hmac
 import datetime
 import requests
 import logging
-from typing import Any, Dict, List, Tuple
+import threading
+import time
+import urllib3
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+
+from . import hooks, metrics
 
 GATEWAY_URL = "https://kic.lgthinq.com:46030/api/common/gatewayUriList"
 APP_KEY = "wideq"
@@ -27,13 +33,36 @@ DEFAULT_LANGUAGE = "en-US"
 RETRY_COUNT = 5  # Anecdotally this seems sufficient.
 RETRY_FACTOR = 0.5
 RETRY_STATUSES = (502, 503, 504)
+#: The methods that are retried after any failure (these are the ones
+#: urllib3 retries by default). Others, such as POST, are only retried
+#: when the request could not be sent at all.
+IDEMPOTENT_METHODS = frozenset(
+    ["DELETE", "GET", "HEAD", "OPTIONS", "PUT", "TRACE"]
+)
+POOL_SIZE = 10  # Maximum number of kept-alive connections per host.
+CONNECT_TIMEOUT = 5.0  # Seconds to wait to connect to a server.
+READ_TIMEOUT = 20.0  # Seconds to wait for a server to send data.
+REQUEST_BUDGET = 30.0  # Seconds a request may take, retries included.
+
+
+#: The handler added by `get_wideq_logger`, once it has been called.
+_LOG_HANDLER: Optional[logging.Handler] = None
 
 
 def get_wideq_logger() -> logging.Logger:
+    """Get the package's logger, set up to print messages at INFO level
+    and above to stderr, in color if `colorlog` is installed.
+
+    Importing wideq does not configure logging. Applications that want
+    this output call this function; calling it again does nothing more.
+    """
+    global _LOG_HANDLER
     level = logging.INFO
     fmt = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
     datefmt = "%Y-%m-%d %H:%M:%S"
     logger = logging.getLogger("wideq")
+    if _LOG_HANDLER is not None:
+        return logger
     logger.setLevel(level)
 
     try:
@@ -60,33 +89,320 @@ def get_wideq_logger() -> logging.Logger:
         handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
 
     logger.addHandler(handler)
+    _LOG_HANDLER = handler
     return logger
 
 
-LOGGER = get_wideq_logger()
+LOGGER = logging.getLogger("wideq")
 
 
-def retry_session():
-    """Get a Requests session that retries HTTP and HTTPS requests."""
-    # Adapted from:
-    # https://www.peterbe.com/plog/best-practice-with-retries-with-requests
+def retry_session(pool_size: int = POOL_SIZE) -> requests.Session:
+    """Get a pooled Requests session for making requests with
+    `request`, which retries them.
+
+    The session keeps up to `pool_size` connections alive per host, so
+    it should be kept around and reused: this saves a DNS lookup and a
+    TCP and TLS handshake on every request. Requests sessions are safe
+    to share between threads.
+
+    The session itself does not retry, so that retries can be fitted
+    into each request's time budget.
+    """
     session = requests.Session()
-    retry = Retry(
-        total=RETRY_COUNT,
-        read=RETRY_COUNT,
-        connect=RETRY_COUNT,
-        backoff_factor=RETRY_FACTOR,
-        status_forcelist=RETRY_STATUSES,
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=0,
     )
-    adapter = HTTPAdapter(max_retries=retry)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
 
 
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def shared_session() -> requests.Session:
+    """Get the process-wide pooled Requests session.
+
+    This is used for requests that are not made on behalf of a specific
+    `Client`, which owns its own pool.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = retry_session()
+        return _shared_session
+
+
+# The `json` module, under names that the `json` arguments of
+# `Transport.send` do not hide.
+_json_dumps = json.dumps
+_json_loads = json.loads
+
+
+class HTTPResponse(
+    namedtuple("HTTPResponse", ["status_code", "content", "sent"])
+):
+    """The status code and body of an HTTP response, as returned by a
+    `Transport`, and the size in bytes of the request body that was
+    sent.
+    """
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class Transport(object):
+    """A way of sending HTTP requests to the API servers.
+
+    Transports send one request at a time and do not retry: retries,
+    timeouts and the API's envelope format are handled by `request` and
+    `lgedm_post`. A transport is selected by passing it wherever an
+    `http` argument is accepted, such as to `Session` or to
+    `client.Client`.
+    """
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        timeout: Tuple[float, float],
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        data: Optional[Dict[str, str]] = None,
+    ) -> HTTPResponse:
+        """Send a request and return the response.
+
+        The body is either `json`, to be sent as JSON, or `data`, to be
+        sent form-encoded. `timeout` is a pair of the connect and read
+        timeouts in seconds. Failures must be raised as
+        `requests.Timeout` or `requests.ConnectionError`.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the transport's connections."""
+
+
+class RequestsTransport(Transport):
+    """Send requests with a (pooled) Requests session."""
+
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
+        self.session = session or retry_session()
+
+    def send(
+        self, method, url, timeout, headers=None, json=None, data=None
+    ) -> HTTPResponse:
+        res = self.session.request(
+            method, url, timeout=timeout, headers=headers, json=json, data=data
+        )
+        sent = int(res.request.headers.get("Content-Length", 0))
+        return HTTPResponse(res.status_code, res.content, sent)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """Send requests with a `urllib3` connection pool, skipping the
+    overhead of the Requests layer.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE) -> None:
+        self.pool = urllib3.PoolManager(maxsize=pool_size, retries=False)
+
+    def send(
+        self, method, url, timeout, headers=None, json=None, data=None
+    ) -> HTTPResponse:
+        headers = dict(headers or {})
+        if json is not None:
+            body = _json_dumps(json).encode("utf8")
+            headers["Content-Type"] = "application/json"
+        elif data is not None:
+            body = urlencode(data).encode("utf8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        else:
+            body = None
+
+        try:
+            res = self.pool.request(
+                method,
+                url,
+                body=body,
+                headers=headers,
+                timeout=urllib3.Timeout(connect=timeout[0], read=timeout[1]),
+            )
+        except urllib3.exceptions.NewConnectionError as exc:
+            # Checked first, as it subclasses `ConnectTimeoutError`.
+            raise requests.ConnectionError(exc) from exc
+        except urllib3.exceptions.ConnectTimeoutError as exc:
+            raise requests.ConnectTimeout(exc) from exc
+        except urllib3.exceptions.TimeoutError as exc:
+            raise requests.Timeout(exc) from exc
+        except urllib3.exceptions.HTTPError as exc:
+            raise requests.ConnectionError(exc) from exc
+        return HTTPResponse(res.status, res.data, len(body or b""))
+
+    def close(self) -> None:
+        self.pool.clear()
+
+
+class MemoryTransport(Transport):
+    """Answer requests in memory, without any sockets, for tests and
+    benchmarks.
+
+    `handler` is called as `handler(method, url, headers, body)`, where
+    `body` is the decoded JSON or form data, and returns a pair of the
+    status code and the data to send back as JSON.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, str, Dict[str, str], Any], Tuple[int, Any]],
+    ) -> None:
+        self.handler = handler
+
+    def send(
+        self, method, url, timeout, headers=None, json=None, data=None
+    ) -> HTTPResponse:
+        # Round-trip the request through JSON, as a server would see it.
+        if json is not None:
+            sent = _json_dumps(json)
+            body = _json_loads(sent)
+        else:
+            sent = urlencode(data or {})
+            body = data
+        status, res = self.handler(method, url, dict(headers or {}), body)
+        content = _json_dumps(res).encode("utf8")
+        return HTTPResponse(status, content, len(sent))
+
+
+def as_transport(http=None) -> Transport:
+    """Get the transport to send requests over for an `http` argument,
+    which may be a `Transport`, a Requests session, or None for the
+    process-wide `shared_session`.
+    """
+    if isinstance(http, Transport):
+        return http
+    return RequestsTransport(http or shared_session())
+
+
+class DeadlineExceededError(requests.exceptions.Timeout):
+    """A request, including its retries, did not finish in time."""
+
+
+def _connect_failed(exc: BaseException) -> bool:
+    """Check whether a transport error means that no connection could be
+    made, so the request was never sent.
+    """
+    errors = [exc]
+    while errors:
+        error = errors.pop()
+        if isinstance(
+            error,
+            (requests.ConnectTimeout, urllib3.exceptions.ConnectTimeoutError),
+        ):
+            # Including `urllib3.exceptions.NewConnectionError`.
+            return True
+        if isinstance(error, urllib3.exceptions.MaxRetryError):
+            if error.reason is not None:
+                errors.append(error.reason)
+        errors.extend(a for a in error.args if isinstance(a, BaseException))
+        if error.__cause__ is not None:
+            errors.append(error.__cause__)
+    return False
+
+
+#: A timeout for one attempt at a request: either a number of seconds,
+#: or a pair of the connect and read timeouts.
+Timeout = Union[float, Tuple[float, float]]
+
+
+def request(
+    method: str,
+    url: str,
+    http: Union[Transport, requests.Session, None] = None,
+    timeout: Optional[Timeout] = None,
+    deadline: Optional[float] = None,
+    idempotent: Optional[bool] = None,
+    **kwargs,
+) -> HTTPResponse:
+    """Make an HTTP request over the `Transport` (or Requests session)
+    `http`, or the process-wide `shared_session`, and return the
+    response. Other keyword arguments are passed to `Transport.send`.
+
+    Failures to connect are retried with exponential backoff, up to
+    `RETRY_COUNT` times. So are other failures, timeouts and the
+    statuses in `RETRY_STATUSES`, but only for requests that are safe to
+    repeat: those whose method is in `IDEMPOTENT_METHODS`, unless
+    `idempotent` says otherwise.
+
+    Each attempt waits for the server for at most `timeout`, which is
+    `(CONNECT_TIMEOUT, READ_TIMEOUT)` by default. The whole request,
+    retries included, must finish by `deadline`, which is a
+    `time.monotonic()` time, `REQUEST_BUDGET` seconds from now by
+    default. Timeouts are shortened to fit the deadline, and a
+    `DeadlineExceededError` is raised rather than starting an attempt
+    or backoff that would overrun it.
+
+    Every attempt is recorded in `metrics.METRICS`.
+    """
+    # Adapted from:
+    # https://www.peterbe.com/plog/best-practice-with-retries-with-requests
+    transport = as_transport(http)
+    endpoint = metrics.endpoint(url)
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout,) * 2
+    if deadline is None:
+        deadline = time.monotonic() + REQUEST_BUDGET
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+    for attempt in range(RETRY_COUNT + 1):
+        last = attempt == RETRY_COUNT
+        start = time.monotonic()
+        remaining = deadline - start
+        if remaining <= 0:
+            metrics.METRICS.record_error(endpoint, "deadline")
+            raise DeadlineExceededError(f"deadline passed for {url}")
+        try:
+            res = transport.send(
+                method,
+                url,
+                (min(connect, remaining), min(read, remaining)),
+                **kwargs,
+            )
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            metrics.METRICS.record_error(endpoint, type(exc).__name__)
+            if last or not (idempotent or _connect_failed(exc)):
+                raise
+            LOGGER.debug("Retrying %s after %r", url, exc)
+        else:
+            metrics.METRICS.record_request(
+                endpoint,
+                res.status_code,
+                time.monotonic() - start,
+                res.sent,
+                len(res.content),
+            )
+            if last or not idempotent or res.status_code not in RETRY_STATUSES:
+                return res
+            LOGGER.debug("Retrying %s after status %s", url, res.status_code)
+
+        backoff = RETRY_FACTOR * (2**attempt)
+        if time.monotonic() + backoff >= deadline:
+            metrics.METRICS.record_error(endpoint, "deadline")
+            raise DeadlineExceededError(f"no time left to retry {url}")
+        metrics.METRICS.record_retry(endpoint)
+        time.sleep(backoff)
+    assert False, "unreachable"
+
+
 def set_log_level(level: int):
-    logger = get_wideq_logger()
-    logger.setLevel(level)
+    logging.getLogger("wideq").setLevel(level)
 
 
 def gen_uuid() -> str:
@@ -192,12 +508,8 @@ API_ERRORS = {
 }
 
 
-def lgedm_post(url, data=None, access_token=None, session_id=None):
-    """Make an HTTP request in the format used by the API servers.
-
-    In this format, the request POST data sent as JSON under a special
-    key; authentication sent in headers. Return the JSON data extracted
-    from the response.
+def lgedm_headers(access_token=None, session_id=None) -> Dict[str, str]:
+    """Get the HTTP headers for a request to the API servers.
 
     The `access_token` and `session_id` are required for most normal,
     authenticated requests. They are not required, for example, to load
@@ -212,10 +524,16 @@ def lgedm_post(url, data=None, access_token=None, session_id=None):
         headers["x-thinq-token"] = access_token
     if session_id:
         headers["x-thinq-jsessionId"] = session_id
+    return headers
+
 
-    with retry_session() as session:
-        res = session.post(url, json={DATA_ROOT: data}, headers=headers)
-    out = res.json()[DATA_ROOT]
+def lgedm_unwrap(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the data from an API server's JSON response body.
+
+    Raise an `APIError` (or one of its subclasses) if the response
+    reports an error.
+    """
+    out = body[DATA_ROOT]
 
     # Check for API errors.
     if "returnCd" in out:
@@ -230,6 +548,62 @@ def lgedm_post(url, data=None, access_token=None, session_id=None):
     return out
 
 
+def lgedm_post(
+    url,
+    data=None,
+    access_token=None,
+    session_id=None,
+    http=None,
+    timeout=None,
+    deadline=None,
+    idempotent=False,
+):
+    """Make an HTTP request in the format used by the API servers.
+
+    In this format, the request POST data sent as JSON under a special
+    key; authentication sent in headers (see `lgedm_headers`). Return
+    the JSON data extracted from the response.
+
+    The request is sent over the `Transport` (or Requests session)
+    `http`, or the process-wide `shared_session` if it is not given, and
+    is retried within the `timeout` and `deadline` as described for
+    `request`.
+    Being a POST, it is only retried after failures other than failing
+    to connect if it is marked `idempotent`.
+
+    The request is seen by any `hooks.REQUEST` hooks.
+    """
+    headers = lgedm_headers(access_token, session_id)
+    call = None
+    if hooks.HOOKS[hooks.REQUEST]:
+        call = hooks.start(hooks.REQUEST, metrics.endpoint(url))
+    try:
+        res = request(
+            "POST",
+            url,
+            http,
+            timeout,
+            deadline,
+            idempotent,
+            json={DATA_ROOT: data},
+            headers=headers,
+        )
+        if call is not None:
+            call.size, call.received = res.sent, len(res.content)
+        try:
+            out = lgedm_unwrap(res.json())
+        except APIError as exc:
+            metrics.METRICS.record_error(metrics.endpoint(url), exc.code)
+            raise
+    except Exception as exc:
+        if call is not None:
+            hooks.finish(call, exc)
+        raise
+    if call is not None:
+        hooks.finish(call)
+    return out
+
+
 def oauth_url(auth_base, country, language):
     """Construct the URL for users to log in (in a browser) to start an
     authenticated session.
@@ -260,9 +634,9 @@ def parse_oauth_callback(url):
     return params["access_token"][0], params["refresh_token"][0]
 
 
-def login(api_root, access_token, country, language):
-    """Use an access token to log into the API and obtain a session and
-    return information about the session.
+def login_request(api_root, access_token, country, language):
+    """Build the request to log into the API: return the URL and the
+    data to POST.
     """
 
     url = urljoin(api_root + "/", "member/login")
@@ -272,13 +646,30 @@ def login(api_root, access_token, country, language):
         "loginType": "EMP",
         "token": access_token,
     }
-    return lgedm_post(url, data)
+    return url, data
+
+
+def login(
+    api_root,
+    access_token,
+    country,
+    language,
+    http=None,
+    deadline=None,
+    timeout=None,
+):
+    """Use an access token to log into the API and obtain a session and
+    return information about the session.
+    """
 
+    url, data = login_request(api_root, access_token, country, language)
+    return lgedm_post(url, data, http=http, timeout=timeout, deadline=deadline)
 
-def refresh_auth(oauth_root, refresh_token):
-    """Get a new access_token using a refresh_token.
 
-    May raise a `TokenError`.
+def refresh_auth_request(oauth_root, refresh_token):
+    """Build the signed OAuth request for a new access token.
+
+    Return the URL, the form data, and the headers to POST.
     """
 
     token_url = urljoin(oauth_root, "/oauth2/token")
@@ -301,7 +692,7 @@ def refresh_auth(oauth_root, refresh_token):
     )
     sig = oauth2_signature(
         "{}\n{}".format(req_url, timestamp), OAUTH_SECRET_KEY
-    )
+    ).decode("ascii")
 
     headers = {
         "lgemp-x-app-key": OAUTH_CLIENT_KEY,
@@ -309,16 +700,41 @@ def refresh_auth(oauth_root, refresh_token):
         "lgemp-x-date": timestamp,
         "Accept": "application/json",
     }
+    return token_url, data, headers
+
 
-    with retry_session() as session:
-        res = session.post(token_url, data=data, headers=headers)
-    res_data = res.json()
+def refresh_auth_result(res_data: Dict[str, Any]) -> str:
+    """Extract the new access token from an OAuth token response.
+
+    May raise a `TokenError`.
+    """
 
     if res_data["status"] != 1:
         raise TokenError()
     return res_data["access_token"]
 
 
+def refresh_auth(
+    oauth_root, refresh_token, http=None, deadline=None, timeout=None
+):
+    """Get a new access_token using a refresh_token.
+
+    May raise a `TokenError`.
+    """
+
+    token_url, data, headers = refresh_auth_request(oauth_root, refresh_token)
+    res = request(
+        "POST",
+        token_url,
+        http,
+        timeout,
+        deadline,
+        data=data,
+        headers=headers,
+    )
+    return refresh_auth_result(res.json())
+
+
 class Gateway(object):
     def __init__(self, auth_base, api_root, oauth_root, country, language):
         self.auth_base = auth_base
@@ -328,14 +744,20 @@ class Gateway(object):
         self.language = language
 
     @classmethod
-    def discover(cls, country, language) -> "Gateway":
+    def discover(
+        cls, country, language, http=None, deadline=None, timeout=None
+    ) -> "Gateway":
         """Load information about the hosts to use for API interaction.
 
         `country` and `language` are codes, like "US" and "en-US,"
         respectively.
         """
         gw = lgedm_post(
-            GATEWAY_URL, {"countryCode": country, "langCode": language}
+            GATEWAY_URL,
+            {"countryCode": country, "langCode": language},
+            http=http,
+            timeout=timeout,
+            deadline=deadline,
         )
         return cls(
             gw["empUri"], gw["thinqUri"], gw["oauthUri"], country, language
@@ -365,19 +787,22 @@ class Gateway(object):
 
 
 class Auth(object):
-    def __init__(self, gateway, access_token, refresh_token):
+    def __init__(self, gateway, access_token, refresh_token, http=None):
         self.gateway = gateway
         self.access_token = access_token
         self.refresh_token = refresh_token
+        self.http = http
 
     @classmethod
-    def from_url(cls, gateway, url):
+    def from_url(cls, gateway, url, http=None):
         """Create an authentication using an OAuth callback URL."""
 
         access_token, refresh_token = parse_oauth_callback(url)
-        return cls(gateway, access_token, refresh_token)
+        return cls(gateway, access_token, refresh_token, http)
 
-    def start_session(self) -> Tuple["Session", List[Dict[str, Any]]]:
+    def start_session(
+        self, deadline=None, timeout=None
+    ) -> Tuple["Session", List[Dict[str, Any]]]:
         """Start an API session for the logged-in user. Return the
         Session object and a list of the user's devices.
         """
@@ -387,17 +812,26 @@ class Auth(object):
             self.access_token,
             self.gateway.country,
             self.gateway.language,
+            self.http,
+            deadline,
+            timeout,
         )
         session_id = session_info["jsessionId"]
         return Session(self, session_id), get_list(session_info, "item")
 
-    def refresh(self):
+    def refresh(self, deadline=None, timeout=None):
         """Refresh the authentication, returning a new Auth object."""
 
         new_access_token = refresh_auth(
-            self.gateway.oauth_root, self.refresh_token
+            self.gateway.oauth_root,
+            self.refresh_token,
+            self.http,
+            deadline,
+            timeout,
+        )
+        return Auth(
+            self.gateway, new_access_token, self.refresh_token, self.http
         )
-        return Auth(self.gateway, new_access_token, self.refresh_token)
 
     def serialize(self) -> Dict[str, str]:
         return {
@@ -406,30 +840,167 @@ class Auth(object):
         }
 
 
+#: The endpoint that reports monitoring results, as named in `metrics`.
+MONITOR_ENDPOINT = "rti/rtiResult"
+
+
+def monitor_request(device_id, work_id, cmd_opt):
+    """Build the `rti/rtiMon` request data to start or stop (according
+    to `cmd_opt`) monitoring a device.
+    """
+
+    return {
+        "cmd": "Mon",
+        "cmdOpt": cmd_opt,
+        "deviceId": device_id,
+        "workId": work_id,
+    }
+
+
+def monitor_result(device_id, res) -> Optional[bytes]:
+    """Interpret one entry of an `rti/rtiResult` work list.
+
+    Return a status result, which is a bytestring, or None if the
+    monitoring is not yet ready. May raise a `MonitorError`.
+    """
+
+    # When monitoring first starts, it usually takes a few
+    # iterations before data becomes available. In the initial
+    # "warmup" phase, `returnCode` is missing from the response.
+    if "returnCode" not in res:
+        return None
+
+    # Check for errors.
+    code = res.get("returnCode")  # returnCode can be missing.
+    if code != "0000":
+        metrics.METRICS.record_error(MONITOR_ENDPOINT, code)
+        raise MonitorError(device_id, code)
+
+    # The return data may or may not be present, depending on the
+    # monitoring task status.
+    if "returnData" in res:
+        # The main response payload is base64-encoded binary data in
+        # the `returnData` field. This sometimes contains JSON data
+        # and sometimes other binary data.
+        return base64.b64decode(res["returnData"])
+    else:
+        return None
+
+
+def monitor_results(work_items, res) -> Dict[str, Any]:
+    """Demultiplex the work list of a batched `rti/rtiResult` response.
+
+    `work_items` is the list of `(device_id, work_id)` pairs that were
+    polled. Return a dict mapping each device ID to its status result
+    (as for `monitor_result`) or, if monitoring that device failed, to
+    the `MonitorError` describing the failure.
+    """
+
+    devices = {work_id: device_id for device_id, work_id in work_items}
+    out: Dict[str, Any] = {device_id: None for device_id, _ in work_items}
+    for entry in get_list(res, "workList"):
+        device_id = devices.get(entry.get("workId"), entry.get("deviceId"))
+        if device_id not in out:
+            continue
+        try:
+            out[device_id] = monitor_result(device_id, entry)
+        except MonitorError as exc:
+            out[device_id] = exc
+    return out
+
+
+def control_request(device_id, cmd, cmd_opt, value):
+    """Build the `rti/rtiControl` request data to get or set a device's
+    configuration or controls.
+    """
+
+    return {
+        "cmd": cmd,
+        "cmdOpt": cmd_opt,
+        "value": value,
+        "deviceId": device_id,
+        "workId": gen_uuid(),
+        "data": "",
+    }
+
+
 class Session(object):
-    def __init__(self, auth, session_id) -> None:
-        self.auth = auth
-        self.session_id = session_id
+    def __init__(
+        self,
+        auth,
+        session_id,
+        http=None,
+        timeout: Timeout = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        budget: float = REQUEST_BUDGET,
+    ) -> None:
+        # The `Auth` and session ID, replaced together by
+        # `set_credentials` so that a request never pairs one with the
+        # other's predecessor.
+        self._credentials = (auth, session_id)
+
+        # The `Transport` (or Requests session) to send requests over.
+        # By default, share the one used for authentication.
+        self.http = http or auth.http
+
+        # The timeout for each attempt at a request, and how many
+        # seconds a request may take in all. See `request`.
+        self.timeout = timeout
+        self.budget = budget
+
+        #: Called with the device ID and data of every frame of
+        #: monitoring data polled, if set (as by a `client.Client` with
+        #: a recorder).
+        self.on_frame: Optional[Callable[[str, bytes], None]] = None
+
+    @property
+    def auth(self):
+        return self._credentials[0]
+
+    @property
+    def session_id(self):
+        return self._credentials[1]
+
+    def set_credentials(self, auth, session_id) -> None:
+        """Switch the session to a new `Auth` and session ID, as one
+        change: requests made from other threads use either the old
+        pair or the new one.
+        """
+        self._credentials = (auth, session_id)
 
-    def post(self, path, data=None):
+    def post(self, path, data=None, deadline=None):
         """Make a POST request to the API server.
 
         This is like `lgedm_post`, but it pulls the context for the
-        request from an active Session.
+        request from an active Session. The request must finish by
+        `deadline` (a `time.monotonic()` time), or within the session's
+        `budget` if it is not given.
+
+        Every method that makes a request accepts a `deadline` too.
         """
 
-        url = urljoin(self.auth.gateway.api_root + "/", path)
-        return lgedm_post(url, data, self.auth.access_token, self.session_id)
+        auth, session_id = self._credentials
+        url = urljoin(auth.gateway.api_root + "/", path)
+        if deadline is None:
+            deadline = time.monotonic() + self.budget
+        return lgedm_post(
+            url,
+            data,
+            auth.access_token,
+            session_id,
+            self.http,
+            self.timeout,
+            deadline,
+        )
 
-    def get_devices(self) -> List[Dict[str, Any]]:
+    def get_devices(self, deadline=None) -> List[Dict[str, Any]]:
         """Get a list of devices associated with the user's account.
 
         Return a list of dicts with information about the devices.
         """
 
-        return get_list(self.post("device/deviceList"), "item")
+        return get_list(self.post("device/deviceList", None, deadline), "item")
 
-    def monitor_start(self, device_id):
+    def monitor_start(self, device_id, deadline=None):
         """Begin monitoring a device's status.
 
         Return a "work ID" that can be used to retrieve the result of
@@ -438,16 +1009,12 @@ class Session(object):
 
         res = self.post(
             "rti/rtiMon",
-            {
-                "cmd": "Mon",
-                "cmdOpt": "Start",
-                "deviceId": device_id,
-                "workId": gen_uuid(),
-            },
+            monitor_request(device_id, gen_uuid(), "Start"),
+            deadline,
         )
         return res["workId"]
 
-    def monitor_poll(self, device_id, work_id):
+    def monitor_poll(self, device_id, work_id, deadline=None):
         """Get the result of a monitoring task.
 
         `work_id` is a string ID retrieved from `monitor_start`. Return
@@ -459,43 +1026,45 @@ class Session(object):
         """
 
         work_list = [{"deviceId": device_id, "workId": work_id}]
-        res = self.post("rti/rtiResult", {"workList": work_list})["workList"]
-
-        # When monitoring first starts, it usually takes a few
-        # iterations before data becomes available. In the initial
-        # "warmup" phase, `returnCode` is missing from the response.
-        if "returnCode" not in res:
-            return None
-
-        # Check for errors.
-        code = res.get("returnCode")  # returnCode can be missing.
-        if code != "0000":
-            raise MonitorError(device_id, code)
-
-        # The return data may or may not be present, depending on the
-        # monitoring task status.
-        if "returnData" in res:
-            # The main response payload is base64-encoded binary data in
-            # the `returnData` field. This sometimes contains JSON data
-            # and sometimes other binary data.
-            return base64.b64decode(res["returnData"])
-        else:
-            return None
+        res = self.post("rti/rtiResult", {"workList": work_list}, deadline)
+        data = monitor_result(device_id, res["workList"])
+        if data and self.on_frame is not None:
+            self.on_frame(device_id, data)
+        return data
+
+    def monitor_poll_many(self, work_items, deadline=None) -> Dict[str, Any]:
+        """Get the results of several monitoring tasks in one request.
+
+        `work_items` is a list of `(device_id, work_id)` pairs. Return a
+        dict mapping each device ID to a status result (a bytestring, or
+        None if the monitoring is not yet ready) or to a `MonitorError`
+        if monitoring that device failed. Failures are reported rather
+        than raised so that one broken task does not hide the results
+        for the others.
+        """
 
-    def monitor_stop(self, device_id, work_id):
+        work_list = [
+            {"deviceId": device_id, "workId": work_id}
+            for device_id, work_id in work_items
+        ]
+        res = self.post("rti/rtiResult", {"workList": work_list}, deadline)
+        results = monitor_results(work_items, res)
+        if self.on_frame is not None:
+            for device_id, data in results.items():
+                if isinstance(data, bytes) and data:
+                    self.on_frame(device_id, data)
+        return results
+
+    def monitor_stop(self, device_id, work_id, deadline=None):
         """Stop monitoring a device."""
 
         self.post(
             "rti/rtiMon",
-            {
-                "cmd": "Mon",
-                "cmdOpt": "Stop",
-                "deviceId": device_id,
-                "workId": work_id,
-            },
+            monitor_request(device_id, work_id, "Stop"),
+            deadline,
         )
 
-    def set_device_controls(self, device_id, values):
+    def set_device_controls(self, device_id, values, deadline=None):
         """Control a device's settings.
 
         `values` is a key/value map containing the settings to update.
@@ -503,17 +1072,13 @@ class Session(object):
 
         return self.post(
             "rti/rtiControl",
-            {
-                "cmd": "Control",
-                "cmdOpt": "Set",
-                "value": values,
-                "deviceId": device_id,
-                "workId": gen_uuid(),
-                "data": "",
-            },
+            control_request(device_id, "Control", "Set", values),
+            deadline,
         )
 
-    def get_device_config(self, device_id, key, category="Config"):
+    def get_device_config(
+        self, device_id, key, category="Config", deadline=None
+    ):
         """Get a device configuration option.
 
         The `category` string should probably either be "Config" or
@@ -522,13 +1087,7 @@ class Session(object):
 
         res = self.post(
             "rti/rtiControl",
-            {
-                "cmd": category,
-                "cmdOpt": "Get",
-                "value": key,
-                "deviceId": device_id,
-                "workId": gen_uuid(),
-                "data": "",
-            },
+            control_request(device_id, category, "Get", key),
+            deadline,
         )
         return res["returnData"]
@@ -1,7 +1,7 @@
 import enum
 from typing import Optional
 
-from .client import Device
+from .client import Device, DeviceStatus, status_property
 from .util import lookup_enum, lookup_reference
 
 
@@ -71,37 +71,39 @@ class DishWasherDevice(Device):
             return None
 
         data = self.mon.poll()
-        if data:
-            res = self.model.decode_monitor(data)
-            return DishWasherStatus(self, res)
-        else:
-            return None
+        return self._poll_status(data)
 
+    def _parse_status(self, data: bytes) -> "DishWasherStatus":
+        """Decode raw monitoring data into a `DishWasherStatus`."""
+        return DishWasherStatus(self, self.model.decode_monitor(data))
 
-class DishWasherStatus(object):
+
+class DishWasherStatus(DeviceStatus):
     """Higher-level information about a dishwasher's current status.
 
     :param dishwasher: The DishWasherDevice instance.
     :param data: Binary data from the API.
     """
 
+    __slots__ = ("dishwasher",)
+
     def __init__(self, dishwasher: DishWasherDevice, data: dict):
+        super().__init__(data)
         self.dishwasher = dishwasher
-        self.data = data
 
-    @property
+    @status_property
     def state(self) -> DishWasherState:
         """Get the state of the dishwasher."""
         return DishWasherState(
             lookup_enum("State", self.data, self.dishwasher)
         )
 
-    @property
+    @status_property
     def readable_state(self) -> str:
         """Get a human readable state of the dishwasher."""
         return DISHWASHER_STATE_READABLE[self.state.name]
 
-    @property
+    @status_property
     def process(self) -> Optional[DishWasherProcess]:
         """Get the process of the dishwasher."""
         process = lookup_enum("Process", self.data, self.dishwasher)
@@ -110,7 +112,7 @@ class DishWasherStatus(object):
         else:
             return None
 
-    @property
+    @status_property
     def readable_process(self) -> str:
         """Get a human readable process of the dishwasher."""
         if self.process:
@@ -118,33 +120,33 @@ class DishWasherStatus(object):
         else:
             return ""
 
-    @property
+    @status_property
     def is_on(self) -> bool:
         """Check if the dishwasher is on or not."""
         return self.state != DishWasherState.OFF
 
-    @property
+    @status_property
     def remaining_time(self) -> int:
         """Get the remaining time in minutes."""
         return int(self.data["Remain_Time_H"]) * 60 + int(
             self.data["Remain_Time_M"]
         )
 
-    @property
+    @status_property
     def initial_time(self) -> int:
         """Get the initial time in minutes."""
         return int(self.data["Initial_Time_H"]) * 60 + int(
             self.data["Initial_Time_M"]
         )
 
-    @property
+    @status_property
     def reserve_time(self) -> int:
         """Get the reserve time in minutes."""
         return int(self.data["Reserve_Time_H"]) * 60 + int(
             self.data["Reserve_Time_M"]
         )
 
-    @property
+    @status_property
     def course(self) -> str:
         """Get the current course."""
         course = lookup_reference("Course", self.data, self.dishwasher)
@@ -153,12 +155,12 @@ class DishWasherStatus(object):
         else:
             return course
 
-    @property
+    @status_property
     def smart_course(self) -> str:
         """Get the current smart course."""
         return lookup_reference("SmartCourse", self.data, self.dishwasher)
 
-    @property
+    @status_property
     def error(self) -> str:
         """Get the current error."""
         return lookup_reference("Error", self.data, self.dishwasher)
@@ -1,7 +1,7 @@
 import enum
 from typing import Optional
 
-from .client import Device, _UNKNOWN
+from .client import Device, DeviceStatus, _UNKNOWN, status_property
 from .util import lookup_enum, lookup_reference
 
 
@@ -98,23 +98,25 @@ class DryerDevice(Device):
             return None
 
         data = self.mon.poll()
-        if data:
-            res = self.model.decode_monitor(data)
-            return DryerStatus(self, res)
-        else:
-            return None
+        return self._poll_status(data)
 
+    def _parse_status(self, data: bytes) -> "DryerStatus":
+        """Decode raw monitoring data into a `DryerStatus`."""
+        return DryerStatus(self, self.model.decode_monitor(data))
 
-class DryerStatus(object):
+
+class DryerStatus(DeviceStatus):
     """Higher-level information about a dryer's current status.
 
     :param dryer: The DryerDevice instance.
     :param data: JSON data from the API.
     """
 
+    __slots__ = ("dryer",)
+
     def __init__(self, dryer: DryerDevice, data: dict):
+        super().__init__(data)
         self.dryer = dryer
-        self.data = data
 
     def get_bit(self, key: str, index: int) -> str:
         bit_value = int(self.data[key])
@@ -125,61 +127,61 @@ class DryerStatus(object):
         else:
             return "ON"
 
-    @property
+    @status_property
     def state(self) -> DryerState:
         """Get the state of the dryer."""
         return DryerState(lookup_enum("State", self.data, self.dryer))
 
-    @property
+    @status_property
     def previous_state(self) -> DryerState:
         """Get the previous state of the dryer."""
         return DryerState(lookup_enum("PreState", self.data, self.dryer))
 
-    @property
+    @status_property
     def dry_level(self) -> DryLevel:
         """Get the dry level."""
         return DryLevel(lookup_enum("DryLevel", self.data, self.dryer))
 
-    @property
+    @status_property
     def temperature_control(self) -> TempControl:
         """Get the temperature control setting."""
         return TempControl(lookup_enum("TempControl", self.data, self.dryer))
 
-    @property
+    @status_property
     def time_dry(self) -> TimeDry:
         """Get the time dry setting."""
         return TimeDry(lookup_enum("TimeDry", self.data, self.dryer))
 
-    @property
+    @status_property
     def is_on(self) -> bool:
         """Check if the dryer is on or not."""
         return self.state != DryerState.OFF
 
-    @property
+    @status_property
     def remaining_time(self) -> int:
         """Get the remaining time in minutes."""
         return int(self.data["Remain_Time_H"]) * 60 + int(
             self.data["Remain_Time_M"]
         )
 
-    @property
+    @status_property
     def initial_time(self) -> int:
         """Get the initial time in minutes."""
         return int(self.data["Initial_Time_H"]) * 60 + int(
             self.data["Initial_Time_M"]
         )
 
-    @property
+    @status_property
     def course(self) -> str:
         """Get the current course."""
         return lookup_reference("Course", self.data, self.dryer)
 
-    @property
+    @status_property
     def smart_course(self) -> str:
         """Get the current smart course."""
         return lookup_reference("SmartCourse", self.data, self.dryer)
 
-    @property
+    @status_property
     def error(self) -> str:
         """Get the current error."""
         return lookup_reference("Error", self.data, self.dryer)
@@ -0,0 +1,419 @@
+"""A local stand-in for the LG SmartThinQ servers, for tests and
+benchmarks that should not touch the real cloud.
+
+A `FakeServer` implements the endpoints that `core` uses: gateway
+discovery, OAuth token refresh, login, the device list, monitoring
+(`rti/rtiMon` and `rti/rtiResult`) and controls (`rti/rtiControl`), all
+in the `lgedmRoot` envelope. It also serves the model info for its
+simulated devices. Latency and errors can be injected.
+
+The server can be used in-process without sockets, by passing
+`FakeServer.handle` to a `core.MemoryTransport` (as the clients from
+`FakeServer.client` do by default); over HTTP on a
+background thread, with `FakeServer.serve`; or as a subprocess::
+
+    python -m wideq.fakeserver --port 8080 devices.json
+
+which prints the server's base URL and then serves until killed. The
+JSON file has a "devices" list, each entry giving the `FakeDevice`
+arguments (with `model_info` either inline or as a file name).
+
+Requests are dispatched on their path only, so in-process, requests
+sent to the real servers' URLs (such as `core.GATEWAY_URL`) work too.
+"""
+import argparse
+import base64
+import json
+import socketserver
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from . import core
+from .client import Client
+
+
+#: The base URL the server reports before it is serving over HTTP.
+DEFAULT_BASE_URL = "https://fake.lgthinq.invalid"
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeDevice(object):
+    """A simulated device.
+
+    `status` holds the device's current status, which is sent as JSON,
+    or for models with binary monitoring, encoded according to the
+    model's protocol from integer field values. Monitoring produces no
+    data for the first `warmup` polls of each monitoring task.
+    """
+
+    def __init__(
+        self,
+        device_id: str,
+        device_type: int,
+        model_info: Dict[str, Any],
+        alias: Optional[str] = None,
+        status: Optional[Dict[str, Any]] = None,
+        configs: Optional[Dict[str, Any]] = None,
+        warmup: int = 1,
+    ) -> None:
+        self.device_id = device_id
+        self.device_type = device_type
+        self.model_info = model_info
+        self.alias = alias or device_id
+        self.status = status or {}
+        self.configs = configs or {}
+        self.warmup = warmup
+
+    @property
+    def model_name(self) -> str:
+        return self.model_info.get("Info", {}).get("modelName", "FAKE")
+
+    def info(self, base_url: str) -> Dict[str, Any]:
+        """Get the device's entry in the device list."""
+        return {
+            "deviceId": self.device_id,
+            "alias": self.alias,
+            "deviceType": self.device_type,
+            "modelNm": self.model_name,
+            "modelJsonUrl": "{}/model/{}.json".format(
+                base_url, self.device_id
+            ),
+        }
+
+    def frame(self) -> bytes:
+        """Encode the current status as monitoring data."""
+        monitoring = self.model_info.get("Monitoring", {})
+        if monitoring.get("type") != "BINARY(BYTE)":
+            return json.dumps(self.status).encode("utf8")
+
+        protocol = monitoring["protocol"]
+        size = max(item["startByte"] + item["length"] for item in protocol)
+        frame = bytearray(size)
+        for item in protocol:
+            value = int(self.status.get(item["value"], 0))
+            start, length = item["startByte"], item["length"]
+            frame[start : start + length] = value.to_bytes(length, "big")
+        return bytes(frame)
+
+
+class FakeServer(object):
+    """A fake SmartThinQ server for a set of simulated devices.
+
+    :param devices: The devices on the fake user's account.
+    :param latency: Seconds to wait before answering each request.
+    """
+
+    def __init__(
+        self, devices: List[FakeDevice], latency: float = 0.0
+    ) -> None:
+        self.devices = {device.device_id: device for device in devices}
+        self.latency = latency
+        self.base_url = DEFAULT_BASE_URL
+
+        #: A valid access token, and the refresh token that the OAuth
+        #: endpoint accepts to issue more.
+        self.access_token = "fake-access-token"
+        self.refresh_token = "fake-refresh-token"
+        self.access_tokens = {self.access_token}
+        self.sessions: Set[str] = set()
+
+        # Monitoring tasks: work ID to device ID and polls so far.
+        self._work: Dict[str, Tuple[str, int]] = {}
+
+        # Injected failures: endpoint path to a list of (HTTP status,
+        # return code) pairs, used up one per request; and device ID to
+        # a list of monitoring return codes.
+        self._failures: Dict[str, List[Tuple[int, Any]]] = {}
+        self._monitor_failures: Dict[str, List[str]] = {}
+
+        #: The number of requests answered, by path.
+        self.requests: Dict[str, int] = {}
+
+        self._lock = threading.Lock()
+        self._httpd: Optional[_ThreadingHTTPServer] = None
+
+    def gateway(self) -> core.Gateway:
+        """Get a Gateway pointing at this server."""
+        return core.Gateway(
+            self.base_url,
+            self.base_url + "/api",
+            self.base_url,
+            core.DEFAULT_COUNTRY,
+            core.DEFAULT_LANGUAGE,
+        )
+
+    def client(
+        self, transport: Optional[core.Transport] = None, **kwargs
+    ) -> Client:
+        """Get a `client.Client` logged in to this server.
+
+        Requests are sent over `transport`, in memory by default. Other
+        keyword arguments are passed to `Client`; pass `gateway=None`
+        to have the client discover the gateway itself.
+        """
+        transport = transport or core.MemoryTransport(self.handle)
+        gateway = self.gateway()
+        auth = core.Auth(
+            gateway, self.access_token, self.refresh_token, transport
+        )
+        kwargs.setdefault("gateway", gateway)
+        return Client(auth=auth, transport=transport, **kwargs)
+
+    def fail(
+        self,
+        path: str,
+        code: Any = None,
+        status: int = 200,
+        count: int = 1,
+    ) -> None:
+        """Make the next `count` requests to an endpoint (such as
+        "/api/rti/rtiControl") fail with an API return code, such as
+        "0102" or 9000, or if `code` is None, with an HTTP `status`.
+        """
+        with self._lock:
+            self._failures.setdefault(path, []).extend(
+                [(status, code)] * count
+            )
+
+    def fail_monitor(
+        self, device_id: str, code: str = "0106", count: int = 1
+    ) -> None:
+        """Make the next `count` polls of a device's monitoring task
+        report an error code.
+        """
+        with self._lock:
+            self._monitor_failures.setdefault(device_id, []).extend(
+                [code] * count
+            )
+
+    def handle(
+        self, method: str, url: str, headers: Dict[str, str], body: Any
+    ) -> Tuple[int, Any]:
+        """Answer a request, returning the HTTP status and the JSON
+        response data.
+
+        This has the signature of a `core.MemoryTransport` handler.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = urlparse(url).path
+        headers = {k.lower(): v for k, v in headers.items()}
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            failures = self._failures.get(path)
+            if failures:
+                status, code = failures.pop(0)
+                if code is None:
+                    return status, {}
+                return status, self._error(code)
+            return self._route(method, path, headers, body)
+
+    def _route(self, method, path, headers, body) -> Tuple[int, Any]:
+        if path.startswith("/model/"):
+            device_id = path[len("/model/") : -len(".json")]
+            if device_id not in self.devices:
+                return 404, {}
+            return 200, self.devices[device_id].model_info
+
+        if path == "/oauth2/token":
+            return 200, self._refresh(body or {})
+
+        data: Dict[str, Any] = (body or {}).get(core.DATA_ROOT) or {}
+        if path == "/api/common/gatewayUriList":
+            return 200, self._ok(
+                {
+                    "empUri": self.base_url,
+                    "thinqUri": self.base_url + "/api",
+                    "oauthUri": self.base_url,
+                    "countryCode": data["countryCode"],
+                    "langCode": data["langCode"],
+                }
+            )
+        if path == "/api/member/login":
+            if data["token"] not in self.access_tokens:
+                return 200, self._error("0102", "invalid token")
+            session_id = uuid.uuid4().hex
+            self.sessions.add(session_id)
+            return 200, self._ok(
+                {"jsessionId": session_id, "item": self._device_list()}
+            )
+
+        if headers.get("x-thinq-token") not in self.access_tokens or (
+            headers.get("x-thinq-jsessionid") not in self.sessions
+        ):
+            return 200, self._error("0102", "not logged in")
+
+        if path == "/api/device/deviceList":
+            return 200, self._ok({"item": self._device_list()})
+        if path == "/api/rti/rtiMon":
+            return 200, self._monitor(data)
+        if path == "/api/rti/rtiResult":
+            return 200, self._results(data)
+        if path == "/api/rti/rtiControl":
+            return 200, self._control(data)
+        return 404, {}
+
+    def _ok(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {core.DATA_ROOT: dict(data, returnCd="0000")}
+
+    def _error(self, code: Any, message: str = "error") -> Dict[str, Any]:
+        return {core.DATA_ROOT: {"returnCd": code, "returnMsg": message}}
+
+    def _device_list(self) -> List[Dict[str, Any]]:
+        return [d.info(self.base_url) for d in self.devices.values()]
+
+    def _refresh(self, form: Dict[str, str]) -> Dict[str, Any]:
+        if form.get("refresh_token") != self.refresh_token:
+            return {"status": 0}
+        access_token = uuid.uuid4().hex
+        self.access_tokens.add(access_token)
+        return {"status": 1, "access_token": access_token}
+
+    def _monitor(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        device_id = data["deviceId"]
+        if device_id not in self.devices:
+            return self._error("0106", "not connected")
+        if data["cmdOpt"] == "Start":
+            self._work[data["workId"]] = (device_id, 0)
+        else:
+            self._work.pop(data["workId"], None)
+        return self._ok({"workId": data["workId"]})
+
+    def _results(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        entries = [
+            self._result(item) for item in core.get_list(data, "workList")
+        ]
+        return self._ok(
+            {"workList": entries[0] if len(entries) == 1 else entries}
+        )
+
+    def _result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        device_id, work_id = item["deviceId"], item["workId"]
+        entry = {"deviceId": device_id, "workId": work_id}
+        if work_id not in self._work:
+            return dict(entry, returnCode="0106")
+
+        failures = self._monitor_failures.get(device_id)
+        if failures:
+            return dict(entry, returnCode=failures.pop(0))
+
+        device = self.devices[device_id]
+        _, polls = self._work[work_id]
+        self._work[work_id] = (device_id, polls + 1)
+        if polls < device.warmup:
+            return entry
+        frame = base64.b64encode(device.frame()).decode("ascii")
+        return dict(entry, returnCode="0000", returnData=frame)
+
+    def _control(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        device = self.devices.get(data["deviceId"])
+        if device is None:
+            return self._error("0106", "not connected")
+        if data["cmdOpt"] == "Set":
+            if isinstance(data["value"], dict):
+                device.status.update(data["value"])
+            return self._ok({"workId": data["workId"]})
+        value = device.configs.get(data["value"])
+        if value is None:
+            return self._error("0100", "unsupported")
+        return self._ok({"workId": data["workId"], "returnData": value})
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving over HTTP on a background thread, and return
+        the base URL. A `port` of 0 picks a free port.
+        """
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self._answer()
+
+            def do_POST(self):
+                self._answer()
+
+            def _answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length).decode("utf8")
+                if not raw:
+                    body = None
+                elif "json" in self.headers.get("Content-Type", ""):
+                    body = json.loads(raw)
+                else:
+                    body = {k: v[0] for k, v in parse_qs(raw).items()}
+                status, res = server.handle(
+                    self.command, self.path, dict(self.headers), body
+                )
+                payload = json.dumps(res).encode("utf8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = _ThreadingHTTPServer((host, port), Handler)
+        self.base_url = "http://{}:{}".format(*self._httpd.server_address)
+        thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="wideq-fake-server",
+            daemon=True,
+        )
+        thread.start()
+        return self.base_url
+
+    def shutdown(self) -> None:
+        """Stop serving over HTTP."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+
+def load_devices(path: str) -> List[FakeDevice]:
+    """Load simulated devices from a JSON configuration file."""
+    with open(path) as f:
+        config = json.load(f)
+    devices = []
+    for spec in config["devices"]:
+        if isinstance(spec.get("model_info"), str):
+            with open(spec["model_info"]) as f:
+                spec = dict(spec, model_info=json.load(f))
+        devices.append(FakeDevice(**spec))
+    return devices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run a fake SmartThinQ server."
+    )
+    parser.add_argument("config", help="JSON file describing the devices")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds to wait before answering each request",
+    )
+    args = parser.parse_args()
+
+    server = FakeServer(load_devices(args.config), args.latency)
+    print(server.serve(args.host, args.port), flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""A compact on-disk history of device status.
+
+A `HistoryStore` keeps the monitoring data polled from each device in a
+directory of its own, as a series of segment files. Each segment starts
+with a header naming its columns (the fields of the model's status
+data) and its start time, followed by fixed-size records: the time, as
+milliseconds since the segment started, then the raw value of each
+field. Fixed-size records make a segment cheap to append to and let
+reads memory-map it and binary search it by time.
+
+Binary status data is stored as the integers of its
+`Monitoring.protocol` fields, at their own widths. JSON status data is
+stored as floats; values that are not numbers are stored as NaN.
+
+A new segment is started when the columns change, when the current one
+is too old or too large, or when a process finds that the last record
+of the current one was not completely written.
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import quote, unquote
+
+from .client import DeviceInfo, ModelInfo
+
+
+#: The start of every segment file, and the version of their format.
+MAGIC = b"WIDEQHS1"
+#: The length of a segment's JSON header, after `MAGIC`.
+HEADER_LENGTH = struct.Struct("<I")
+SEGMENT_SUFFIX = ".seg"
+
+#: The longest time, in seconds, covered by one segment.
+SEGMENT_SECONDS = 7 * 24 * 3600
+#: The largest size, in bytes, of one segment.
+SEGMENT_BYTES = 16 * 1024 * 1024
+
+#: Struct format characters for unsigned integers of up to each size.
+_INT_FORMATS = ((1, "B"), (2, "H"), (4, "I"), (8, "Q"))
+
+Column = Tuple[str, str]  # The field name and its struct format.
+
+
+def _int_format(length: int) -> Optional[str]:
+    for size, fmt in _INT_FORMATS:
+        if length <= size:
+            return fmt
+    return None
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _columns(model: ModelInfo, status: Dict[str, Any]) -> List[Column]:
+    """Get the columns for a model's decoded status data."""
+    if model.binary_monitor_data:
+        protocol = model.binary_protocol
+        columns = []
+        for key, (start, end) in zip(protocol.keys, protocol.slices):
+            fmt = _int_format(end - start)
+            if fmt is not None:
+                columns.append((key, fmt))
+        return columns
+    return [(key, "d") for key in sorted(status)]
+
+
+def _record_struct(columns: Sequence[Column]) -> struct.Struct:
+    return struct.Struct("<I" + "".join(fmt for _, fmt in columns))
+
+
+class _Segment(object):
+    """A segment file and its layout."""
+
+    def __init__(
+        self, path: str, start: int, columns: List[Column], data_start: int
+    ) -> None:
+        self.path = path
+        self.start = start  # In milliseconds since the epoch.
+        self.columns = columns
+        self.record = _record_struct(columns)
+        self.data_start = data_start
+
+    @classmethod
+    def create(
+        cls, path: str, device_id: str, start: int, columns: List[Column]
+    ) -> "_Segment":
+        header = json.dumps(
+            {"device_id": device_id, "start": start, "columns": columns}
+        ).encode("utf8")
+        head = MAGIC + HEADER_LENGTH.pack(len(header)) + header
+        # Write the header atomically, so that every segment has one.
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(head)
+        os.replace(tmp, path)
+        return cls(path, start, columns, len(head))
+
+    @classmethod
+    def open(cls, path: str) -> "_Segment":
+        with open(path, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError("not a history segment: " + path)
+            (length,) = HEADER_LENGTH.unpack(f.read(HEADER_LENGTH.size))
+            header = json.loads(f.read(length).decode("utf8"))
+            columns = [(name, fmt) for name, fmt in header["columns"]]
+            return cls(path, header["start"], columns, f.tell())
+
+    def records(
+        self, start: Optional[int], end: Optional[int]
+    ) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+        """Read the records between two times (in milliseconds since the
+        epoch, inclusive), as pairs of the time and the values.
+        """
+        record = self.record
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                count = (len(mm) - self.data_start) // record.size
+
+                def offset(index):
+                    pos = self.data_start + index * record.size
+                    return HEADER_LENGTH.unpack_from(mm, pos)[0]
+
+                # Find the first record at or after the start.
+                lo, hi = 0, count
+                if start is not None:
+                    target = start - self.start
+                    while lo < hi:
+                        mid = (lo + hi) // 2
+                        if offset(mid) < target:
+                            lo = mid + 1
+                        else:
+                            hi = mid
+                for index in range(lo, count):
+                    values = record.unpack_from(
+                        mm, self.data_start + index * record.size
+                    )
+                    at = self.start + values[0]
+                    if end is not None and at > end:
+                        return
+                    yield at, values[1:]
+
+
+class HistoryStore(object):
+    """A directory of per-device status history.
+
+    Store frames of monitoring data with `append`, or with `record`,
+    which looks up each device's model with the `model_info` function
+    (such as a client's `Client.model_info`). With that, a store can be
+    used as a client's `recorder`, to keep the history of every frame
+    its devices poll. Read the history back with `query`.
+
+    A store may be shared between threads, but only one process should
+    write to a directory at a time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        model_info: Optional[Callable[[DeviceInfo], ModelInfo]] = None,
+        segment_seconds: float = SEGMENT_SECONDS,
+        segment_bytes: int = SEGMENT_BYTES,
+    ) -> None:
+        if segment_seconds * 1000 > 0xFFFFFFFF:
+            raise ValueError("segments can cover at most 49 days")
+        self.path = path
+        self._model_info = model_info
+        self._segment_ms = int(segment_seconds * 1000)
+        self._segment_bytes = segment_bytes
+        os.makedirs(self.path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # The segment being written for each device, with its size and
+        # the time of its last record, in milliseconds since it started.
+        self._writers: Dict[str, Tuple[_Segment, int, int]] = {}
+
+    def _device_dir(self, device_id: str) -> str:
+        return os.path.join(self.path, quote(device_id, safe=""))
+
+    def _segments(self, device_id: str) -> List[str]:
+        """List the paths of a device's segments, oldest first."""
+        directory = self._device_dir(device_id)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(directory, name)
+            for name in sorted(names)
+            if name.endswith(SEGMENT_SUFFIX)
+        ]
+
+    def _resume(self, device_id: str) -> Optional[Tuple[_Segment, int, int]]:
+        """Pick up the last segment written for a device, if it can be
+        appended to.
+        """
+        paths = self._segments(device_id)
+        if not paths:
+            return None
+        segment = _Segment.open(paths[-1])
+        size = os.path.getsize(segment.path)
+        data_size = size - segment.data_start
+        if data_size % segment.record.size:
+            return None  # Its last record was cut short.
+        last = 0
+        if data_size:
+            with open(segment.path, "rb") as f:
+                f.seek(size - segment.record.size)
+                (last,) = HEADER_LENGTH.unpack(f.read(HEADER_LENGTH.size))
+        return segment, size, last
+
+    def _writer(
+        self, device_id: str, columns: List[Column], now: int
+    ) -> Tuple[_Segment, int, int]:
+        """Get the segment to append a record to, starting a new one if
+        necessary.
+        """
+        writer = self._writers.get(device_id)
+        if writer is None:
+            writer = self._resume(device_id)
+        if writer is not None:
+            segment, size, last = writer
+            if (
+                segment.columns == columns
+                and segment.start <= now < segment.start + self._segment_ms
+                and size + segment.record.size <= self._segment_bytes
+            ):
+                return writer
+
+        directory = self._device_dir(device_id)
+        os.makedirs(directory, exist_ok=True)
+        # Segments sort by name in time order. Keep them in order even
+        # if the clock goes backwards.
+        if writer is not None:
+            now = max(now, writer[0].start + writer[2] + 1)
+        path = os.path.join(directory, "{:016d}{}".format(now, SEGMENT_SUFFIX))
+        segment = _Segment.create(path, device_id, now, columns)
+        return segment, segment.data_start, 0
+
+    def append(
+        self,
+        device_id: str,
+        model: ModelInfo,
+        data: bytes,
+        at: Optional[float] = None,
+    ) -> None:
+        """Store a frame of monitoring data from a device, polled at
+        the current time unless `at` (a Unix time) is given.
+
+        Times are stored to the millisecond. A frame stored with an
+        earlier time than the one before it is stored with that time.
+        """
+        status = model.decode_monitor(data, raw=True)
+        columns = _columns(model, status)
+        if model.binary_monitor_data:
+            values = [status[name] for name, _ in columns]
+        else:
+            values = [_float(status[name]) for name, _ in columns]
+        now = int((time.time() if at is None else at) * 1000)
+
+        with self._lock:
+            segment, size, last = self._writer(device_id, columns, now)
+            offset = max(now - segment.start, last)
+            with open(segment.path, "ab") as f:
+                f.write(segment.record.pack(offset, *values))
+            self._writers[device_id] = (
+                segment,
+                size + segment.record.size,
+                offset,
+            )
+
+    def record(
+        self, device: DeviceInfo, data: bytes, at: Optional[float] = None
+    ) -> None:
+        """Store a frame of monitoring data from a device, looking up
+        its model with the store's `model_info` function.
+        """
+        if self._model_info is None:
+            raise TypeError("HistoryStore.record needs a model_info function")
+        self.append(device.id, self._model_info(device), data, at)
+
+    def devices(self) -> List[str]:
+        """List the IDs of the devices with stored history."""
+        return sorted(unquote(name) for name in os.listdir(self.path))
+
+    def query(
+        self,
+        device_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Read a device's history between two Unix times (inclusive),
+        oldest first, as pairs of the time and a dict of the stored
+        fields (or just those in `fields`) and their values.
+        """
+        start_ms = None if start is None else int(start * 1000)
+        end_ms = None if end is None else int(end * 1000)
+        paths = self._segments(device_id)
+        starts = [
+            int(os.path.basename(path)[: -len(SEGMENT_SUFFIX)])
+            for path in paths
+        ]
+        for i, path in enumerate(paths):
+            # Skip segments wholly before the start or after the end.
+            if end_ms is not None and starts[i] > end_ms:
+                break
+            if (
+                start_ms is not None
+                and i + 1 < len(paths)
+                and starts[i + 1] <= start_ms
+            ):
+                continue
+
+            segment = _Segment.open(path)
+            names = [name for name, _ in segment.columns]
+            if fields is None:
+                picked = list(enumerate(names))
+            else:
+                picked = [(names.index(f), f) for f in fields if f in names]
+            for at, values in segment.records(start_ms, end_ms):
+                yield at / 1000, {name: values[i] for i, name in picked}
+
+    def prune(self, before: float) -> int:
+        """Delete the segments that hold only history from before a Unix
+        time. Return how many were deleted.
+        """
+        before_ms = int(before * 1000)
+        deleted = 0
+        with self._lock:
+            for device_id in self.devices():
+                paths = self._segments(device_id)
+                # A segment ends where the next one starts. The last one
+                # may still be written to, so it is kept.
+                for path, following in zip(paths, paths[1:]):
+                    name = os.path.basename(following)
+                    if int(name[: -len(SEGMENT_SUFFIX)]) > before_ms:
+                        break
+                    os.remove(path)
+                    deleted += 1
+        return deleted
@@ -0,0 +1,125 @@
+"""Hooks for tracing, profiling and logging API activity.
+
+A hook is a pair of callables run before and after each call of a
+given kind:
+
+* `REQUEST`: every API request made with `core.lgedm_post` (and so by
+  `core.Session.post`), and its asyncio equivalent. The name is the
+  endpoint, such as "rti/rtiResult" (see `metrics.endpoint`).
+* `POLL`: every poll of a `client.Monitor` (or `aio.AsyncMonitor`),
+  named by device ID.
+* `DECODE`: every frame decoded by `client.ModelInfo.decode_monitor`,
+  named by model name.
+
+Both callables get the same `Call` object, which describes the call and
+its outcome, and has a `context` dict for the hooks' own use, such as
+holding a tracing span. For example::
+
+    def before(call):
+        call.context["span"] = tracer.start_span(call.name)
+
+    def after(call):
+        call.context["span"].finish()
+
+    hooks.register(hooks.REQUEST, before, after)
+
+Instrumented code checks for registered hooks before doing anything
+else, so hooks cost nothing when none are registered. Exceptions raised
+by hooks are logged and otherwise ignored.
+"""
+import logging
+import time
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional
+
+
+LOGGER = logging.getLogger("wideq.hooks")
+
+REQUEST = "request"
+POLL = "poll"
+DECODE = "decode"
+
+Hook = namedtuple("Hook", ["before", "after"])
+
+#: The registered hooks for each kind of call. The lists are replaced
+#: rather than modified, so they can be read without locking.
+HOOKS: Dict[str, List[Hook]] = {REQUEST: [], POLL: [], DECODE: []}
+
+
+class Call(object):
+    """One call seen by hooks.
+
+    Before the call, `kind`, `name` and possibly `size` are set. After
+    it, so are `seconds` and `outcome`: "ok", or "error" (with the
+    exception in `error`), or for polls, "warmup" if there was no data
+    yet and "restarted" if the monitoring task failed and was
+    restarted. `size` is the number of bytes sent (for requests) or
+    received (for polls and decoding), and `received` is the number of
+    bytes received for requests.
+    """
+
+    def __init__(
+        self, kind: str, name: str, size: Optional[int] = None
+    ) -> None:
+        self.kind = kind
+        self.name = name
+        self.size = size
+        self.received: Optional[int] = None
+        self.seconds: Optional[float] = None
+        self.outcome = "ok"
+        self.error: Optional[BaseException] = None
+        self.context: Dict[str, Any] = {}
+
+        self._hooks = HOOKS[kind]
+        self._started = 0.0
+
+
+def register(
+    kind: str,
+    before: Optional[Callable[[Call], None]] = None,
+    after: Optional[Callable[[Call], None]] = None,
+) -> Hook:
+    """Run `before` and `after` around every call of a kind. Return the
+    hook, for use with `unregister`.
+    """
+    hook = Hook(before, after)
+    HOOKS[kind] = HOOKS[kind] + [hook]
+    return hook
+
+
+def unregister(kind: str, hook: Hook) -> None:
+    """Stop running a hook."""
+    HOOKS[kind] = [h for h in HOOKS[kind] if h is not hook]
+
+
+def _run(fn: Optional[Callable[[Call], None]], call: Call) -> None:
+    if fn is None:
+        return
+    try:
+        fn(call)
+    except Exception:
+        LOGGER.exception("Hook %r failed for %s %s", fn, call.kind, call.name)
+
+
+def start(kind: str, name: str, size: Optional[int] = None) -> Call:
+    """Run the `before` hooks for a call that is about to start.
+
+    Callers should check that `HOOKS[kind]` is not empty first.
+    """
+    call = Call(kind, name, size)
+    for hook in call._hooks:
+        _run(hook.before, call)
+    call._started = time.perf_counter()
+    return call
+
+
+def finish(call: Call, error: Optional[BaseException] = None) -> None:
+    """Run the `after` hooks for a call that has finished, or that
+    failed with `error`.
+    """
+    call.seconds = time.perf_counter() - call._started
+    if error is not None:
+        call.outcome = "error"
+        call.error = error
+    for hook in reversed(call._hooks):
+        _run(hook.after, call)
@@ -0,0 +1,234 @@
+"""Counters and latency histograms for API requests.
+
+The core layer records every request in the process-wide `METRICS`
+registry: counts by endpoint and HTTP status, API errors by return
+code, retries, latency, and bytes sent and received, plus how long
+monitoring tasks take to warm up. Read them with `Metrics.snapshot`, or
+export them for Prometheus with `Metrics.prometheus`.
+
+Endpoints are named by the last two parts of the request path, such as
+"rti/rtiResult" or "member/login".
+"""
+import bisect
+import functools
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+from urllib.parse import urlparse
+
+
+#: Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+#: Upper bounds, in seconds, of the monitor warmup histogram buckets.
+WARMUP_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+@functools.lru_cache(maxsize=256)
+def endpoint(url: str) -> str:
+    """Get the endpoint name for a request URL."""
+    parts = [part for part in urlparse(url).path.split("/") if part]
+    return "/".join(parts[-2:])
+
+
+class Histogram(object):
+    """Counts of observed values in buckets with fixed upper bounds."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # The last is +Inf.
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Get the cumulative count for each bucket's upper bound, as
+        pairs of the bound (formatted as Prometheus does) and the count.
+        """
+        out = []
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            out.append(
+                ("+Inf" if bound == float("inf") else repr(bound), total)
+            )
+        return out
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class Metrics(object):
+    """A thread-safe registry of request metrics."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every metric."""
+        with self._lock:
+            self.requests: Dict[Tuple[str, int], int] = {}
+            self.errors: Dict[Tuple[str, str], int] = {}
+            self.retries: Dict[str, int] = {}
+            self.bytes_sent: Dict[str, int] = {}
+            self.bytes_received: Dict[str, int] = {}
+            self.latency: Dict[str, Histogram] = {}
+            self.warmup = Histogram(WARMUP_BUCKETS)
+
+    def record_request(
+        self,
+        endpoint: str,
+        status: int,
+        seconds: float,
+        sent: int,
+        received: int,
+    ) -> None:
+        """Record an HTTP request that got a response."""
+        with self._lock:
+            key = (endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes_sent[endpoint] = self.bytes_sent.get(endpoint, 0) + sent
+            self.bytes_received[endpoint] = (
+                self.bytes_received.get(endpoint, 0) + received
+            )
+            try:
+                histogram = self.latency[endpoint]
+            except KeyError:
+                histogram = self.latency[endpoint] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def record_error(self, endpoint: str, code: Any) -> None:
+        """Record a failed request: an API return code, a monitoring
+        error code, or the name of a connection error.
+        """
+        with self._lock:
+            key = (endpoint, str(code))
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def record_retry(self, endpoint: str) -> None:
+        with self._lock:
+            self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+
+    def record_warmup(self, seconds: float) -> None:
+        """Record how long a monitoring task took to produce data."""
+        with self._lock:
+            self.warmup.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of every metric as plain, JSON-serializable data."""
+        with self._lock:
+            requests: Dict[str, Dict[str, int]] = {}
+            for (name, status), count in self.requests.items():
+                requests.setdefault(name, {})[str(status)] = count
+            errors: Dict[str, Dict[str, int]] = {}
+            for (name, code), count in self.errors.items():
+                errors.setdefault(name, {})[code] = count
+            return {
+                "requests": requests,
+                "errors": errors,
+                "retries": dict(self.retries),
+                "bytes_sent": dict(self.bytes_sent),
+                "bytes_received": dict(self.bytes_received),
+                "latency": {
+                    name: histogram.snapshot()
+                    for name, histogram in self.latency.items()
+                },
+                "monitor_warmup": self.warmup.snapshot(),
+            }
+
+    def prometheus(self) -> str:
+        """Export every metric in the Prometheus text format."""
+        lines: List[str] = []
+
+        def family(name, kind, doc):
+            lines.append("# HELP {} {}".format(name, doc))
+            lines.append("# TYPE {} {}".format(name, kind))
+
+        def sample(name, labels, value):
+            if labels:
+                name += "{{{}}}".format(
+                    ",".join('{}="{}"'.format(k, v) for k, v in labels.items())
+                )
+            lines.append("{} {}".format(name, value))
+
+        def histogram(name, labels, hist):
+            for bound, count in hist.cumulative():
+                sample(name + "_bucket", dict(labels, le=bound), count)
+            sample(name + "_sum", labels, hist.sum)
+            sample(name + "_count", labels, hist.count)
+
+        with self._lock:
+            family(
+                "wideq_requests_total",
+                "counter",
+                "API requests, by endpoint and HTTP status.",
+            )
+            for (name, status), count in sorted(self.requests.items()):
+                sample(
+                    "wideq_requests_total",
+                    {"endpoint": name, "status": status},
+                    count,
+                )
+
+            family(
+                "wideq_request_errors_total",
+                "counter",
+                "Failed API requests, by endpoint and error code.",
+            )
+            for (name, code), count in sorted(self.errors.items()):
+                sample(
+                    "wideq_request_errors_total",
+                    {"endpoint": name, "code": code},
+                    count,
+                )
+
+            for metric, counts, doc in (
+                (
+                    "wideq_request_retries_total",
+                    self.retries,
+                    "Retried API requests, by endpoint.",
+                ),
+                (
+                    "wideq_request_sent_bytes_total",
+                    self.bytes_sent,
+                    "Bytes of request bodies sent, by endpoint.",
+                ),
+                (
+                    "wideq_response_received_bytes_total",
+                    self.bytes_received,
+                    "Bytes of response bodies received, by endpoint.",
+                ),
+            ):
+                family(metric, "counter", doc)
+                for name, count in sorted(counts.items()):
+                    sample(metric, {"endpoint": name}, count)
+
+            family(
+                "wideq_request_duration_seconds",
+                "histogram",
+                "API request latency, by endpoint.",
+            )
+            for name, hist in sorted(self.latency.items()):
+                histogram(
+                    "wideq_request_duration_seconds", {"endpoint": name}, hist
+                )
+
+            family(
+                "wideq_monitor_warmup_seconds",
+                "histogram",
+                "Time from starting a monitoring task to its first data.",
+            )
+            histogram("wideq_monitor_warmup_seconds", {}, self.warmup)
+
+        return "\n".join(lines) + "\n"
+
+
+#: The process-wide registry that the core layer records to.
+METRICS = Metrics()
@@ -0,0 +1,192 @@
+"""Recording monitoring data, and replaying it without a network.
+
+A `Recorder` appends every frame of monitoring data polled over a
+client's session to a file, whether by its devices, a `Monitor` or a
+`MonitorGroup`. A `Replay` reads the frames back and decodes them
+exactly as `Device.poll` does, at the original pace, faster, or as fast
+as possible. Recordings give realistic workloads for profiling the
+decoding and status code, and let problems seen with real devices be
+reproduced.
+
+A recording is a sequence of gzip members, one per `Recorder`, so new
+recordings can be appended to an existing file. Once decompressed, it
+is a sequence of records, each a `RECORD` header (the Unix time, the
+device type, and the lengths of the three strings that follow) then
+the device ID and model info URL (UTF-8) and the raw frame.
+"""
+import gzip
+import struct
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .client import Client, Device, DeviceInfo, DeviceType
+from .util import device_classes
+
+
+#: The header of each record: time, device type, and the lengths of the
+#: device ID, model info URL and frame.
+RECORD = struct.Struct("<dIHHI")
+
+#: A recorded frame of monitoring data.
+Frame = namedtuple(
+    "Frame", ["time", "device_id", "device_type", "model_url", "data"]
+)
+
+
+class Recorder(object):
+    """Appends frames of monitoring data to a recording file.
+
+    Pass a recorder to a `Client` to record every frame polled over its
+    session. A recorder may be shared between threads.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = gzip.open(path, "ab")
+        self._lock = threading.Lock()
+
+    def record(
+        self, device: DeviceInfo, data: bytes, at: Optional[float] = None
+    ) -> None:
+        """Append a frame polled from a device, at the current time
+        unless `at` is given.
+        """
+        device_id = device.id.encode("utf8")
+        model_url = device.model_info_url.encode("utf8")
+        header = RECORD.pack(
+            time.time() if at is None else at,
+            device.data.get("deviceType", 0),
+            len(device_id),
+            len(model_url),
+            len(data),
+        )
+        with self._lock:
+            self._file.write(header + device_id + model_url + data)
+            # Make each frame readable right away, and keep as much as
+            # possible if the process dies.
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, type, value, tb) -> None:
+        self.close()
+
+
+def read(path: str) -> Iterator[Frame]:
+    """Read every frame in a recording.
+
+    A record cut short at the end of the file, by a recorder that is
+    still running or that did not close cleanly, is ignored.
+    """
+    with gzip.open(path, "rb") as f:
+        while True:
+            try:
+                header = f.read(RECORD.size)
+                if len(header) < RECORD.size:
+                    return
+                at, device_type, id_len, url_len, data_len = RECORD.unpack(
+                    header
+                )
+                body = f.read(id_len + url_len + data_len)
+            except EOFError:
+                return
+            if len(body) < id_len + url_len + data_len:
+                return
+            yield Frame(
+                at,
+                body[:id_len].decode("utf8"),
+                device_type,
+                body[id_len : id_len + url_len].decode("utf8"),
+                body[id_len + url_len :],
+            )
+
+
+class Replay(object):
+    """Decodes the frames in a recording as a client's devices would.
+
+    The client is only used to get each model's `ModelInfo`, so it
+    needs no session, but it does need the model info: loaded from
+    saved state or a model cache, or else downloaded.
+
+    With a `speed` of 1, frames are replayed at the pace they were
+    recorded; with 10, ten times faster; with None, as fast as
+    possible.
+
+    Frames from devices of a type that wideq has no `Device` class for
+    are not decoded, and are replayed as their raw data.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        client: Client,
+        speed: Optional[float] = None,
+        sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        self.path = path
+        self.client = client
+        self.speed = speed
+        self._sleep = sleep
+
+        # One device object per recorded device (or None, for a device
+        # that cannot be decoded), so that unchanged frames reuse the
+        # previous status as they do when polling.
+        self.devices: Dict[str, Optional[Device]] = {}
+
+    def device(self, frame: Frame) -> Optional[Device]:
+        """Get the device object that decodes a frame, or None if there
+        is no `Device` class for the device's type.
+        """
+        try:
+            return self.devices[frame.device_id]
+        except KeyError:
+            pass
+        device = None
+        try:
+            cls = device_classes().get(DeviceType(frame.device_type))
+        except ValueError:
+            cls = None
+        if cls is not None:
+            info = DeviceInfo(
+                {
+                    "deviceId": frame.device_id,
+                    "deviceType": frame.device_type,
+                    "modelJsonUrl": frame.model_url,
+                }
+            )
+            device = cls(self.client, info)
+        self.devices[frame.device_id] = device
+        return device
+
+    def frames(self) -> Iterator[Frame]:
+        """Read the recording's frames, each when it is due."""
+        first = None
+        started = time.monotonic()
+        for frame in read(self.path):
+            if self.speed:
+                if first is None:
+                    first = frame.time
+                due = started + (frame.time - first) / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._sleep(delay)
+            yield frame
+
+    def __iter__(self) -> Iterator[Tuple[Frame, Any]]:
+        """Replay the recording, yielding each frame and the status
+        object decoded from it (or its raw data, for a device that
+        cannot be decoded).
+        """
+        for frame in self.frames():
+            device = self.device(frame)
+            if device is None:
+                yield frame, frame.data
+            else:
+                yield frame, device._poll_status(frame.data)
@@ -1,7 +1,7 @@
 import enum
 from typing import Optional
 
-from .client import Device
+from .client import Device, DeviceStatus, status_property
 from .util import lookup_enum
 
 
@@ -60,79 +60,81 @@ class RefrigeratorDevice(Device):
             return None
 
         data = self.mon.poll()
-        if data:
-            res = self.model.decode_monitor(data)
-            return RefrigeratorStatus(self, res)
-        else:
-            return None
+        return self._poll_status(data)
+
+    def _parse_status(self, data: bytes) -> "RefrigeratorStatus":
+        """Decode raw monitoring data into a `RefrigeratorStatus`."""
+        return RefrigeratorStatus(self, self.model.decode_monitor(data))
 
 
-class RefrigeratorStatus(object):
+class RefrigeratorStatus(DeviceStatus):
     """Higher-level information about a refrigerator's current status.
 
     :param refrigerator: The RefrigeratorDevice instance.
     :param data: JSON data from the API.
     """
 
+    __slots__ = ("refrigerator",)
+
     def __init__(self, refrigerator: RefrigeratorDevice, data: dict):
+        super().__init__(data)
         self.refrigerator = refrigerator
-        self.data = data
 
-    @property
+    @status_property
     def temp_refrigerator_c(self):
         temp = lookup_enum("TempRefrigerator", self.data, self.refrigerator)
         return int(temp)
 
-    @property
+    @status_property
     def temp_freezer_c(self):
         temp = lookup_enum("TempFreezer", self.data, self.refrigerator)
         return int(temp)
 
-    @property
+    @status_property
     def ice_plus_status(self):
         status = lookup_enum("IcePlus", self.data, self.refrigerator)
         return IcePlus(status)
 
-    @property
+    @status_property
     def fresh_air_filter_status(self):
         status = lookup_enum("FreshAirFilter", self.data, self.refrigerator)
         return FreshAirFilter(status)
 
-    @property
+    @status_property
     def energy_saving_mode(self):
         mode = lookup_enum("SmartSavingMode", self.data, self.refrigerator)
         return SmartSavingMode(mode)
 
-    @property
+    @status_property
     def door_opened(self):
         state = lookup_enum("DoorOpenState", self.data, self.refrigerator)
         return state == "OPEN"
 
-    @property
+    @status_property
     def temp_unit(self):
         return lookup_enum("TempUnit", self.data, self.refrigerator)
 
-    @property
+    @status_property
     def energy_saving_enabled(self):
         mode = lookup_enum(
             "SmartSavingModeStatus", self.data, self.refrigerator
         )
         return mode == "ON"
 
-    @property
+    @status_property
     def locked(self):
         status = lookup_enum("LockingStatus", self.data, self.refrigerator)
         return status == "LOCK"
 
-    @property
+    @status_property
     def active_saving_status(self):
         return self.data["ActiveSavingStatus"]
 
-    @property
+    @status_property
     def eco_enabled(self):
         eco = lookup_enum("EcoFriendly", self.data, self.refrigerator)
         return eco == "@CP_ON_EN_W"
 
-    @property
+    @status_property
     def water_filter_used_month(self):
         return self.data["WaterFilterUsedMonth"]
@@ -0,0 +1,344 @@
+"""Adaptive scheduling for polling many devices.
+
+Rather than polling every device at a fixed rate, a `PollScheduler`
+picks each device's next poll time from its last decoded status: idle
+devices are polled rarely, running ones more often, and ones that are
+about to finish a cycle most often.
+
+A scheduler can also watch a client's device list, starting to monitor
+devices as they are added to the account and stopping as they are
+removed.
+"""
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .client import Client, Device, DeviceChanges
+
+
+LOGGER = logging.getLogger("wideq.scheduler")
+
+#: Seconds between polls of a device that is off.
+IDLE_INTERVAL = 60.0
+#: Seconds between polls of a device that is on.
+ACTIVE_INTERVAL = 10.0
+#: Seconds between polls of a device about to finish its cycle.
+FINISHING_INTERVAL = 2.0
+#: Remaining minutes below which a device counts as finishing.
+FINISHING_MINUTES = 2
+#: Seconds before the first retry while a monitor warms up. The delay
+#: doubles on each retry, up to `MAX_WARMUP_INTERVAL`.
+WARMUP_INTERVAL = 1.0
+MAX_WARMUP_INTERVAL = 30.0
+#: Seconds between checks of a watched client's device list.
+DEVICE_SYNC_INTERVAL = 600.0
+#: The fraction by which intervals are randomly varied, to keep polls
+#: of many devices from bunching together.
+JITTER = 0.1
+
+
+class PollScheduler(object):
+    """Decides when to poll each of a set of monitored devices.
+
+    Devices must have monitoring started (with `Device.monitor_start`)
+    before they are added. If polling a device fails, the error is
+    logged and passed to `error_callback`, if given, and the device is
+    polled again after a backoff.
+    """
+
+    def __init__(
+        self,
+        idle_interval: float = IDLE_INTERVAL,
+        active_interval: float = ACTIVE_INTERVAL,
+        finishing_interval: float = FINISHING_INTERVAL,
+        warmup_interval: float = WARMUP_INTERVAL,
+        max_warmup_interval: float = MAX_WARMUP_INTERVAL,
+        jitter: float = JITTER,
+        clock: Callable[[], float] = time.monotonic,
+        error_callback: Optional[Callable[[Device, Exception], None]] = None,
+    ) -> None:
+        self.idle_interval = idle_interval
+        self.active_interval = active_interval
+        self.finishing_interval = finishing_interval
+        self.warmup_interval = warmup_interval
+        self.max_warmup_interval = max_warmup_interval
+        self.jitter = jitter
+        self.clock = clock
+        self.error_callback = error_callback
+
+        # A heap of (due time, sequence number, device ID) entries. An
+        # entry is stale, and skipped, if its device has been removed or
+        # rescheduled since it was pushed.
+        self._queue: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._devices: Dict[str, Device] = {}
+        self._due: Dict[str, float] = {}
+
+        # The number of consecutive empty polls for each device, used to
+        # back off while its monitor warms up.
+        self._empty_polls: Dict[str, int] = {}
+
+        # The client whose devices are watched, if any, and when its
+        # device list is next due to be checked.
+        self._client: Optional[Client] = None
+        self._sync_interval = DEVICE_SYNC_INTERVAL
+        self._sync_due: Optional[float] = None
+        self._sync_callback: Optional[Callable[[DeviceChanges], None]] = None
+
+        # Watched devices that could not be started, to try again at the
+        # next device list check.
+        self._unstarted: Set[str] = set()
+
+    def add(self, device: Device, delay: float = 0.0) -> None:
+        """Start scheduling polls for a device, first after `delay`
+        seconds.
+        """
+        self._devices[device.device.id] = device
+        self._empty_polls[device.device.id] = 0
+        self._schedule(device.device.id, delay)
+
+    def remove(self, device: Device) -> None:
+        """Stop scheduling polls for a device."""
+        self._devices.pop(device.device.id, None)
+        self._due.pop(device.device.id, None)
+        self._empty_polls.pop(device.device.id, None)
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def watch(
+        self,
+        client: Client,
+        interval: float = DEVICE_SYNC_INTERVAL,
+        callback: Optional[Callable[[DeviceChanges], None]] = None,
+    ) -> None:
+        """Monitor and schedule every device of a client's account, and
+        check the account's device list every `interval` seconds.
+
+        Devices added to the account are monitored and scheduled, and
+        removed ones are stopped. The changes are passed to `callback`,
+        if given, whenever there are any. The checks are made by
+        `poll_due`, like polls. A device that cannot be started is
+        tried again at the next check.
+        """
+        self._client = client
+        self._sync_interval = interval
+        self._sync_callback = callback
+        for info in client.devices:
+            self._start(info.id)
+        self._sync_due = self.clock() + interval
+
+    def _start(self, device_id: str) -> None:
+        """Start monitoring and scheduling a watched device, or note it
+        to try again later if that fails.
+        """
+        assert self._client is not None
+        self._unstarted.discard(device_id)
+        try:
+            device = self._client.get_device_obj(device_id)
+            if device is None or type(device) is Device:
+                LOGGER.debug("Not polling unsupported device %s", device_id)
+                return
+            device.monitor_start()
+        except Exception:
+            LOGGER.warning(
+                "Could not start monitoring %s; trying again later",
+                device_id,
+                exc_info=True,
+            )
+            self._unstarted.add(device_id)
+            return
+        self.add(device)
+
+    def _stop(self, device_id: str) -> None:
+        """Stop monitoring and scheduling a watched device."""
+        device = self._devices.get(device_id)
+        if device is None:
+            return
+        self.remove(device)
+        try:
+            device.monitor_stop()
+        except Exception:
+            LOGGER.warning("Could not stop monitoring %s", device_id)
+
+    def apply(self, changes: DeviceChanges) -> None:
+        """Start and stop monitoring watched devices to follow changes
+        to the device list.
+        """
+        assert self._client is not None
+        for info in changes.removed:
+            self._unstarted.discard(info.id)
+            self._stop(info.id)
+        for info in changes.changed:
+            # A device whose model or type changed has a new object.
+            try:
+                device = self._client.get_device_obj(info.id)
+            except Exception:
+                device = None  # Restarting it will note the failure.
+            if self._devices.get(info.id) is not device:
+                self._stop(info.id)
+                self._start(info.id)
+        for info in changes.added:
+            self._start(info.id)
+
+    def sync(self) -> DeviceChanges:
+        """Check the watched client's device list now, and follow any
+        changes. Return the changes.
+
+        Devices that could not be started before are tried again.
+        """
+        assert self._client is not None
+        self._sync_due = self.clock() + self._sync_interval
+        changes = self._client.refresh_devices()
+        for device_id in list(self._unstarted):
+            if self._client.get_device(device_id) is None:
+                self._unstarted.discard(device_id)
+            else:
+                self._start(device_id)
+        if any(changes):
+            LOGGER.info(
+                "Devices changed: %d added, %d removed, %d changed",
+                len(changes.added),
+                len(changes.removed),
+                len(changes.changed),
+            )
+            self.apply(changes)
+            if self._sync_callback:
+                self._sync_callback(changes)
+        return changes
+
+    def _schedule(self, device_id: str, delay: float) -> None:
+        due = self.clock() + delay
+        self._due[device_id] = due
+        heapq.heappush(self._queue, (due, next(self._counter), device_id))
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def interval(self, status: Any) -> float:
+        """Choose the delay, in seconds, before polling a device again
+        given its latest status object.
+
+        This uses the `is_on` and `remaining_time` properties where the
+        status has them. Override it for other policies.
+        """
+        if not getattr(status, "is_on", True):
+            return self.idle_interval
+        remaining = getattr(status, "remaining_time", None)
+        if remaining is not None and 0 < remaining <= FINISHING_MINUTES:
+            return self.finishing_interval
+        return self.active_interval
+
+    def warmup_delay(self, empty_polls: int) -> float:
+        """Choose the delay, in seconds, before polling a device again
+        after `empty_polls` consecutive polls returned no status.
+        """
+        delay = self.warmup_interval * 2 ** (empty_polls - 1)
+        return min(delay, self.max_warmup_interval)
+
+    def next_due(self) -> Optional[float]:
+        """Get the clock time at which the next poll (or device list
+        check) is due, or None if there are no devices to poll and none
+        are watched.
+        """
+        due = self._next_poll_due()
+        if self._sync_due is not None and (
+            due is None or self._sync_due < due
+        ):
+            return self._sync_due
+        return due
+
+    def _next_poll_due(self) -> Optional[float]:
+        while self._queue:
+            due, _, device_id = self._queue[0]
+            if self._due.get(device_id) == due:
+                return due
+            heapq.heappop(self._queue)  # Stale entry.
+        return None
+
+    def poll_due(self) -> List[Tuple[Device, Any]]:
+        """Poll every device whose turn has come and schedule its next
+        poll.
+
+        Return a list of `(device, status)` pairs for the devices that
+        produced a status. A device whose poll raises an exception is
+        rescheduled, backing off as if it were warming up, and the
+        other devices are still polled. If a watched device list is due
+        to be checked, that is done first; if the check fails, it is
+        logged and made again after the usual interval.
+        """
+        now = self.clock()
+        if self._sync_due is not None and self._sync_due <= now:
+            try:
+                self.sync()
+            except Exception:
+                LOGGER.warning(
+                    "Checking the device list failed; checking again in "
+                    "%.0fs",
+                    self._sync_interval,
+                    exc_info=True,
+                )
+        out = []
+        while True:
+            due = self._next_poll_due()
+            if due is None or due > now:
+                break
+            _, _, device_id = heapq.heappop(self._queue)
+            device = self._devices.get(device_id)
+            if device is None:
+                continue
+
+            try:
+                status = device.poll()  # type: ignore
+            except Exception as exc:
+                self._empty_polls[device_id] += 1
+                delay = self.warmup_delay(self._empty_polls[device_id])
+                LOGGER.warning(
+                    "Polling %s failed; polling again in %.1fs",
+                    device_id,
+                    delay,
+                    exc_info=True,
+                )
+                if self.error_callback:
+                    self.error_callback(device, exc)
+                # The callback may have removed (or replaced) the device.
+                if self._devices.get(device_id) is device:
+                    self._schedule(device_id, delay)
+                continue
+
+            if status is None:
+                self._empty_polls[device_id] += 1
+                delay = self.warmup_delay(self._empty_polls[device_id])
+                LOGGER.debug(
+                    "No status for %s yet; polling again in %.1fs",
+                    device_id,
+                    delay,
+                )
+            else:
+                self._empty_polls[device_id] = 0
+                delay = self.interval(status)
+                out.append((device, status))
+            self._schedule(device_id, self._jittered(delay))
+        return out
+
+    def run(
+        self,
+        callback: Callable[[Device, Any], None],
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Poll devices as they come due until no devices are left (or,
+        when watching a client, forever), calling `callback(device,
+        status)` for every status received.
+        """
+        while True:
+            due = self.next_due()
+            if due is None:
+                return
+            delay = due - self.clock()
+            if delay > 0:
+                sleep(delay)
+            for device, status in self.poll_due():
+                callback(device, status)
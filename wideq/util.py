@@ -1,3 +1,4 @@
+import functools
 from typing import TypeVar
 
 from .client import Device, DeviceType
@@ -31,6 +32,7 @@ def lookup_reference(attr: str, data: dict, device: T) -> str:
     return value
 
 
+@functools.lru_cache(maxsize=None)
 def device_classes():
     """The mapping of every Device subclass related to the DeviceType enum"""
     from .ac import ACDevice
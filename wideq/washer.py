@@ -1,7 +1,7 @@
 import enum
 from typing import Optional
 
-from .client import Device
+from .client import Device, DeviceStatus, status_property
 from .util import lookup_enum, lookup_reference
 
 
@@ -50,47 +50,49 @@ class WasherDevice(Device):
             return None
 
         data = self.mon.poll()
-        if data:
-            res = self.model.decode_monitor(data)
-            return WasherStatus(self, res)
-        else:
-            return None
+        return self._poll_status(data)
+
+    def _parse_status(self, data: bytes) -> "WasherStatus":
+        """Decode raw monitoring data into a `WasherStatus`."""
+        return WasherStatus(self, self.model.decode_monitor(data))
 
 
-class WasherStatus(object):
+class WasherStatus(DeviceStatus):
     """Higher-level information about a washer's current status.
 
     :param washer: The WasherDevice instance.
     :param data: JSON data from the API.
     """
 
+    __slots__ = ("washer",)
+
     def __init__(self, washer: WasherDevice, data: dict):
+        super().__init__(data)
         self.washer = washer
-        self.data = data
 
-    @property
+    @status_property
     def state(self) -> WasherState:
         """Get the state of the washer."""
         return WasherState(lookup_enum("State", self.data, self.washer))
 
-    @property
+    @status_property
     def previous_state(self) -> WasherState:
         """Get the previous state of the washer."""
         return WasherState(lookup_enum("PreState", self.data, self.washer))
 
-    @property
+    @status_property
     def is_on(self) -> bool:
         """Check if the washer is on or not."""
         return self.state != WasherState.OFF
 
-    @property
+    @status_property
     def remaining_time(self) -> int:
         """Get the remaining time in minutes."""
         return int(self.data["Remain_Time_H"]) * 60 + int(
             self.data["Remain_Time_M"]
         )
 
-    @property
+    @status_property
     def initial_time(self) -> int:
         """Get the initial time in minutes."""
         return int(self.data["Initial_Time_H"]) * 60 + int(
@@ -108,17 +110,17 @@ class WasherStatus(object):
             return "Off"
         return value
 
-    @property
+    @status_property
     def course(self) -> str:
         """Get the current course."""
         return lookup_reference("APCourse", self.data, self.washer)
 
-    @property
+    @status_property
     def smart_course(self) -> str:
         """Get the current smart course."""
         return lookup_reference("SmartCourse", self.data, self.washer)
 
-    @property
+    @status_property
     def error(self) -> str:
         """Get the current error."""
         return lookup_reference("Error", self.data, self.washer)